@@ -1,4 +1,5 @@
 """Allow running as: python -m score.factor_optimizer"""
 from .run_optimizer import main
 
-main()
+if __name__ == "__main__":
+    main()
@@ -9,17 +9,52 @@ Core logic reused from advanced_analysis.py with enhancements for:
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Set, Tuple
 
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; Top-N selection falls back to NumPy
+    njit = None
+    prange = range
+
 from .config import OptimizerConfig, CATEGORY_NAMES
 from .metrics import calc_turnover
 
 logger = logging.getLogger(__name__)
 
 
+NORM_COLUMNS: List[str] = [f"{cat}_norm" for cat in CATEGORY_NAMES]
+
+
+def normalize_category_scores(scores_df: pd.DataFrame) -> pd.DataFrame:
+    """Min-max normalize each category to [0, 1] within each trade date.
+
+    Normalization is independent of the category weights, so it can be
+    computed once and reused across every optimizer evaluation.
+
+    Returns:
+        copy of scores_df with added '<category>_norm' columns.
+    """
+    df = scores_df.copy()
+    for cat in CATEGORY_NAMES:
+        if cat in df.columns:
+            grouped = df.groupby("trade_date")[cat]
+            cat_min = grouped.transform("min")
+            cat_max = grouped.transform("max")
+            cat_range = cat_max - cat_min
+            # Avoid division by zero
+            df[f"{cat}_norm"] = np.where(
+                cat_range > 0, (df[cat] - cat_min) / cat_range, 0.5,
+            ).astype(np.float32)
+        else:
+            df[f"{cat}_norm"] = np.float32(0.0)
+    return df
+
+
 def compute_weighted_score(
     scores_df: pd.DataFrame,
     weights: np.ndarray,
@@ -33,24 +68,166 @@ def compute_weighted_score(
     Returns:
         scores_df with added 'total_score' column.
     """
-    df = scores_df.copy()
-    # Normalize each category to [0, 1] range per day before weighting
-    for i, cat in enumerate(CATEGORY_NAMES):
-        if cat in df.columns:
-            grouped = df.groupby("trade_date")[cat]
-            cat_min = grouped.transform("min")
-            cat_max = grouped.transform("max")
-            cat_range = cat_max - cat_min
-            # Avoid division by zero
-            df[f"{cat}_norm"] = np.where(cat_range > 0, (df[cat] - cat_min) / cat_range, 0.5)
-        else:
-            df[f"{cat}_norm"] = 0.0
+    df = normalize_category_scores(scores_df)
+    df["total_score"] = df[NORM_COLUMNS].to_numpy() @ np.asarray(weights)
+    return df
+
+
+@dataclass
+class BacktestData:
+    """Weights-independent backtest inputs, precomputed once per run.
+
+    Rows are the inner join of normalized scores and daily returns, sorted by
+    (trade_date, ts_code) so that trade date ``trade_dates[i]`` occupies the
+    contiguous row block ``date_starts[i]:date_starts[i + 1]``.
+    """
+
+    frame: pd.DataFrame  # trade_date, ts_code, pct_chg
+    norm: np.ndarray  # float32 (rows, n_categories), C-contiguous, NORM_COLUMNS order
+    trade_dates: np.ndarray  # sorted unique trade dates
+    date_starts: np.ndarray  # row offset of each date block, len(trade_dates) + 1
+    eligible: np.ndarray  # uint8 per row: 1 = buyable (not limit-up, not suspended)
+    ts_codes: np.ndarray  # sorted unique ts_code values
+    code_idx: np.ndarray  # int32 per row: position of the row's ts_code in ts_codes
+
+    def date_slice(self, start_date: int, end_date: int) -> Tuple[int, int]:
+        """Return (lo, hi) date positions covering [start_date, end_date]."""
+        lo = int(np.searchsorted(self.trade_dates, start_date, side="left"))
+        hi = int(np.searchsorted(self.trade_dates, end_date, side="right"))
+        return lo, hi
 
-    # Weighted sum
-    df["total_score"] = sum(
-        weights[i] * df[f"{cat}_norm"] for i, cat in enumerate(CATEGORY_NAMES)
+
+def prepare_backtest_data(
+    scores_df: pd.DataFrame,
+    returns_df: pd.DataFrame,
+) -> BacktestData:
+    """Normalize, join and index the inputs once for repeated backtests.
+
+    Args:
+        scores_df: category scores (trade_date, ts_code, 7 categories)
+        returns_df: daily returns (trade_date, ts_code, pct_chg, is_limit_up, is_suspended)
+    """
+    norm = normalize_category_scores(scores_df)
+
+    # Composite integer key (trade_date, ts_code) over a shared ts_code
+    # factorization; sorted codes keep key order == (trade_date, ts_code) order
+    codes, ts_codes = pd.factorize(
+        pd.concat([norm["ts_code"], returns_df["ts_code"]], ignore_index=True), sort=True,
+    )
+    n_codes = max(len(ts_codes), 1)
+    left_codes, right_codes = codes[:len(norm)], codes[len(norm):]
+    left_key = norm["trade_date"].to_numpy(dtype=np.int64) * n_codes + left_codes
+    right_key = returns_df["trade_date"].to_numpy(dtype=np.int64) * n_codes + right_codes
+
+    # Inner join: sort both sides once, align with searchsorted, then gather
+    left_order = np.argsort(left_key, kind="stable")
+    right_order = np.argsort(right_key, kind="stable")
+    right_sorted = right_key[right_order]
+    left_sorted = left_key[left_order]
+    pos = np.searchsorted(right_sorted, left_sorted)
+    matched = pos < len(right_sorted)
+    matched[matched] = right_sorted[pos[matched]] == left_sorted[matched]
+    left_idx = left_order[matched]
+    right_idx = right_order[pos[matched]]
+
+    trade_date = norm["trade_date"].to_numpy()[left_idx]
+    frame = pd.DataFrame({
+        "trade_date": trade_date,
+        "ts_code": norm["ts_code"].to_numpy()[left_idx],
+        "pct_chg": returns_df["pct_chg"].to_numpy(dtype=np.float32)[right_idx],
+    })
+    norm_matrix = np.ascontiguousarray(norm[NORM_COLUMNS].to_numpy(dtype=np.float32)[left_idx])
+
+    trade_dates, first_rows = np.unique(trade_date, return_index=True)
+    date_starts = np.append(first_rows, len(frame)).astype(np.int64)
+
+    # Eligibility never depends on weights: cannot buy limit-up or suspended stocks
+    eligible = (
+        (returns_df["is_limit_up"].to_numpy()[right_idx] == 0)
+        & (returns_df["is_suspended"].to_numpy()[right_idx] == 0)
+    ).astype(np.uint8)
+
+    return BacktestData(
+        frame=frame,
+        norm=norm_matrix,
+        trade_dates=trade_dates,
+        date_starts=date_starts,
+        eligible=eligible,
+        ts_codes=np.asarray(ts_codes),
+        code_idx=left_codes[left_idx].astype(np.int32),
     )
-    return df
+
+
+def _select_top_k(
+    norm: np.ndarray,
+    weights: np.ndarray,
+    eligible: np.ndarray,
+    codes: np.ndarray,
+    block_starts: np.ndarray,
+    n_codes: int,
+    k: int,
+) -> np.ndarray:
+    """Top-k ts_code indices for every date in one pass over the date blocks.
+
+    For date i the ranking uses date i-1's weighted score restricted to
+    stocks present and eligible on date i. Dates are independent, so the
+    numba build runs them in parallel. Returns (n_dates, k) int32, padded
+    with -1; row 0 is always empty.
+    """
+    n_dates = block_starts.shape[0] - 1
+    n_cats = norm.shape[1]
+    top = np.full((n_dates, k), -1, dtype=np.int32)
+    for i in prange(1, n_dates):
+        lookup = np.full(n_codes, np.nan, dtype=np.float32)
+        for r in range(block_starts[i - 1], block_starts[i]):
+            score = np.float32(0.0)
+            for c in range(n_cats):
+                score += norm[r, c] * weights[c]
+            lookup[codes[r]] = score
+
+        t0, t1 = block_starts[i], block_starts[i + 1]
+        cand_codes = np.empty(t1 - t0, dtype=np.int32)
+        cand_scores = np.empty(t1 - t0, dtype=np.float32)
+        n_cand = 0
+        for r in range(t0, t1):
+            if eligible[r]:
+                score = lookup[codes[r]]
+                if not np.isnan(score):
+                    cand_codes[n_cand] = codes[r]
+                    cand_scores[n_cand] = -score
+                    n_cand += 1
+
+        order = np.argsort(cand_scores[:n_cand], kind="mergesort")
+        for j in range(min(k, n_cand)):
+            top[i, j] = cand_codes[order[j]]
+    return top
+
+
+_select_top_k_fused = njit(parallel=True, cache=True)(_select_top_k) if njit is not None else None
+
+
+def _select_top_k_at(
+    total_score: np.ndarray,
+    eligible: np.ndarray,
+    codes: np.ndarray,
+    block_starts: np.ndarray,
+    score_lookup: np.ndarray,
+    i: int,
+    k: int,
+) -> np.ndarray:
+    """NumPy equivalent of _select_top_k for a single date i."""
+    # Previous day's block is contiguous: scatter its scores by ts_code
+    prev = slice(block_starts[i - 1], block_starts[i])
+    score_lookup.fill(np.nan)
+    score_lookup[codes[prev]] = total_score[prev]
+
+    # Today's buyable universe from the precomputed eligibility mask
+    today = slice(block_starts[i], block_starts[i + 1])
+    cand_codes = codes[today][eligible[today].astype(bool)]
+    cand_scores = score_lookup[cand_codes]
+    scored = ~np.isnan(cand_scores)
+    cand_codes, cand_scores = cand_codes[scored], cand_scores[scored]
+    return cand_codes[np.argsort(-cand_scores, kind="stable")[:k]]
 
 
 def run_backtest(
@@ -78,33 +255,64 @@ def run_backtest(
     ed = end_date or config.backtest_end
 
     # Filter to date range
-    scores = scores_df[(scores_df["trade_date"] >= sd) & (scores_df["trade_date"] <= ed)].copy()
-    returns = returns_df[(returns_df["trade_date"] >= sd) & (returns_df["trade_date"] <= ed)].copy()
+    scores = scores_df[(scores_df["trade_date"] >= sd) & (scores_df["trade_date"] <= ed)]
+    returns = returns_df[(returns_df["trade_date"] >= sd) & (returns_df["trade_date"] <= ed)]
 
     if scores.empty or returns.empty:
         logger.warning(f"No data for {sd}-{ed}")
         return pd.DataFrame(), {}
 
-    # Compute weighted scores
-    scores = compute_weighted_score(scores, weights)
+    data = prepare_backtest_data(scores, returns)
+    return run_prepared_backtest(data, weights, config, sd, ed)
 
-    # Merge
-    df = pd.merge(scores[["trade_date", "ts_code", "total_score"]],
-                  returns, on=["trade_date", "ts_code"], how="inner")
 
-    trade_dates = sorted(df["trade_date"].unique())
-    if len(trade_dates) < 2:
+def run_prepared_backtest(
+    data: BacktestData,
+    weights: np.ndarray,
+    config: OptimizerConfig,
+    start_date: Optional[int] = None,
+    end_date: Optional[int] = None,
+) -> Tuple[pd.DataFrame, Dict]:
+    """Run a single backtest on precomputed data (see prepare_backtest_data).
+
+    Returns:
+        (daily_nav_df, summary_metrics_dict)
+    """
+    sd = start_date or config.backtest_start
+    ed = end_date or config.backtest_end
+
+    lo, hi = data.date_slice(sd, ed)
+    row_lo, row_hi = int(data.date_starts[lo]), int(data.date_starts[hi])
+    if row_hi <= row_lo:
+        logger.warning(f"No data for {sd}-{ed}")
         return pd.DataFrame(), {}
 
-    # Build T-1 scoring dictionary
-    date_to_prev_scores = {}
-    for i in range(1, len(trade_dates)):
-        prev = trade_dates[i - 1]
-        curr = trade_dates[i]
-        prev_scores = df[df["trade_date"] == prev][["ts_code", "total_score"]].copy()
-        date_to_prev_scores[curr] = prev_scores
+    norm = data.norm[row_lo:row_hi]
+    # float32 scores; the NAV accumulator below stays float64
+    w32 = np.asarray(weights, dtype=np.float32)
+    eligible = data.eligible[row_lo:row_hi]
+    block_starts = data.date_starts[lo:hi + 1] - row_lo
+
+    codes = data.code_idx[row_lo:row_hi]
+    pct_chg = data.frame["pct_chg"].to_numpy()[row_lo:row_hi]
+
+    # Already sorted and unique from prepare_backtest_data
+    trade_dates = data.trade_dates[lo:hi].tolist()
+    if len(trade_dates) < 2:
+        return pd.DataFrame(), {}
 
-    current_portfolio: List[str] = []
+    # Weighted sum, eligibility mask and Top-N for all dates in one fused
+    # kernel when numba is available; otherwise select lazily per rebalance
+    top_k = None
+    if _select_top_k_fused is not None:
+        top_k = _select_top_k_fused(
+            norm, w32, eligible, codes, block_starts, len(data.ts_codes), config.num_stocks,
+        )
+    else:
+        total_score = norm @ w32
+        score_lookup = np.empty(len(data.ts_codes), dtype=np.float32)
+
+    current_portfolio = np.empty(0, dtype=np.int32)
     portfolio_value = float(config.initial_capital)
     daily_nav = []
     next_rebalance_idx = 1
@@ -115,30 +323,22 @@ def run_backtest(
         day_return = 0.0
         is_rebalance_day = False
         transaction_cost = 0.0
+        today = slice(block_starts[i], block_starts[i + 1])
 
         # --- Rebalance logic (use T-1 scores) ---
-        if i == next_rebalance_idx and date in date_to_prev_scores:
+        if i == next_rebalance_idx:
             is_rebalance_day = True
-            prev_scores = date_to_prev_scores[date]
 
-            today_data = df[df["trade_date"] == date].copy()
+            if top_k is not None:
+                top_stocks = top_k[i][top_k[i] >= 0]
+            else:
+                top_stocks = _select_top_k_at(
+                    total_score, eligible, codes, block_starts, score_lookup, i, config.num_stocks,
+                )
 
-            selection = pd.merge(
-                prev_scores,
-                today_data[["ts_code", "is_limit_up", "is_suspended"]],
-                on="ts_code", how="inner",
-            )
-
-            # Filter: cannot buy limit-up or suspended stocks
-            eligible = selection[
-                (selection["is_limit_up"] == 0) & (selection["is_suspended"] == 0)
-            ]
-
-            if not eligible.empty:
-                top_stocks = eligible.nlargest(config.num_stocks, "total_score")["ts_code"].tolist()
-
-                old_set = set(current_portfolio)
-                new_set = set(top_stocks)
+            if top_stocks.size:
+                old_set = set(current_portfolio.tolist())
+                new_set = set(top_stocks.tolist())
 
                 # Turnover tracking
                 turnover = calc_turnover(old_set, new_set)
@@ -160,15 +360,13 @@ def run_backtest(
                 next_rebalance_idx = min(i + config.holding_days, len(trade_dates))
 
         # --- Return calculation ---
-        if current_portfolio:
-            port_data = df[
-                (df["trade_date"] == date) & (df["ts_code"].isin(current_portfolio))
-            ]
-            if not port_data.empty:
+        if current_portfolio.size:
+            held = np.isin(codes[today], current_portfolio)
+            if held.any():
                 if is_rebalance_day:
                     day_return = -transaction_cost
                 else:
-                    avg_chg = port_data["pct_chg"].mean()
+                    avg_chg = float(pct_chg[today][held].mean())
                     day_return = avg_chg / 100.0
 
         portfolio_value *= (1 + day_return)
@@ -177,7 +375,7 @@ def run_backtest(
             "trade_date": date,
             "nav": portfolio_value,
             "daily_return": day_return,
-            "holdings_count": len(current_portfolio),
+            "holdings_count": int(current_portfolio.size),
             "is_rebalance": is_rebalance_day,
         })
 
@@ -195,6 +393,18 @@ def run_backtest(
     return df_nav, summary
 
 
+def penalized_sharpe(summary: Dict, config: OptimizerConfig) -> float:
+    """Sharpe minus turnover penalty; 0.0 when the backtest produced no data."""
+    if not summary:
+        return 0.0  # No data, return neutral
+
+    sharpe = summary.get("sharpe", 0.0)
+    avg_turnover = summary.get("avg_turnover", 0.0)
+
+    # Penalize high turnover (especially important for Top-5 concentrated portfolio)
+    return sharpe - config.turnover_penalty * avg_turnover * 100
+
+
 def run_backtest_with_turnover_penalty(
     scores_df: pd.DataFrame,
     returns_df: pd.DataFrame,
@@ -208,14 +418,4 @@ def run_backtest_with_turnover_penalty(
     Returns negative Sharpe (for minimization) with turnover penalty.
     """
     df_nav, summary = run_backtest(scores_df, returns_df, weights, config, start_date, end_date)
-
-    if not summary:
-        return 0.0  # No data, return neutral
-
-    sharpe = summary.get("sharpe", 0.0)
-    avg_turnover = summary.get("avg_turnover", 0.0)
-
-    # Penalize high turnover (especially important for Top-5 concentrated portfolio)
-    penalized = sharpe - config.turnover_penalty * avg_turnover * 100
-
-    return penalized
+    return penalized_sharpe(summary, config)
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Tuple, Optional
+from typing import List, Set, Tuple, Optional
 
 
 # Factor category names (7 alpha categories)
@@ -16,6 +16,9 @@ CATEGORY_NAMES: List[str] = [
     "size",
 ]
 
+# Report sheet groups selectable via report_sheets / --report-sheets
+REPORT_SHEETS: Tuple[str, ...] = ("summary", "fold", "oos", "equity", "stability")
+
 
 @dataclass
 class OptimizerConfig:
@@ -51,6 +54,18 @@ class OptimizerConfig:
     # --- Optimization ---
     turnover_penalty: float = 0.002  # Penalty for portfolio turnover
     weight_round_step: float = 0.05  # Round to nearest 5%
+    weight_sum_tol: float = 1e-3  # Allowed |sum(w) - 1| during search
+
+    # --- Differential evolution ---
+    optimizer_maxiter: int = 50  # Generations per fold
+    optimizer_popsize: int = 15  # Population = popsize * n_categories
+    optimizer_workers: int = -1  # Parallel evaluations (-1 = all CPUs)
+    optimizer_seed: int = 0  # Reproducible population init
+
+    # --- Report ---
+    large_nav_to_parquet: bool = True  # Write long OOS NAV to parquet instead of a sheet
+    parquet_nav_rows: int = 5000  # Row count above which OOS NAV goes to parquet
+    report_sheets: Set[str] = field(default_factory=lambda: set(REPORT_SHEETS))
 
     # --- Benchmark ---
     # CSI 500 (000905.SH) 未同步，使用沪深300；如需CSI 500需先同步 ods_index_daily
@@ -81,3 +96,6 @@ class OptimizerConfig:
             raise ValueError("holding_days must be > 0")
         if self.initial_capital <= 0:
             raise ValueError("initial_capital must be > 0")
+        unknown = set(self.report_sheets) - set(REPORT_SHEETS)
+        if unknown or not self.report_sheets:
+            raise ValueError(f"report_sheets must be a non-empty subset of {REPORT_SHEETS}")
@@ -94,6 +94,9 @@ def load_category_scores(
     """)
 
     df = pd.read_sql(sql, engine, params={"start": config.backtest_start, "end": config.backtest_end})
+    # Scores are only ever min-max normalized and ranked: float32 is plenty
+    # and halves the memory traffic of the backtest passes
+    df = df.astype({cat: np.float32 for cat in CATEGORY_NAMES})
     logger.info(f"Loaded {len(df)} score rows, {df['ts_code'].nunique()} stocks")
     return df
 
@@ -130,6 +133,7 @@ def load_daily_returns(
     """)
 
     df = pd.read_sql(sql, engine, params={"start": config.backtest_start, "end": config.backtest_end})
+    df["pct_chg"] = df["pct_chg"].astype(np.float32)
     logger.info(f"Loaded {len(df)} return rows")
     return df
 
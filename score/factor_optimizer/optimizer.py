@@ -1,36 +1,80 @@
 """Walk-forward weight optimization.
 
 Optimizes inter-category weights using expanding window walk-forward
-to minimize overfitting. Uses scipy.optimize for constrained optimization.
+to minimize overfitting. Uses scipy.optimize.differential_evolution, whose
+population is evaluated in parallel across CPUs — the backtest objective is
+piecewise-constant (Top-N selection is discrete), so gradient-based solvers
+such as SLSQP stall on it.
 """
 from __future__ import annotations
 
 import logging
+import multiprocessing
+import os
+from contextlib import nullcontext
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from scipy.optimize import minimize, OptimizeResult
+from scipy.optimize import LinearConstraint, OptimizeResult, differential_evolution
+
+try:
+    import numba
+except ImportError:  # numba is optional; the backtest falls back to NumPy
+    numba = None
 
 from .config import OptimizerConfig, CATEGORY_NAMES
-from .backtest import run_backtest, run_backtest_with_turnover_penalty
+from .backtest import (
+    BacktestData,
+    penalized_sharpe,
+    prepare_backtest_data,
+    run_backtest,
+    run_prepared_backtest,
+)
 
 logger = logging.getLogger(__name__)
 
 
+# BacktestData of the current fold inside an optimizer worker process, set once by
+# _init_worker so each evaluation task only ships the weights and a few scalars
+_WORKER_DATA: Optional[BacktestData] = None
+
+
 def _objective(
     weights: np.ndarray,
-    scores_df: pd.DataFrame,
-    returns_df: pd.DataFrame,
+    data: BacktestData,
     config: OptimizerConfig,
     start_date: int,
     end_date: int,
 ) -> float:
     """Objective function: negative penalized Sharpe (we minimize)."""
-    penalized_sharpe = run_backtest_with_turnover_penalty(
-        scores_df, returns_df, weights, config, start_date, end_date,
-    )
-    return -penalized_sharpe  # scipy minimizes
+    _, summary = run_prepared_backtest(data, weights, config, start_date, end_date)
+    return -penalized_sharpe(summary, config)  # scipy minimizes
+
+
+def _init_worker(data: BacktestData) -> None:
+    global _WORKER_DATA
+    _WORKER_DATA = data
+    if numba is not None:
+        # The processes already use every CPU: keep the parallel Top-N kernel to one thread each
+        numba.set_num_threads(1)
+
+
+def _worker_objective(
+    weights: np.ndarray, config: OptimizerConfig, start_date: int, end_date: int,
+) -> float:
+    return _objective(weights, _WORKER_DATA, config, start_date, end_date)
+
+
+def _evaluation_pool(data: BacktestData, workers: int):
+    """Process pool for differential_evolution, or None to evaluate serially in-process."""
+    processes = (os.cpu_count() or 1) if workers == -1 else workers
+    if processes <= 1:
+        return None
+    # spawn, not fork: a forked child inherits the parent's numba thread pool state
+    # (the parallel kernel has usually run in-process already) and can hang
+    ctx = multiprocessing.get_context("spawn")
+    return ctx.Pool(processes, initializer=_init_worker, initargs=(data,))
 
 
 def optimize_weights(
@@ -39,41 +83,70 @@ def optimize_weights(
     config: OptimizerConfig,
     train_start: int,
     train_end: int,
+    data: Optional[BacktestData] = None,
+    pool=None,
 ) -> Tuple[np.ndarray, float]:
     """Find optimal category weights on training period.
 
+    Args:
+        data: precomputed inputs; built from scores_df/returns_df if omitted
+        pool: _evaluation_pool() over the same data, reused across calls;
+            created for this call (per config.optimizer_workers) if omitted
+
     Returns:
         (optimal_weights, best_sharpe)
     """
     n = len(CATEGORY_NAMES)
+    if data is None:
+        data = prepare_backtest_data(scores_df, returns_df)
 
-    # Start with equal weights
+    # Fallback: equal weights
     w0 = np.ones(n) / n
 
-    # Constraints: weights sum to 1
-    constraints = [{"type": "eq", "fun": lambda w: np.sum(w) - 1.0}]
+    # Constraint: weights sum to 1. An exact equality has zero volume for a
+    # population-based search, so allow a thin band and re-normalize after.
+    tol = config.weight_sum_tol
+    constraints = LinearConstraint(np.ones(n), 1.0 - tol, 1.0 + tol)
 
     # Bounds: each weight in [weight_min, weight_max]
     bounds = [(config.weight_min, config.weight_max)] * n
 
     logger.info(f"Optimizing weights on {train_start} -> {train_end}")
 
-    result: OptimizeResult = minimize(
-        _objective,
-        w0,
-        args=(scores_df, returns_df, config, train_start, train_end),
-        method="SLSQP",
-        bounds=bounds,
-        constraints=constraints,
-        options={"maxiter": 200, "ftol": 1e-6, "disp": False},
-    )
+    own_pool = _evaluation_pool(data, config.optimizer_workers) if pool is None else None
+    pool = pool or own_pool
+    if pool is None:
+        objective, args, workers = _objective, (data, config, train_start, train_end), 1
+    else:
+        # The data reaches each worker once via the initializer, not with every task chunk
+        objective, args, workers = _worker_objective, (config, train_start, train_end), pool.map
+
+    with own_pool or nullcontext():
+        result: OptimizeResult = differential_evolution(
+            objective,
+            bounds,
+            args=args,
+            constraints=constraints,
+            maxiter=config.optimizer_maxiter,
+            popsize=config.optimizer_popsize,
+            tol=1e-4,
+            init="sobol",
+            polish=False,
+            seed=config.optimizer_seed,
+            workers=workers,
+            updating="deferred",
+        )
 
-    if result.success:
-        optimal_weights = result.x
+    feasible = float(np.max(getattr(result, "constr_violation", 0.0))) <= 0.0
+    if feasible and np.isfinite(result.fun):
+        optimal_weights = result.x / result.x.sum()
         best_sharpe = -result.fun
-        logger.info(f"Optimization converged: Sharpe={best_sharpe:.4f}")
+        if result.success:
+            logger.info(f"Optimization converged: Sharpe={best_sharpe:.4f}")
+        else:
+            logger.info(f"Optimization stopped ({result.message}): Sharpe={best_sharpe:.4f}")
     else:
-        logger.warning(f"Optimization did not converge: {result.message}")
+        logger.warning(f"Optimization found no feasible weights: {result.message}")
         optimal_weights = w0
         best_sharpe = 0.0
 
@@ -108,53 +181,58 @@ def walk_forward_optimize(
     folds = config.get_default_folds()
     train_start = config.backtest_start
 
-    fold_results = []
-
-    for fold_idx, (train_end, test_start, test_end) in enumerate(folds):
-        logger.info(f"\n{'='*60}")
-        logger.info(f"Fold {fold_idx + 1}/{len(folds)}")
-        logger.info(f"  Train: {train_start} -> {train_end}")
-        logger.info(f"  Test:  {test_start} -> {test_end}")
-        logger.info(f"{'='*60}")
+    # Normalization, join and eligibility do not depend on weights: build once
+    data = prepare_backtest_data(scores_df, returns_df)
 
-        # 1. Optimize on train
-        opt_weights, train_sharpe = optimize_weights(
-            scores_df, returns_df, config, train_start, train_end,
-        )
-
-        # 2. Run backtest on train with optimal weights
-        train_nav, train_metrics = run_backtest(
-            scores_df, returns_df, opt_weights, config, train_start, train_end,
-        )
-
-        # 3. Test on out-of-sample period
-        test_nav, test_metrics = run_backtest(
-            scores_df, returns_df, opt_weights, config, test_start, test_end,
-        )
+    fold_results = []
 
-        fold_result = {
-            "fold": fold_idx + 1,
-            "train_period": f"{train_start}-{train_end}",
-            "test_period": f"{test_start}-{test_end}",
-            "weights": opt_weights.copy(),
-            "train_sharpe": train_metrics.get("sharpe", 0),
-            "train_return": train_metrics.get("total_return", 0),
-            "train_max_dd": train_metrics.get("max_drawdown", 0),
-            "test_sharpe": test_metrics.get("sharpe", 0),
-            "test_return": test_metrics.get("total_return", 0),
-            "test_max_dd": test_metrics.get("max_drawdown", 0),
-            "train_nav": train_nav,
-            "test_nav": test_nav,
-            "train_metrics": train_metrics,
-            "test_metrics": test_metrics,
-        }
-        fold_results.append(fold_result)
-
-        # Log fold summary
-        logger.info(f"  Train: Sharpe={train_metrics.get('sharpe', 0):.3f}, "
-                     f"Return={train_metrics.get('total_return', 0)*100:.1f}%")
-        logger.info(f"  Test:  Sharpe={test_metrics.get('sharpe', 0):.3f}, "
-                     f"Return={test_metrics.get('total_return', 0)*100:.1f}%")
+    # One worker pool for all folds: the workers receive the data once
+    with _evaluation_pool(data, config.optimizer_workers) or nullcontext() as pool:
+        for fold_idx, (train_end, test_start, test_end) in enumerate(folds):
+            logger.info(f"\n{'='*60}")
+            logger.info(f"Fold {fold_idx + 1}/{len(folds)}")
+            logger.info(f"  Train: {train_start} -> {train_end}")
+            logger.info(f"  Test:  {test_start} -> {test_end}")
+            logger.info(f"{'='*60}")
+
+            # 1. Optimize on train
+            opt_weights, train_sharpe = optimize_weights(
+                scores_df, returns_df, config, train_start, train_end, data, pool,
+            )
+
+            # 2. Run backtest on train with optimal weights
+            train_nav, train_metrics = run_prepared_backtest(
+                data, opt_weights, config, train_start, train_end,
+            )
+
+            # 3. Test on out-of-sample period
+            test_nav, test_metrics = run_prepared_backtest(
+                data, opt_weights, config, test_start, test_end,
+            )
+
+            fold_result = {
+                "fold": fold_idx + 1,
+                "train_period": f"{train_start}-{train_end}",
+                "test_period": f"{test_start}-{test_end}",
+                "weights": opt_weights.copy(),
+                "train_sharpe": train_metrics.get("sharpe", 0),
+                "train_return": train_metrics.get("total_return", 0),
+                "train_max_dd": train_metrics.get("max_drawdown", 0),
+                "test_sharpe": test_metrics.get("sharpe", 0),
+                "test_return": test_metrics.get("total_return", 0),
+                "test_max_dd": test_metrics.get("max_drawdown", 0),
+                "train_nav": train_nav,
+                "test_nav": test_nav,
+                "train_metrics": train_metrics,
+                "test_metrics": test_metrics,
+            }
+            fold_results.append(fold_result)
+
+            # Log fold summary
+            logger.info(f"  Train: Sharpe={train_metrics.get('sharpe', 0):.3f}, "
+                         f"Return={train_metrics.get('total_return', 0)*100:.1f}%")
+            logger.info(f"  Test:  Sharpe={test_metrics.get('sharpe', 0):.3f}, "
+                         f"Return={test_metrics.get('total_return', 0)*100:.1f}%")
 
     # Aggregate results
     all_weights = np.array([f["weights"] for f in fold_results])
@@ -8,11 +8,123 @@ from typing import Dict, List, Optional
 import numpy as np
 import pandas as pd
 
+try:
+    import xlsxwriter
+except ImportError:  # xlsxwriter is optional; fall back to openpyxl write_only
+    xlsxwriter = None
+
 from .config import CATEGORY_NAMES, OptimizerConfig
 
 logger = logging.getLogger(__name__)
 
 
+class _ReportBook:
+    """Workbook that writes each sheet header-first, then rows in order.
+
+    With xlsxwriter the workbook runs in constant_memory mode: each row is
+    flushed to disk as soon as the next one starts, so peak memory does not
+    grow with the NAV sheets. That mode drops cells written out of row
+    order, and pandas' to_excel emits cells column by column, so sheets are
+    streamed row by row here instead. Without xlsxwriter, openpyxl's
+    write_only workbook gives the same streaming behaviour.
+    """
+
+    def __init__(self, output_file: str) -> None:
+        self.output_file = output_file
+        if xlsxwriter is not None:
+            self.book = xlsxwriter.Workbook(output_file, {
+                "constant_memory": True,
+                "strings_to_numbers": False,
+                "strings_to_formulas": False,
+                "strings_to_urls": False,
+            })
+            self.header_format = self.book.add_format({"bold": True, "border": 1})
+            self._num_formats: Dict[str, object] = {}
+        else:
+            import openpyxl
+            from openpyxl.styles import Border, Font, Side
+
+            self.book = openpyxl.Workbook(write_only=True)
+            # Header styles are immutable: build them once, share across sheets
+            thin = Side(style="thin")
+            self.header_font = Font(bold=True)
+            self.header_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+
+    def __enter__(self) -> "_ReportBook":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if xlsxwriter is not None:
+            self.book.close()
+        else:
+            self.book.save(self.output_file)
+
+    def append_df(
+        self,
+        sheet_name: str,
+        df: pd.DataFrame,
+        num_formats: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Write df (without index) to a new sheet.
+
+        Args:
+            num_formats: column name -> Excel number format (e.g. "0.0%"),
+                applied as cell metadata so values stay numeric
+        """
+        # Match to_excel: missing values become blank cells
+        if df.isna().to_numpy().any():
+            df = df.astype(object).where(df.notna(), None)
+        # ... and ±inf the strings "inf"/"-inf" (its inf_rep); neither backend can store them as numbers
+        pos_inf, neg_inf = df.isin([np.inf]), df.isin([-np.inf])
+        if pos_inf.to_numpy().any() or neg_inf.to_numpy().any():
+            df = df.astype(object).mask(pos_inf, "inf").mask(neg_inf, "-inf")
+        header = [str(c) for c in df.columns]
+        rows = df.itertuples(index=False, name=None)
+        formatted = {
+            df.columns.get_loc(col): fmt for col, fmt in (num_formats or {}).items()
+        }
+
+        if xlsxwriter is not None:
+            ws = self.book.add_worksheet(sheet_name)
+            # Column formats must be set before any row is flushed
+            for idx, fmt in formatted.items():
+                if fmt not in self._num_formats:
+                    self._num_formats[fmt] = self.book.add_format({"num_format": fmt})
+                ws.set_column(idx, idx, 12, self._num_formats[fmt])
+            ws.write_row(0, 0, header, self.header_format)
+            for r, row in enumerate(rows, start=1):
+                ws.write_row(r, 0, row)
+            return
+
+        from openpyxl.cell import WriteOnlyCell
+
+        ws = self.book.create_sheet(sheet_name)
+        header_cells = []
+        for name in header:
+            cell = WriteOnlyCell(ws, value=name)
+            cell.font = self.header_font
+            cell.border = self.header_border
+            header_cells.append(cell)
+        ws.append(header_cells)
+        if not formatted:
+            for row in rows:
+                ws.append(row)
+            return
+        for row in rows:
+            cells = list(row)
+            for idx, fmt in formatted.items():
+                cell = WriteOnlyCell(ws, value=cells[idx])
+                cell.number_format = fmt
+                cells[idx] = cell
+            ws.append(cells)
+
+
+def _as_float64(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast every numeric column to float64 in one columnar pass."""
+    numeric = df.select_dtypes("number").columns
+    return df.astype({col: np.float64 for col in numeric})
+
+
 def generate_report(
     wf_results: Dict,
     oos_nav: pd.DataFrame,
@@ -31,6 +143,8 @@ def generate_report(
         config: optimizer config
         output_file: output path (default: factor_optimizer_report.xlsx)
 
+    Only the sheet groups in config.report_sheets are written.
+
     Returns:
         Path to generated file.
     """
@@ -39,135 +153,168 @@ def generate_report(
 
     logger.info(f"Generating report: {output_file}")
 
-    with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
+    sheets = config.report_sheets
+    with _ReportBook(output_file) as writer:
         # --- Sheet 1: Weight Summary ---
-        _write_weight_summary(writer, wf_results)
+        if "summary" in sheets:
+            _write_weight_summary(writer, wf_results)
 
         # --- Sheet 2: Fold Details ---
-        _write_fold_details(writer, wf_results)
+        if "fold" in sheets:
+            _write_fold_details(writer, wf_results)
 
         # --- Sheet 3: OOS Results ---
-        _write_oos_results(writer, oos_nav, oos_metrics)
+        if "oos" in sheets:
+            _write_oos_results(writer, oos_nav, oos_metrics, config)
 
         # --- Sheet 4: Equity Curves ---
-        _write_equity_curves(writer, wf_results, oos_nav, benchmark_df, config)
+        if "equity" in sheets:
+            _write_equity_curves(writer, wf_results, oos_nav, benchmark_df, config)
 
         # --- Sheet 5: Stability Analysis ---
-        _write_stability(writer, wf_results)
+        if "stability" in sheets:
+            _write_stability(writer, wf_results)
 
     abs_path = os.path.abspath(output_file)
     logger.info(f"Report saved: {abs_path}")
     return abs_path
 
 
-def _write_weight_summary(writer, wf_results: Dict) -> None:
+def _write_weight_summary(writer: _ReportBook, wf_results: Dict) -> None:
     """Write weight summary sheet."""
-    avg_w = wf_results["avg_weights"]
-    rounded_w = wf_results["rounded_weights"]
-    std_w = wf_results["weight_stability"]
-
-    rows = []
-    for i, cat in enumerate(CATEGORY_NAMES):
-        rows.append({
-            "category": cat,
-            "avg_weight": round(avg_w[i], 4),
-            "std": round(std_w[i], 4),
-            "rounded_weight": round(rounded_w[i], 2),
-        })
-
-    # Add per-fold weights
-    for fold_r in wf_results["fold_results"]:
-        fold_idx = fold_r["fold"]
-        for i, cat in enumerate(CATEGORY_NAMES):
-            rows[i][f"fold_{fold_idx}"] = round(fold_r["weights"][i], 4)
-
-    df = pd.DataFrame(rows)
-    df.to_excel(writer, sheet_name="Weight Summary", index=False)
-
-
-def _write_fold_details(writer, wf_results: Dict) -> None:
+    avg_w = np.asarray(wf_results["avg_weights"], dtype=np.float64)
+    rounded_w = np.asarray(wf_results["rounded_weights"], dtype=np.float64)
+    std_w = np.asarray(wf_results["weight_stability"], dtype=np.float64)
+
+    df = pd.DataFrame({
+        "category": CATEGORY_NAMES,
+        "avg_weight": avg_w.round(4),
+        "std": std_w.round(4),
+        "rounded_weight": rounded_w.round(2),
+    })
+
+    # Add per-fold weights: one (n_folds, n_categories) matrix, one column per fold
+    fold_results = wf_results["fold_results"]
+    if fold_results:
+        fold_w = np.stack([fr["weights"] for fr in fold_results]).astype(np.float64).round(4)
+        fold_cols = {f"fold_{fr['fold']}": col for fr, col in zip(fold_results, fold_w)}
+        df = df.assign(**fold_cols)
+
+    writer.append_df("Weight Summary", df)
+
+
+def _write_fold_details(writer: _ReportBook, wf_results: Dict) -> None:
     """Write per-fold performance comparison."""
-    rows = []
-    for f in wf_results["fold_results"]:
-        rows.append({
-            "fold": f["fold"],
-            "train_period": f["train_period"],
-            "test_period": f["test_period"],
-            "train_sharpe": round(f["train_sharpe"], 3),
-            "test_sharpe": round(f["test_sharpe"], 3),
-            "sharpe_decay": round(f["train_sharpe"] - f["test_sharpe"], 3),
-            "train_return": f"{f['train_return']*100:.1f}%",
-            "test_return": f"{f['test_return']*100:.1f}%",
-            "train_max_dd": f"{f['train_max_dd']*100:.1f}%",
-            "test_max_dd": f"{f['test_max_dd']*100:.1f}%",
-        })
-
-    df = pd.DataFrame(rows)
-    df.to_excel(writer, sheet_name="Fold Details", index=False)
-
-
-def _write_oos_results(writer, oos_nav: pd.DataFrame, oos_metrics: Dict) -> None:
-    """Write out-of-sample test results."""
+    folds = wf_results["fold_results"]
+
+    def _col(key: str) -> np.ndarray:
+        return np.fromiter((f[key] for f in folds), dtype=np.float64, count=len(folds))
+
+    train_sharpe = _col("train_sharpe")
+    test_sharpe = _col("test_sharpe")
+
+    df = pd.DataFrame({
+        "fold": [f["fold"] for f in folds],
+        "train_period": [f["train_period"] for f in folds],
+        "test_period": [f["test_period"] for f in folds],
+        "train_sharpe": train_sharpe.round(3),
+        "test_sharpe": test_sharpe.round(3),
+        "sharpe_decay": (train_sharpe - test_sharpe).round(3),
+        "train_return": _col("train_return"),
+        "test_return": _col("test_return"),
+        "train_max_dd": _col("train_max_dd"),
+        "test_max_dd": _col("test_max_dd"),
+    })
+
+    # Keep every metric numeric; number formats are column metadata, not per-cell strings
+    num_formats = {col: "0.000" for col in ("train_sharpe", "test_sharpe", "sharpe_decay")}
+    num_formats.update(
+        {col: "0.0%" for col in ("train_return", "test_return", "train_max_dd", "test_max_dd")}
+    )
+    writer.append_df("Fold Details", df, num_formats=num_formats)
+
+
+def _write_oos_results(
+    writer: _ReportBook, oos_nav: pd.DataFrame, oos_metrics: Dict, config: OptimizerConfig,
+) -> None:
+    """Write out-of-sample test results.
+
+    A NAV longer than config.parquet_nav_rows goes to a parquet file next to
+    the workbook, leaving a one-row note in the OOS NAV sheet.
+    """
     metrics_rows = [
         {"metric": k, "value": round(v, 4) if isinstance(v, float) else v}
         for k, v in oos_metrics.items()
     ]
-    df = pd.DataFrame(metrics_rows)
-    df.to_excel(writer, sheet_name="OOS Results", index=False)
+    df = _as_float64(pd.DataFrame(metrics_rows))
+    writer.append_df("OOS Results", df)
 
-    if not oos_nav.empty:
-        oos_nav.to_excel(writer, sheet_name="OOS NAV", index=False)
+    if oos_nav.empty:
+        return
+
+    if config.large_nav_to_parquet and len(oos_nav) > config.parquet_nav_rows:
+        parquet_path = os.path.abspath(os.path.splitext(writer.output_file)[0] + "_oos_nav.parquet")
+        try:
+            oos_nav.to_parquet(parquet_path, engine="pyarrow", compression="zstd", index=False)
+        except ImportError:
+            logger.warning("pyarrow not installed, writing OOS NAV to the workbook")
+        else:
+            logger.info(f"OOS NAV ({len(oos_nav)} rows) saved: {parquet_path}")
+            note = pd.DataFrame({"note": [f"OOS NAV written to {parquet_path}"]})
+            writer.append_df("OOS NAV", note)
+            return
+
+    writer.append_df("OOS NAV", oos_nav)
 
 
 def _write_equity_curves(
-    writer, wf_results: Dict, oos_nav: pd.DataFrame,
+    writer: _ReportBook, wf_results: Dict, oos_nav: pd.DataFrame,
     benchmark_df: pd.DataFrame, config: OptimizerConfig,
 ) -> None:
     """Write combined equity curves for comparison."""
     curves = []
 
-    # Combine all test period NAVs
+    # Combine all test period NAVs; assign() labels a projection, no full copy
     for f in wf_results["fold_results"]:
         test_nav = f.get("test_nav")
         if test_nav is not None and not test_nav.empty:
-            test_nav = test_nav.copy()
-            test_nav["fold"] = f"fold_{f['fold']}_test"
-            curves.append(test_nav[["trade_date", "nav", "fold"]])
+            curves.append(test_nav[["trade_date", "nav"]].assign(fold=f"fold_{f['fold']}_test"))
 
     # Add OOS
     if not oos_nav.empty:
-        oos = oos_nav.copy()
-        oos["fold"] = "oos"
-        curves.append(oos[["trade_date", "nav", "fold"]])
+        curves.append(oos_nav[["trade_date", "nav"]].assign(fold="oos"))
 
     if curves:
+        # Add benchmark, then build the combined frame in a single concat
+        if not benchmark_df.empty:
+            bm = benchmark_df[["trade_date", "close"]].sort_values("trade_date")
+            close = bm["close"].to_numpy(dtype=np.float32)
+            nav = close * np.float32(1.0 / close[0])
+            curves.append(bm[["trade_date"]].assign(nav=nav, fold="benchmark_csi500"))
+
         combined = pd.concat(curves, ignore_index=True)
 
-        # Add benchmark
-        if not benchmark_df.empty:
-            bm = benchmark_df.copy()
-            bm = bm.sort_values("trade_date")
-            bm["nav"] = bm["close"] / bm["close"].iloc[0]
-            bm["fold"] = "benchmark_csi500"
-            combined = pd.concat([combined, bm[["trade_date", "nav", "fold"]]], ignore_index=True)
+        # A handful of labels repeated per row: store as codes, not Python strs
+        combined["fold"] = combined["fold"].astype("category")
 
-        combined.to_excel(writer, sheet_name="Equity Curves", index=False)
+        writer.append_df("Equity Curves", combined)
 
 
-def _write_stability(writer, wf_results: Dict) -> None:
+def _write_stability(writer: _ReportBook, wf_results: Dict) -> None:
     """Write weight stability analysis."""
-    all_w = wf_results["all_weights"]
-    stability_rows = []
-    for i, cat in enumerate(CATEGORY_NAMES):
-        col = all_w[:, i]
-        stability_rows.append({
-            "category": cat,
-            "min": round(col.min(), 4),
-            "max": round(col.max(), 4),
-            "std": round(col.std(), 4),
-            "cv": round(col.std() / col.mean(), 4) if col.mean() > 0 else 0,
-            "stable": "YES" if col.std() < 0.05 else "NO",
-        })
-
-    df = pd.DataFrame(stability_rows)
-    df.to_excel(writer, sheet_name="Stability Analysis", index=False)
+    all_w = np.asarray(wf_results["all_weights"], dtype=np.float64)
+    mins = all_w.min(axis=0)
+    maxs = all_w.max(axis=0)
+    stds = all_w.std(axis=0)
+    means = all_w.mean(axis=0)
+    cvs = np.divide(stds, means, out=np.zeros_like(stds), where=means > 0)
+
+    df = pd.DataFrame({
+        "category": CATEGORY_NAMES,
+        "min": mins.round(4),
+        "max": maxs.round(4),
+        "std": stds.round(4),
+        "cv": cvs.round(4),
+        "stable": np.where(stds < 0.05, "YES", "NO"),
+    })
+    writer.append_df("Stability Analysis", df)
@@ -4,6 +4,7 @@ Usage:
     python -m score.factor_optimizer.run_optimizer
     python -m score.factor_optimizer.run_optimizer --start 20220101 --end 20251231
     python -m score.factor_optimizer.run_optimizer --num-stocks 5 --holding-days 20 --initial-capital 1000000
+    python -m score.factor_optimizer.run_optimizer --report-sheets summary,fold,stability
 """
 from __future__ import annotations
 
@@ -14,7 +15,7 @@ import time
 
 import numpy as np
 
-from .config import OptimizerConfig, CATEGORY_NAMES
+from .config import OptimizerConfig, CATEGORY_NAMES, REPORT_SHEETS
 from .data_loader import load_all_data
 from .optimizer import walk_forward_optimize, run_oos_test
 from .backtest import run_backtest
@@ -29,6 +30,11 @@ def main():
     parser.add_argument("--holding-days", type=int, default=20, help="Rebalance period in days")
     parser.add_argument("--initial-capital", type=float, default=1_000_000.0, help="Initial capital for strategy and backtest")
     parser.add_argument("--output", type=str, default=None, help="Output report file")
+    parser.add_argument(
+        "--report-sheets", type=str, default=None,
+        help=f"Comma-separated report sheets to write, from {','.join(REPORT_SHEETS)} "
+             "(default: all; dry run: summary,stability)",
+    )
     parser.add_argument("--dry-run", action="store_true", help="Quick test with limited date range")
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose logging")
     args = parser.parse_args()
@@ -46,12 +52,20 @@ def main():
         args.start = 20250101
         args.end = 20250228
 
+    if args.report_sheets:
+        report_sheets = {name.strip() for name in args.report_sheets.split(",") if name.strip()}
+    elif args.dry_run:
+        report_sheets = {"summary", "stability"}
+    else:
+        report_sheets = set(REPORT_SHEETS)
+
     config = OptimizerConfig(
         backtest_start=args.start,
         backtest_end=args.end,
         num_stocks=args.num_stocks,
         holding_days=args.holding_days,
         initial_capital=args.initial_capital,
+        report_sheets=report_sheets,
     )
 
     if args.dry_run:
@@ -26,7 +26,8 @@ CREATE TABLE IF NOT EXISTS dws_fama_momentum_score (
     mtmma DECIMAL(10,4) COMMENT 'MTMMA指标',
     momentum_score DECIMAL(5,2) COMMENT '动量评分(0-22)',
     PRIMARY KEY (trade_date, ts_code),
-    INDEX idx_trade_date (trade_date)
+    INDEX idx_trade_date (trade_date),
+    INDEX idx_momentum_score (trade_date, momentum_score)
 ) COMMENT='Fama-French MOM动量因子评分';
 
 -- 价值因子评分 (HML)
@@ -40,7 +41,8 @@ CREATE TABLE IF NOT EXISTS dws_fama_value_score (
     ps_ttm DECIMAL(10,4) COMMENT 'PS(TTM)',
     value_score DECIMAL(5,2) COMMENT '价值评分(0-18)',
     PRIMARY KEY (trade_date, ts_code),
-    INDEX idx_trade_date (trade_date)
+    INDEX idx_trade_date (trade_date),
+    INDEX idx_value_score (trade_date, value_score)
 ) COMMENT='Fama-French HML价值因子评分';
 
 -- 质量因子评分 (RMW + CMA)
@@ -55,7 +57,8 @@ CREATE TABLE IF NOT EXISTS dws_fama_quality_score (
     cma_score DECIMAL(5,2) COMMENT 'CMA投资评分',
     quality_score DECIMAL(5,2) COMMENT '质量评分(0-22)',
     PRIMARY KEY (trade_date, ts_code),
-    INDEX idx_trade_date (trade_date)
+    INDEX idx_trade_date (trade_date),
+    INDEX idx_quality_score (trade_date, quality_score)
 ) COMMENT='Fama-French RMW+CMA质量因子评分';
 
 -- 技术因子评分 (精简版)
@@ -69,7 +72,8 @@ CREATE TABLE IF NOT EXISTS dws_fama_technical_score (
     rsi_6 DECIMAL(10,4) COMMENT 'RSI(6)',
     technical_score DECIMAL(5,2) COMMENT '技术评分(0-10)',
     PRIMARY KEY (trade_date, ts_code),
-    INDEX idx_trade_date (trade_date)
+    INDEX idx_trade_date (trade_date),
+    INDEX idx_technical_score (trade_date, technical_score)
 ) COMMENT='Fama-French技术因子评分';
 
 -- 资金因子评分
@@ -81,7 +85,8 @@ CREATE TABLE IF NOT EXISTS dws_fama_capital_score (
     margin_net_pct DECIMAL(10,4) COMMENT '融资净买入比例(%)',
     capital_score DECIMAL(5,2) COMMENT '资金评分(0-10)',
     PRIMARY KEY (trade_date, ts_code),
-    INDEX idx_trade_date (trade_date)
+    INDEX idx_trade_date (trade_date),
+    INDEX idx_capital_score (trade_date, capital_score)
 ) COMMENT='Fama-French资金因子评分';
 
 -- 筹码因子评分
@@ -92,7 +97,8 @@ CREATE TABLE IF NOT EXISTS dws_fama_chip_score (
     cost_deviation DECIMAL(10,4) COMMENT '成本偏离度',
     chip_score DECIMAL(5,2) COMMENT '筹码评分(0-8)',
     PRIMARY KEY (trade_date, ts_code),
-    INDEX idx_trade_date (trade_date)
+    INDEX idx_trade_date (trade_date),
+    INDEX idx_chip_score (trade_date, chip_score)
 ) COMMENT='Fama-French筹码因子评分';
 
 -- 综合评分视图
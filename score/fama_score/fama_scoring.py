@@ -15,26 +15,138 @@ Fama-French 评分系统
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; momentum scoring falls back to np.select
+    njit = None
+    prange = range
 
 logger = logging.getLogger(__name__)
 
 
-def run_fama_scoring(cursor, trade_date: Optional[int] = None) -> None:
-    """运行 Fama-French 评分计算"""
-    logger.info(f"开始 Fama-French 评分计算: {trade_date or 'all'}")
-    
-    _run_size_score(cursor, trade_date)
-    _run_fama_momentum_score(cursor, trade_date)
-    _run_fama_value_score(cursor, trade_date)
-    _run_fama_quality_score(cursor, trade_date)
-    _run_fama_technical_score(cursor, trade_date)
-    _run_fama_capital_score(cursor, trade_date)
-    _run_fama_chip_score(cursor, trade_date)
-    
+def _bucket_score(expr: str, edges: Sequence[float], scores: Sequence[float], default: float) -> str:
+    """生成 "值 < 边界" 阶梯评分的 SQL 表达式
+
+    INTERVAL() 对常量边界做二分查找, 返回落入的区间序号, ELT() 按序号
+    取分数, 等价于逐级比较的 CASE WHEN expr < edge 阶梯, 但每行只需
+    O(log n) 次比较. expr 为 NULL 时 INTERVAL 返回 -1, 取 default.
+
+    Args:
+        expr: 被评分的 SQL 表达式
+        edges: 升序区间上界 (不含)
+        scores: 各区间分数, 长度为 len(edges) + 1
+        default: expr 为 NULL 时的分数
+
+    Returns:
+        SQL 表达式字符串
+    """
+    if len(scores) != len(edges) + 1:
+        raise ValueError("scores must have exactly one more entry than edges")
+    edge_sql = ", ".join(str(e) for e in edges)
+    score_sql = ", ".join(str(float(v)) for v in (default, *scores))
+    return f"CAST(ELT(INTERVAL({expr}, {edge_sql}) + 2, {score_sql}) AS DECIMAL(6, 2))"
+
+
+# 流通市值(万元)分档: <30亿 10分, 30-80亿 8分, 80-200亿 6分, 200-500亿 4分, 500-1000亿 2分, >1000亿 1分
+_SIZE_SCORE_SQL = _bucket_score(
+    "sf.circ_mv", (300000, 800000, 2000000, 5000000, 10000000), (10, 8, 6, 4, 2, 1), default=1,
+)
+# 资产负债率分档: <30% 4分, 30-50% 3分, 50-70% 2分, 其余 0分
+_DEBT_SCORE_SQL = _bucket_score(
+    "fs.debt_to_assets", (30, 50, 70), (4, 3, 2, 0), default=0,
+)
+
+
+def run_fama_scoring(
+    cursor,
+    trade_date: Optional[int] = None,
+    connect: Optional[Callable[[], Any]] = None,
+    max_workers: int = 4,
+    vectorized: bool = False,
+) -> None:
+    """运行 Fama-French 评分计算
+
+    Args:
+        cursor: 数据库游标, 串行执行时使用
+        trade_date: 交易日, None 表示全部
+        connect: 可选的连接工厂. 提供时七项评分各用独立连接并发执行,
+            每项完成后单独提交; 各评分写入不同的表, 互不冲突. 注意此时
+            单日评分不再是一个事务: 中途失败会留下部分维度已提交的结果.
+            不提供时全部在 cursor 所属连接上执行, 由调用方统一提交
+        max_workers: 并发执行的线程数
+        vectorized: 市值/动量评分改为取数后在 NumPy 中计算, 再批量写回
+    """
+    logger.info("开始 Fama-French 评分计算: %s", trade_date or "all")
+
+    scorers = (
+        _run_size_score_numpy if vectorized else _run_size_score,
+        _run_fama_momentum_score_numpy if vectorized else _run_fama_momentum_score,
+        _run_fama_value_score,
+        _run_fama_quality_score,
+        _run_fama_technical_score,
+        _run_fama_capital_score,
+        _run_fama_chip_score,
+    )
+    if connect is None or max_workers <= 1:
+        for scorer in scorers:
+            scorer(cursor, trade_date)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(_run_on_own_connection, connect, scorer, trade_date)
+                for scorer in scorers
+            ]
+            for future in futures:
+                future.result()
+
     logger.info("Fama-French 评分计算完成")
 
 
+def _run_on_own_connection(connect: Callable[[], Any], scorer: Callable, trade_date: Optional[int]) -> None:
+    """在独立连接上执行单项评分并提交"""
+    conn = connect()
+    try:
+        with conn.cursor() as cursor:
+            scorer(cursor, trade_date)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _execute_by_date(cursor, sql: str, trade_date: Optional[int], date_table: str) -> int:
+    """按交易日执行评分 SQL, 返回影响行数
+
+    指定 trade_date 时只执行一次; 未指定时逐个交易日执行, 每次窗口函数
+    只需排序单日数据, 避免全表一次性排序落盘. 评分窗口均按 trade_date
+    分区, 分日执行结果与全量执行一致.
+
+    Args:
+        cursor: 数据库游标
+        sql: 含一个 trade_date 占位符的 INSERT ... SELECT 语句
+        trade_date: 交易日, None 表示全部
+        date_table: 全量模式下枚举交易日的源表
+    """
+    total = 0
+    for day in _trade_dates(cursor, trade_date, date_table):
+        cursor.execute(sql, (day,))
+        total += cursor.rowcount
+    return total
+
+
+def _trade_dates(cursor, trade_date: Optional[int], date_table: str) -> List[int]:
+    """返回待计算的交易日: 指定日期或源表全部交易日"""
+    if trade_date is not None:
+        return [trade_date]
+    cursor.execute(f"SELECT DISTINCT trade_date FROM {date_table} ORDER BY trade_date")
+    return [row[0] for row in cursor.fetchall()]
+
+
 def _run_size_score(cursor, trade_date: Optional[int] = None) -> None:
     """计算 SMB 市值因子评分 (0-10分)
     
@@ -46,11 +158,7 @@ def _run_size_score(cursor, trade_date: Optional[int] = None) -> None:
     - 500-1000亿: 2分
     - > 1000亿: 1分
     """
-    filter_sql = ""
-    params = []
-    if trade_date is not None:
-        filter_sql = "WHERE sf.trade_date = %s"
-        params.append(trade_date)
+    filter_sql = "WHERE sf.trade_date = %s"
     
     sql = f"""
     INSERT INTO dws_fama_size_score (trade_date, ts_code, circ_mv, size_rank, size_score)
@@ -61,23 +169,16 @@ def _run_size_score(cursor, trade_date: Optional[int] = None) -> None:
         -- 市值排名百分位 (越小越好)
         PERCENT_RANK() OVER (PARTITION BY sf.trade_date ORDER BY sf.circ_mv ASC) AS size_rank,
         -- 市值评分
-        CASE 
-            WHEN sf.circ_mv < 300000 THEN 10.0   -- < 30亿
-            WHEN sf.circ_mv < 800000 THEN 8.0    -- 30-80亿
-            WHEN sf.circ_mv < 2000000 THEN 6.0   -- 80-200亿
-            WHEN sf.circ_mv < 5000000 THEN 4.0   -- 200-500亿
-            WHEN sf.circ_mv < 10000000 THEN 2.0  -- 500-1000亿
-            ELSE 1.0                              -- > 1000亿
-        END AS size_score
-    FROM ods_stk_factor sf
+        {_SIZE_SCORE_SQL} AS size_score
+    FROM ods_stk_factor sf FORCE INDEX (idx_stk_factor_size)
     {filter_sql}
     ON DUPLICATE KEY UPDATE
         circ_mv = VALUES(circ_mv),
         size_rank = VALUES(size_rank),
         size_score = VALUES(size_score)
     """
-    cursor.execute(sql, params if params else None)
-    logger.info(f"SMB市值评分完成: {cursor.rowcount} rows")
+    rows = _execute_by_date(cursor, sql, trade_date, "ods_stk_factor")
+    logger.info("SMB市值评分完成: %d rows", rows)
 
 
 def _run_fama_momentum_score(cursor, trade_date: Optional[int] = None) -> None:
@@ -90,11 +191,7 @@ def _run_fama_momentum_score(cursor, trade_date: Optional[int] = None) -> None:
     - MTM: 4分
     - MTMMA交叉: 2分
     """
-    filter_sql = ""
-    params = []
-    if trade_date is not None:
-        filter_sql = "WHERE sf.trade_date = %s"
-        params.append(trade_date)
+    filter_sql = "WHERE sf.trade_date = %s"
     
     # 由于12月动量需要历史数据，这里简化处理，使用现有的MTM指标
     sql = f"""
@@ -144,7 +241,7 @@ def _run_fama_momentum_score(cursor, trade_date: Optional[int] = None) -> None:
             -- 预留 12月动量/1月反转 (4分), 暂用固定值
             2.0
         ) AS momentum_score
-    FROM ods_stk_factor sf
+    FROM ods_stk_factor sf FORCE INDEX (idx_stk_factor_mom)
     {filter_sql}
     ON DUPLICATE KEY UPDATE
         volume_ratio = VALUES(volume_ratio),
@@ -153,8 +250,8 @@ def _run_fama_momentum_score(cursor, trade_date: Optional[int] = None) -> None:
         mtmma = VALUES(mtmma),
         momentum_score = VALUES(momentum_score)
     """
-    cursor.execute(sql, params if params else None)
-    logger.info(f"MOM动量评分完成: {cursor.rowcount} rows")
+    rows = _execute_by_date(cursor, sql, trade_date, "ods_stk_factor")
+    logger.info("MOM动量评分完成: %d rows", rows)
 
 
 def _run_fama_value_score(cursor, trade_date: Optional[int] = None) -> None:
@@ -164,11 +261,7 @@ def _run_fama_value_score(cursor, trade_date: Optional[int] = None) -> None:
     - PE: 5分
     - PS: 5分
     """
-    filter_sql = ""
-    params = []
-    if trade_date is not None:
-        filter_sql = "WHERE sf.trade_date = %s"
-        params.append(trade_date)
+    filter_sql = "WHERE sf.trade_date = %s"
     
     sql = f"""
     INSERT INTO dws_fama_value_score (
@@ -208,7 +301,7 @@ def _run_fama_value_score(cursor, trade_date: Optional[int] = None) -> None:
                 ELSE 0
             END
         ) AS value_score
-    FROM ods_stk_factor sf
+    FROM ods_stk_factor sf FORCE INDEX (idx_stk_factor_value)
     {filter_sql}
     ON DUPLICATE KEY UPDATE
         pb = VALUES(pb),
@@ -218,8 +311,8 @@ def _run_fama_value_score(cursor, trade_date: Optional[int] = None) -> None:
         ps_ttm = VALUES(ps_ttm),
         value_score = VALUES(value_score)
     """
-    cursor.execute(sql, params if params else None)
-    logger.info(f"HML价值评分完成: {cursor.rowcount} rows")
+    rows = _execute_by_date(cursor, sql, trade_date, "ods_stk_factor")
+    logger.info("HML价值评分完成: %d rows", rows)
 
 
 def _run_fama_quality_score(cursor, trade_date: Optional[int] = None) -> None:
@@ -233,13 +326,7 @@ def _run_fama_quality_score(cursor, trade_date: Optional[int] = None) -> None:
     CMA 投资因子 (5分):
     - 资产增长率: 5分 (待实现)
     """
-    filter_sql = ""
-    params = []
-    if trade_date is not None:
-        filter_sql = "WHERE fs.trade_date = %s AND fs.roe_ttm IS NOT NULL"
-        params.append(trade_date)
-    else:
-        filter_sql = "WHERE fs.roe_ttm IS NOT NULL"
+    filter_sql = "WHERE fs.trade_date = %s AND fs.roe_ttm IS NOT NULL"
     
     sql = f"""
     INSERT INTO dws_fama_quality_score (
@@ -268,12 +355,7 @@ def _run_fama_quality_score(cursor, trade_date: Optional[int] = None) -> None:
                 WHEN fs.grossprofit_margin > 20 THEN 2.0
                 ELSE 0
             END +
-            CASE 
-                WHEN fs.debt_to_assets < 30 THEN 4.0
-                WHEN fs.debt_to_assets < 50 THEN 3.0
-                WHEN fs.debt_to_assets < 70 THEN 2.0
-                ELSE 0
-            END
+            {_DEBT_SCORE_SQL}
         ) AS rwm_score,
         -- CMA投资评分 (5分) - 暂用中间值
         2.5 AS cma_score,
@@ -292,12 +374,7 @@ def _run_fama_quality_score(cursor, trade_date: Optional[int] = None) -> None:
                 WHEN fs.grossprofit_margin > 20 THEN 2.0
                 ELSE 0
             END +
-            CASE 
-                WHEN fs.debt_to_assets < 30 THEN 4.0
-                WHEN fs.debt_to_assets < 50 THEN 3.0
-                WHEN fs.debt_to_assets < 70 THEN 2.0
-                ELSE 0
-            END +
+            {_DEBT_SCORE_SQL} +
             2.5  -- CMA暂用固定值
         ) AS quality_score
     FROM dwd_fina_snapshot fs
@@ -311,8 +388,8 @@ def _run_fama_quality_score(cursor, trade_date: Optional[int] = None) -> None:
         cma_score = VALUES(cma_score),
         quality_score = VALUES(quality_score)
     """
-    cursor.execute(sql, params if params else None)
-    logger.info(f"RMW+CMA质量评分完成: {cursor.rowcount} rows")
+    rows = _execute_by_date(cursor, sql, trade_date, "dwd_fina_snapshot")
+    logger.info("RMW+CMA质量评分完成: %d rows", rows)
 
 
 def _run_fama_technical_score(cursor, trade_date: Optional[int] = None) -> None:
@@ -322,11 +399,7 @@ def _run_fama_technical_score(cursor, trade_date: Optional[int] = None) -> None:
     - KDJ: 3分
     - RSI: 3分
     """
-    filter_sql = ""
-    params = []
-    if trade_date is not None:
-        filter_sql = "WHERE sf.trade_date = %s"
-        params.append(trade_date)
+    filter_sql = "WHERE sf.trade_date = %s"
     
     sql = f"""
     INSERT INTO dws_fama_technical_score (
@@ -363,7 +436,7 @@ def _run_fama_technical_score(cursor, trade_date: Optional[int] = None) -> None:
                 ELSE 1.0
             END
         ) AS technical_score
-    FROM ods_stk_factor sf
+    FROM ods_stk_factor sf FORCE INDEX (idx_stk_factor_tech)
     {filter_sql}
     ON DUPLICATE KEY UPDATE
         macd = VALUES(macd),
@@ -373,69 +446,77 @@ def _run_fama_technical_score(cursor, trade_date: Optional[int] = None) -> None:
         rsi_6 = VALUES(rsi_6),
         technical_score = VALUES(technical_score)
     """
-    cursor.execute(sql, params if params else None)
-    logger.info(f"技术评分完成: {cursor.rowcount} rows")
+    rows = _execute_by_date(cursor, sql, trade_date, "ods_stk_factor")
+    logger.info("技术评分完成: %d rows", rows)
 
 
 def _run_fama_capital_score(cursor, trade_date: Optional[int] = None) -> None:
-    """计算资金因子评分 (0-10分)"""
-    filter_sql = ""
-    params = []
-    if trade_date is not None:
-        filter_sql = "WHERE mf.trade_date = %s"
-        params.append(trade_date)
+    """计算资金因子评分 (0-10分)
+
+    超大单/大单净额与融资净买入占比先在 CTE 中各算一次, 评分 CASE 直接引用.
+    """
+    filter_sql = "WHERE mf.trade_date = %s"
     
     sql = f"""
     INSERT INTO dws_fama_capital_score (trade_date, ts_code, elg_net, lg_net, margin_net_pct, capital_score)
+    WITH flow AS (
+        SELECT
+            mf.trade_date,
+            mf.ts_code,
+            mf.buy_elg_amount - mf.sell_elg_amount AS elg_diff,
+            mf.buy_lg_amount - mf.sell_lg_amount AS lg_diff,
+            COALESCE(mf.buy_elg_amount, 0) - COALESCE(mf.sell_elg_amount, 0) AS elg_diff_filled,
+            COALESCE(mf.buy_lg_amount, 0) - COALESCE(mf.sell_lg_amount, 0) AS lg_diff_filled,
+            mg.ts_code AS margin_ts_code,
+            mg.rzye,
+            (mg.rzmre - mg.rzche) / NULLIF(mg.rzye, 0) * 100 AS margin_pct
+        FROM ods_moneyflow mf
+        LEFT JOIN ods_margin_detail mg ON mf.trade_date = mg.trade_date AND mf.ts_code = mg.ts_code
+        {filter_sql}
+    )
     SELECT
-        mf.trade_date,
-        mf.ts_code,
-        (COALESCE(mf.buy_elg_amount, 0) - COALESCE(mf.sell_elg_amount, 0)) / 10000 AS elg_net,
-        (COALESCE(mf.buy_lg_amount, 0) - COALESCE(mf.sell_lg_amount, 0)) / 10000 AS lg_net,
-        CASE WHEN mg.rzye > 0 THEN (mg.rzmre - mg.rzche) / mg.rzye * 100 ELSE NULL END AS margin_net_pct,
+        trade_date,
+        ts_code,
+        elg_diff_filled / 10000 AS elg_net,
+        lg_diff_filled / 10000 AS lg_net,
+        CASE WHEN rzye > 0 THEN margin_pct ELSE NULL END AS margin_net_pct,
         (
             CASE 
-                WHEN (mf.buy_elg_amount - mf.sell_elg_amount) > 100000000 THEN 5.0
-                WHEN (mf.buy_elg_amount - mf.sell_elg_amount) > 50000000 THEN 4.0
-                WHEN (mf.buy_elg_amount - mf.sell_elg_amount) > 10000000 THEN 2.0
-                WHEN (mf.buy_elg_amount - mf.sell_elg_amount) > 0 THEN 1.0
+                WHEN elg_diff > 100000000 THEN 5.0
+                WHEN elg_diff > 50000000 THEN 4.0
+                WHEN elg_diff > 10000000 THEN 2.0
+                WHEN elg_diff > 0 THEN 1.0
                 ELSE 0
             END +
             CASE 
-                WHEN (mf.buy_lg_amount - mf.sell_lg_amount) > 50000000 THEN 3.0
-                WHEN (mf.buy_lg_amount - mf.sell_lg_amount) > 20000000 THEN 2.0
-                WHEN (mf.buy_lg_amount - mf.sell_lg_amount) > 0 THEN 1.0
+                WHEN lg_diff > 50000000 THEN 3.0
+                WHEN lg_diff > 20000000 THEN 2.0
+                WHEN lg_diff > 0 THEN 1.0
                 ELSE 0
             END +
             CASE 
-                WHEN mg.ts_code IS NULL THEN 1.0
-                WHEN mg.rzye = 0 THEN 1.0
-                WHEN (mg.rzmre - mg.rzche) / mg.rzye * 100 > 2.0 THEN 2.0
-                WHEN (mg.rzmre - mg.rzche) / mg.rzye * 100 > 0.5 THEN 1.5
-                WHEN (mg.rzmre - mg.rzche) / mg.rzye * 100 > 0 THEN 1.0
+                WHEN margin_ts_code IS NULL THEN 1.0
+                WHEN rzye = 0 THEN 1.0
+                WHEN margin_pct > 2.0 THEN 2.0
+                WHEN margin_pct > 0.5 THEN 1.5
+                WHEN margin_pct > 0 THEN 1.0
                 ELSE 0.5
             END
         ) AS capital_score
-    FROM ods_moneyflow mf
-    LEFT JOIN ods_margin_detail mg ON mf.trade_date = mg.trade_date AND mf.ts_code = mg.ts_code
-    {filter_sql}
+    FROM flow
     ON DUPLICATE KEY UPDATE
         elg_net = VALUES(elg_net),
         lg_net = VALUES(lg_net),
         margin_net_pct = VALUES(margin_net_pct),
         capital_score = VALUES(capital_score)
     """
-    cursor.execute(sql, params if params else None)
-    logger.info(f"资金评分完成: {cursor.rowcount} rows")
+    rows = _execute_by_date(cursor, sql, trade_date, "ods_moneyflow")
+    logger.info("资金评分完成: %d rows", rows)
 
 
 def _run_fama_chip_score(cursor, trade_date: Optional[int] = None) -> None:
     """计算筹码因子评分 (0-8分)"""
-    filter_sql = ""
-    params = []
-    if trade_date is not None:
-        filter_sql = "WHERE c.trade_date = %s"
-        params.append(trade_date)
+    filter_sql = "WHERE c.trade_date = %s"
     
     sql = f"""
     INSERT INTO dws_fama_chip_score (trade_date, ts_code, winner_rate, cost_deviation, chip_score)
@@ -469,5 +550,186 @@ def _run_fama_chip_score(cursor, trade_date: Optional[int] = None) -> None:
         cost_deviation = VALUES(cost_deviation),
         chip_score = VALUES(chip_score)
     """
-    cursor.execute(sql, params if params else None)
-    logger.info(f"筹码评分完成: {cursor.rowcount} rows")
+    rows = _execute_by_date(cursor, sql, trade_date, "ods_cyq_perf")
+    logger.info("筹码评分完成: %d rows", rows)
+
+
+# ---------------------------------------------------------------------------
+# 向量化评分: 取单日数据到 NumPy 计算, 结果用 executemany 批量写回.
+# 规则与上面的 SQL 版本一致; NULL 读为 NaN, 所有比较为 False, 与 SQL 中
+# NULL 落入 ELSE 分支相同.
+# ---------------------------------------------------------------------------
+
+_SIZE_EDGES = np.array([300000, 800000, 2000000, 5000000, 10000000], dtype=np.float64)
+_SIZE_SCORES = np.array([10.0, 8.0, 6.0, 4.0, 2.0, 1.0])
+
+
+def score_size(circ_mv: np.ndarray) -> np.ndarray:
+    """SMB 市值评分, 分档同 _run_size_score"""
+    circ_mv = np.asarray(circ_mv, dtype=np.float64)
+    scores = _SIZE_SCORES[np.searchsorted(_SIZE_EDGES, circ_mv, side="right")]
+    return np.where(np.isnan(circ_mv), 1.0, scores)
+
+
+def percent_rank(values: np.ndarray) -> np.ndarray:
+    """等价于 PERCENT_RANK() OVER (ORDER BY values ASC), NULL(NaN) 排最前"""
+    values = np.where(np.isnan(values), -np.inf, values)
+    n = values.size
+    if n <= 1:
+        return np.zeros(n)
+    rank = np.searchsorted(np.sort(values), values, side="left")
+    return rank / (n - 1)
+
+
+def _momentum_score_kernel(volume_ratio, turnover_rate, mtm, mtmma, out):
+    for i in prange(out.shape[0]):
+        vr = volume_ratio[i]
+        tr = turnover_rate[i]
+        m = mtm[i]
+        ma = mtmma[i]
+        s = 2.0  # 预留 12月动量/1月反转
+
+        if vr > 1.5:
+            s += 4.0
+        elif vr > 1.2:
+            s += 3.0
+        elif vr > 1.0:
+            s += 2.0
+        else:
+            s += 1.0
+
+        if tr > 10:
+            s += 4.0
+        elif tr > 5:
+            s += 3.0
+        elif tr > 2:
+            s += 2.0
+        else:
+            s += 1.0
+
+        if m > 1.0:
+            s += 6.0
+        elif m > 0.5:
+            s += 5.0
+        elif m > 0.2:
+            s += 4.0
+        elif m > 0:
+            s += 3.0
+        elif m > -0.5:
+            s += 1.0
+
+        if m > ma and m > 0 and ma > 0:
+            s += 4.0
+        elif m > ma and m > 0:
+            s += 3.0
+        elif m > 0 and ma > 0:
+            s += 2.0
+        elif abs(m) < 0.1:
+            s += 1.0
+
+        out[i] = s
+
+
+_momentum_score_fused = (
+    njit(parallel=True, cache=True)(_momentum_score_kernel) if njit is not None else None
+)
+
+
+def score_momentum(
+    volume_ratio: np.ndarray, turnover_rate: np.ndarray, mtm: np.ndarray, mtmma: np.ndarray,
+) -> np.ndarray:
+    """MOM 动量评分, 规则同 _run_fama_momentum_score"""
+    vr, tr, m, ma = (np.ascontiguousarray(a, dtype=np.float64) for a in (volume_ratio, turnover_rate, mtm, mtmma))
+    if _momentum_score_fused is not None:
+        out = np.empty(vr.shape[0])
+        _momentum_score_fused(vr, tr, m, ma, out)
+        return out
+
+    return (
+        np.select([vr > 1.5, vr > 1.2, vr > 1.0], [4.0, 3.0, 2.0], default=1.0)
+        + np.select([tr > 10, tr > 5, tr > 2], [4.0, 3.0, 2.0], default=1.0)
+        + np.select([m > 1.0, m > 0.5, m > 0.2, m > 0, m > -0.5], [6.0, 5.0, 4.0, 3.0, 1.0], default=0.0)
+        + np.select(
+            [(m > ma) & (m > 0) & (ma > 0), (m > ma) & (m > 0), (m > 0) & (ma > 0), np.abs(m) < 0.1],
+            [4.0, 3.0, 2.0, 1.0],
+            default=0.0,
+        )
+        + 2.0
+    )
+
+
+def _fetch_frame(cursor, sql: str, params: tuple, columns: List[str]) -> pd.DataFrame:
+    """执行查询并返回 DataFrame, DECIMAL 转 float, NULL 转 NaN"""
+    cursor.execute(sql, params)
+    return pd.DataFrame.from_records(cursor.fetchall(), columns=columns, coerce_float=True)
+
+
+def _to_db_rows(df: pd.DataFrame) -> List[tuple]:
+    """DataFrame 转 executemany 参数, NaN 写回为 NULL"""
+    return list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+
+
+def _run_size_score_numpy(cursor, trade_date: Optional[int] = None) -> None:
+    """SMB 市值评分 (向量化版本)"""
+    insert_sql = """
+    INSERT INTO dws_fama_size_score (trade_date, ts_code, circ_mv, size_rank, size_score)
+    VALUES (%s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        circ_mv = VALUES(circ_mv),
+        size_rank = VALUES(size_rank),
+        size_score = VALUES(size_score)
+    """
+    total = 0
+    for day in _trade_dates(cursor, trade_date, "ods_stk_factor"):
+        df = _fetch_frame(
+            cursor,
+            "SELECT trade_date, ts_code, circ_mv FROM ods_stk_factor "
+            "FORCE INDEX (idx_stk_factor_size) WHERE trade_date = %s",
+            (day,),
+            ["trade_date", "ts_code", "circ_mv"],
+        )
+        if df.empty:
+            continue
+        circ_mv = df["circ_mv"].to_numpy(dtype=np.float64)
+        df["size_rank"] = percent_rank(circ_mv)
+        df["size_score"] = score_size(circ_mv)
+        cursor.executemany(insert_sql, _to_db_rows(df))
+        total += len(df)
+    logger.info("SMB市值评分完成: %d rows", total)
+
+
+def _run_fama_momentum_score_numpy(cursor, trade_date: Optional[int] = None) -> None:
+    """MOM 动量评分 (向量化版本)"""
+    insert_sql = """
+    INSERT INTO dws_fama_momentum_score (
+        trade_date, ts_code, volume_ratio, turnover_rate, mtm, mtmma, momentum_score
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        volume_ratio = VALUES(volume_ratio),
+        turnover_rate = VALUES(turnover_rate),
+        mtm = VALUES(mtm),
+        mtmma = VALUES(mtmma),
+        momentum_score = VALUES(momentum_score)
+    """
+    columns = ["trade_date", "ts_code", "volume_ratio", "turnover_rate", "mtm", "mtmma"]
+    total = 0
+    for day in _trade_dates(cursor, trade_date, "ods_stk_factor"):
+        df = _fetch_frame(
+            cursor,
+            "SELECT trade_date, ts_code, volume_ratio, turnover_rate, mtm_qfq, mtmma_qfq "
+            "FROM ods_stk_factor FORCE INDEX (idx_stk_factor_mom) WHERE trade_date = %s",
+            (day,),
+            columns,
+        )
+        if df.empty:
+            continue
+        df["momentum_score"] = score_momentum(
+            df["volume_ratio"].to_numpy(dtype=np.float64),
+            df["turnover_rate"].to_numpy(dtype=np.float64),
+            df["mtm"].to_numpy(dtype=np.float64),
+            df["mtmma"].to_numpy(dtype=np.float64),
+        )
+        cursor.executemany(insert_sql, _to_db_rows(df))
+        total += len(df)
+    logger.info("MOM动量评分完成: %d rows", total)
@@ -3,92 +3,119 @@ Fama-French 评分查询模块
 """
 from __future__ import annotations
 
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
-from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from ..sql_io import cached_engine, read_sql
+
 
 def get_engine(host: str = 'localhost', port: int = 3306, user: str = 'root',
                password: str = '', database: str = 'ashare') -> Engine:
-    """创建数据库引擎"""
-    from sqlalchemy import create_engine
+    """创建数据库引擎 (同一连接参数复用同一连接池)"""
     url = f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}"
-    return create_engine(url)
+    return cached_engine(url)
+
+
+# (维度, 评分表, 评分列)
+FAMA_SCORE_TABLES = (
+    ("size", "dws_fama_size_score", "size_score"),
+    ("momentum", "dws_fama_momentum_score", "momentum_score"),
+    ("value", "dws_fama_value_score", "value_score"),
+    ("quality", "dws_fama_quality_score", "quality_score"),
+    ("technical", "dws_fama_technical_score", "technical_score"),
+    ("capital", "dws_fama_capital_score", "capital_score"),
+    ("chip", "dws_fama_chip_score", "chip_score"),
+)
+
+# 各评分表按日过滤后纵向拼接, 不做表间 JOIN; 每个分支用 USE INDEX 指定
+# (trade_date, <score>) 覆盖索引 (二级索引自带主键 ts_code), 避免走 idx_trade_date 回表
+_FAMA_UNION_SQL = "\n                UNION ALL ".join(
+    f"SELECT ts_code, '{dim}' AS dim, {col} AS score FROM {table} USE INDEX (idx_{col}) "
+    f"WHERE trade_date = :trade_date"
+    for dim, table, col in FAMA_SCORE_TABLES
+)
+# 长表转宽表
+_FAMA_PIVOT_SQL = ",\n                ".join(
+    f"SUM(CASE WHEN dim = '{dim}' THEN score END) AS {col}"
+    for dim, _, col in FAMA_SCORE_TABLES
+)
 
 
 class FamaScoreQuery:
     """Fama-French 评分查询类"""
     
-    def __init__(self, engine: Engine):
+    def __init__(self, engine: Engine, cache_size: int = 8):
         self.engine = engine
+        # 按 trade_date 缓存查询结果; 重新评分后调用 clear_cache()
+        self._scores = lru_cache(maxsize=cache_size)(self._load_scores)
+    
+    def clear_cache(self) -> None:
+        """清空按日缓存的评分"""
+        self._scores.cache_clear()
     
     def get_all_scores(self, trade_date: int) -> pd.DataFrame:
-        """获取指定日期所有股票的 Fama 评分"""
-        sql = """
+        """获取指定日期所有股票的 Fama 评分 (按日缓存, 返回副本)"""
+        return self._scores(trade_date).copy()
+    
+    def _load_scores(self, trade_date: int) -> pd.DataFrame:
+        """查询指定日期所有股票的 Fama 评分
+
+        七张评分表按日过滤后 UNION ALL 成 (ts_code, dim, score) 长表, 一次
+        GROUP BY 聚合成宽表, 代替七次 LEFT JOIN; 仅保留有市值评分的股票,
+        与原先以 dws_fama_size_score 为驱动表的结果一致.
+        """
+        sql = f"""
+        WITH fama AS (
+            SELECT ts_code,
+                {_FAMA_PIVOT_SQL},
+                SUM(COALESCE(score, 0)) AS total_score,
+                MAX(dim = 'size') AS has_size
+            FROM ({_FAMA_UNION_SQL}) u
+            GROUP BY ts_code
+        )
         SELECT 
-            s.trade_date, s.ts_code,
+            :trade_date AS trade_date, f.ts_code,
             ds.name,
             od.pct_chg,
             CASE WHEN od.pct_chg >= 9.9 THEN '涨停' 
                  WHEN od.pct_chg <= -9.9 THEN '跌停'
                  ELSE '' END AS limit_flag,
-            s.size_score,
-            m.momentum_score,
-            v.value_score,
-            q.quality_score,
-            t.technical_score,
-            c.capital_score,
-            ch.chip_score,
-            (COALESCE(s.size_score, 0) + COALESCE(m.momentum_score, 0) + 
-             COALESCE(v.value_score, 0) + COALESCE(q.quality_score, 0) + 
-             COALESCE(t.technical_score, 0) + COALESCE(c.capital_score, 0) + 
-             COALESCE(ch.chip_score, 0)) AS total_score
-        FROM dws_fama_size_score s
-        LEFT JOIN dws_fama_momentum_score m ON s.trade_date = m.trade_date AND s.ts_code = m.ts_code
-        LEFT JOIN dws_fama_value_score v ON s.trade_date = v.trade_date AND s.ts_code = v.ts_code
-        LEFT JOIN dws_fama_quality_score q ON s.trade_date = q.trade_date AND s.ts_code = q.ts_code
-        LEFT JOIN dws_fama_technical_score t ON s.trade_date = t.trade_date AND s.ts_code = t.ts_code
-        LEFT JOIN dws_fama_capital_score c ON s.trade_date = c.trade_date AND s.ts_code = c.ts_code
-        LEFT JOIN dws_fama_chip_score ch ON s.trade_date = ch.trade_date AND s.ts_code = ch.ts_code
-        LEFT JOIN ods_daily od ON s.trade_date = od.trade_date AND s.ts_code = od.ts_code
-        LEFT JOIN dim_stock ds ON s.ts_code = ds.ts_code
-        WHERE s.trade_date = :trade_date
+            f.size_score,
+            f.momentum_score,
+            f.value_score,
+            f.quality_score,
+            f.technical_score,
+            f.capital_score,
+            f.chip_score,
+            f.total_score
+        FROM fama f
+        LEFT JOIN ods_daily od ON od.trade_date = :trade_date AND f.ts_code = od.ts_code
+        LEFT JOIN dim_stock ds ON f.ts_code = ds.ts_code
+        WHERE f.has_size = 1
         """
-        return pd.read_sql(text(sql), self.engine, params={"trade_date": trade_date})
+        return read_sql(self.engine, sql, {"trade_date": trade_date})
     
     def get_top_stocks(self, trade_date: int, top_n: int = 50, 
                        min_score: float = 0) -> pd.DataFrame:
         """获取评分最高的股票"""
-        df = self.get_all_scores(trade_date)
+        df = self._scores(trade_date)
         if df.empty:
             return df
         
         df = df[df['total_score'] >= min_score]
-        df = df.sort_values('total_score', ascending=False).head(top_n)
-        df['rank'] = range(1, len(df) + 1)
+        if top_n < len(df):
+            # 只需前 top_n: argpartition 选出候选后再对小集合排序
+            idx = np.argpartition(-df['total_score'].to_numpy(), top_n - 1)[:top_n]
+            df = df.iloc[idx]
+        df = df.sort_values('total_score', ascending=False)
+        df['rank'] = np.arange(1, len(df) + 1, dtype=np.int32)
         return df
     
     def compare_with_claude(self, trade_date: int, top_n: int = 50) -> pd.DataFrame:
         """对比 Fama 评分与 Claude 评分的 Top 股票"""
-        fama_sql = """
-        SELECT 
-            s.ts_code,
-            ds.name,
-            (COALESCE(s.size_score, 0) + COALESCE(m.momentum_score, 0) + 
-             COALESCE(v.value_score, 0) + COALESCE(q.quality_score, 0) + 
-             COALESCE(t.technical_score, 0) + COALESCE(c.capital_score, 0) + 
-             COALESCE(ch.chip_score, 0)) AS fama_score
-        FROM dws_fama_size_score s
-        LEFT JOIN dws_fama_momentum_score m ON s.trade_date = m.trade_date AND s.ts_code = m.ts_code
-        LEFT JOIN dws_fama_value_score v ON s.trade_date = v.trade_date AND s.ts_code = v.ts_code
-        LEFT JOIN dws_fama_quality_score q ON s.trade_date = q.trade_date AND s.ts_code = q.ts_code
-        LEFT JOIN dws_fama_technical_score t ON s.trade_date = t.trade_date AND s.ts_code = t.ts_code
-        LEFT JOIN dws_fama_capital_score c ON s.trade_date = c.trade_date AND s.ts_code = c.ts_code
-        LEFT JOIN dws_fama_chip_score ch ON s.trade_date = ch.trade_date AND s.ts_code = ch.ts_code
-        LEFT JOIN dim_stock ds ON s.ts_code = ds.ts_code
-        WHERE s.trade_date = :trade_date
-        """
-        
         claude_sql = """
         SELECT 
             m.ts_code,
@@ -104,17 +131,21 @@ class FamaScoreQuery:
         WHERE m.trade_date = :trade_date
         """
         
-        fama_df = pd.read_sql(text(fama_sql), self.engine, params={"trade_date": trade_date})
-        claude_df = pd.read_sql(text(claude_sql), self.engine, params={"trade_date": trade_date})
+        fama_df = self._scores(trade_date)[['ts_code', 'name', 'total_score']].rename(
+            columns={'total_score': 'fama_score'}
+        )
+        claude_df = read_sql(self.engine, claude_sql, {"trade_date": trade_date})
         
-        merged = fama_df.merge(claude_df, on='ts_code', how='outer')
+        merged = fama_df.merge(claude_df, on='ts_code', how='outer', validate='one_to_one')
         merged['score_diff'] = merged['fama_score'] - merged['claude_score']
         merged = merged.sort_values('fama_score', ascending=False).head(top_n)
-        merged['fama_rank'] = range(1, len(merged) + 1)
         
-        # 计算claude排名
-        claude_sorted = merged.sort_values('claude_score', ascending=False).reset_index(drop=True)
-        claude_sorted['claude_rank'] = range(1, len(claude_sorted) + 1)
-        merged = merged.merge(claude_sorted[['ts_code', 'claude_rank']], on='ts_code')
+        # 排名直接由 rank() 给出, 并列按当前顺序, 空值排最后
+        for col in ('fama', 'claude'):
+            merged[f'{col}_rank'] = (
+                merged[f'{col}_score']
+                .rank(method='first', ascending=False, na_option='bottom')
+                .astype('int32')
+            )
         
-        return merged
+        return merged.reset_index(drop=True)
@@ -1,6 +1,50 @@
 import pandas as pd
 import numpy as np
 
+# 各维度使用的 (数据表, 字段, ascending)
+FACTOR_SPECS = {
+    'value': [('basic', 'pe_ttm', False), ('basic', 'pb', False), ('basic', 'dv_ttm', True)],
+    'quality': [('fina', 'roe', True), ('fina', 'grossprofit_margin', True), ('fina', 'debt_to_assets', False)],
+    'momentum': [('factor', 'pct_change', True), ('factor', 'rsi_12', True), ('factor', 'macd', True)],
+    'sentiment': [('flow', 'net_mf_amount', True), ('margin', 'rzye', True)],
+}
+
+
+def _rank_matrix(values, ascending):
+    """
+    按列计算排名百分位分数 (0-100), 等价于逐列 rank(method='min', pct=True) * 100
+    values: (n_stocks, n_factors) 矩阵, NaN 保持为 NaN
+    ascending: 每列一个布尔值, 含义同 normalize_rank
+    全为空的列给中位数分 50
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    n = values.shape[0]
+    # ascending=False 的列取负, 统一按"越大越好"排名
+    keyed = np.where(np.asarray(ascending, dtype=bool), values, -values)
+
+    # 所有列一次排序, NaN 排在末尾
+    order = np.argsort(keyed, axis=0, kind='stable')
+    sorted_vals = np.take_along_axis(keyed, order, axis=0)
+    # 并列值取最小名次: 每段相同值的起始位置沿列向下传播
+    new_run = np.ones_like(sorted_vals, dtype=bool)
+    new_run[1:] = sorted_vals[1:] != sorted_vals[:-1]
+    run_start = np.maximum.accumulate(
+        np.where(new_run, np.arange(n)[:, None], 0), axis=0
+    )
+
+    ranks = np.empty_like(keyed)
+    np.put_along_axis(ranks, order, run_start + 1.0, axis=0)
+
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scores = np.where(valid, ranks / counts * 100, np.nan)
+    scores[:, counts == 0] = 50.0
+    return scores
+
+
 class StockScorer:
     def __init__(self, weights=None):
         # 默认维度权重
@@ -18,100 +62,96 @@ class StockScorer:
         ascending=True: 数值越大，排名越靠前，分数越高 (如ROE)
         ascending=False: 数值越小，排名越靠前，分数越高 (如PE)
         """
-        if series.isnull().all():
-            return series.fillna(50) # 全为空则给中位数分
-        
-        ranks = series.rank(ascending=ascending, method='min', pct=True)
-        return ranks * 100
+        scores = _rank_matrix(series.to_numpy(dtype=np.float64), [ascending])[:, 0]
+        return pd.Series(scores, index=series.index, name=series.name)
+
+    def _dimension_score(self, dim, frames):
+        """维度内各指标一次排名后等权平均"""
+        specs = FACTOR_SPECS[dim]
+        values = np.column_stack([frames[table][col].to_numpy(dtype=np.float64) for table, col, _ in specs])
+        scores = _rank_matrix(values, [asc for _, _, asc in specs])
+        return pd.Series(scores.mean(axis=1), index=frames[specs[0][0]].index)
 
     def calculate_value_score(self, df_basic):
         """
         计算价值维度得分
         输入: ods_daily_basic 的 DataFrame
+        PE_TTM、PB 越低越好, 股息率越高越好, 维度内部等权
         """
-        # PE_TTM 越低越好
-        pe_score = self.normalize_rank(df_basic['pe_ttm'], ascending=False)
-        # PB 越低越好
-        pb_score = self.normalize_rank(df_basic['pb'], ascending=False)
-        # 股息率 越高越好
-        dv_score = self.normalize_rank(df_basic['dv_ttm'], ascending=True)
-        
-        # 价值维度内部等权
-        return (pe_score + pb_score + dv_score) / 3
+        return self._dimension_score('value', {'basic': df_basic})
 
     def calculate_quality_score(self, df_fina):
         """
         计算质量维度得分
         输入: ods_fina_indicator 的 DataFrame
+        ROE、毛利率越高越好, 资产负债率越低越好
         """
-        # ROE 越高越好
-        roe_score = self.normalize_rank(df_fina['roe'], ascending=True)
-        # 毛利率 越高越好
-        gp_score = self.normalize_rank(df_fina['grossprofit_margin'], ascending=True)
-        # 资产负债率 越低越好
-        debt_score = self.normalize_rank(df_fina['debt_to_assets'], ascending=False)
-        
-        return (roe_score + gp_score + debt_score) / 3
+        return self._dimension_score('quality', {'fina': df_fina})
 
     def calculate_momentum_score(self, df_factor):
         """
         计算动量维度得分
         输入: ods_stk_factor 的 DataFrame
+        涨跌幅、RSI (简化处理，实际可能需要判断超买)、MACD 越高越好
         """
-        # 涨跌幅 越高越好
-        chg_score = self.normalize_rank(df_factor['pct_change'], ascending=True)
-        # RSI 越高越好 (简化处理，实际可能需要判断超买)
-        rsi_score = self.normalize_rank(df_factor['rsi_12'], ascending=True)
-        # MACD 越高越好
-        macd_score = self.normalize_rank(df_factor['macd'], ascending=True)
-        
-        return (chg_score + rsi_score + macd_score) / 3
+        return self._dimension_score('momentum', {'factor': df_factor})
 
     def calculate_sentiment_score(self, df_flow, df_margin):
         """
         计算情绪维度得分
         输入: ods_moneyflow 和 ods_margin_detail 的 DataFrame
+        资金净流入额、融资余额 (简化处理，实际应看变化率) 越高越好
         """
-        # 资金净流入额 越高越好
-        flow_score = self.normalize_rank(df_flow['net_mf_amount'], ascending=True)
-        # 融资余额 (简化处理，实际应看变化率)
-        margin_score = self.normalize_rank(df_margin['rzye'], ascending=True)
-        
-        return (flow_score + margin_score) / 2
-
-    def score_stocks(self, data_dict):
+        return self._dimension_score('sentiment', {'flow': df_flow, 'margin': df_margin})
+
+    def score_stocks(self, data_dict, top_n=None):
         """
         综合打分主函数
         data_dict: 包含各表 DataFrame 的字典
+        top_n: 只返回总分最高的 top_n 只股票, None 返回全部
+
+        全部指标拼成 (n_stocks, n_factors) 矩阵一次排名, 按列块求各维度分
+        (维度内等权), 再与维度权重向量做矩阵乘法得到加权总分
         """
-        # 假设所有 DataFrame 都以 ts_code 为索引或包含 ts_code 列
-        # 这里简化处理，假设数据已经按 ts_code 对齐
-        
-        v_score = self.calculate_value_score(data_dict['basic'])
-        q_score = self.calculate_quality_score(data_dict['fina'])
-        m_score = self.calculate_momentum_score(data_dict['factor'])
-        s_score = self.calculate_sentiment_score(data_dict['flow'], data_dict['margin'])
-        
-        # 汇总综合得分
+        # 假设所有 DataFrame 都已按 ts_code 对齐 (同一顺序)
+        dims = list(FACTOR_SPECS)
+        specs = [spec for dim in dims for spec in FACTOR_SPECS[dim]]
+        values = np.column_stack([data_dict[table][col].to_numpy(dtype=np.float64) for table, col, _ in specs])
+        scores = _rank_matrix(values, [asc for _, _, asc in specs])
+
+        # 维度内等权平均: 各维度指标在矩阵中是连续的列块
+        # (不用 0/1 归属矩阵相乘, 否则其它维度的 NaN 会经 NaN*0 污染本维度)
+        dim_scores = np.empty((scores.shape[0], len(dims)))
+        start = 0
+        for j, dim in enumerate(dims):
+            stop = start + len(FACTOR_SPECS[dim])
+            dim_scores[:, j] = scores[:, start:stop].mean(axis=1)
+            start = stop
+
+        value, quality, momentum, sentiment = (dim_scores[:, dims.index(d)] for d in ('value', 'quality', 'momentum', 'sentiment'))
+        # 暂时假设成长维度与质量维度共用部分数据或简化
+        growth = quality # 示例简化
+
+        # (N, 5) 维度分矩阵与权重向量一次矩阵乘法得到总分
+        weight_keys = ('value', 'growth', 'quality', 'momentum', 'sentiment')
+        weight_vec = np.array([self.weights[k] for k in weight_keys])
+        total = np.column_stack([value, growth, quality, momentum, sentiment]) @ weight_vec
+
         final_df = pd.DataFrame({
-            'ts_code': data_dict['basic']['ts_code'],
-            'value_score': v_score,
-            'quality_score': q_score,
-            'momentum_score': m_score,
-            'sentiment_score': s_score
+            'ts_code': data_dict['basic']['ts_code'].to_numpy(),
+            'value_score': value,
+            'quality_score': quality,
+            'momentum_score': momentum,
+            'sentiment_score': sentiment,
+            'growth_score': growth,
+            'total_score': total,
         })
-        
-        # 暂时假设成长维度与质量维度共用部分数据或简化
-        final_df['growth_score'] = q_score # 示例简化
-        
-        final_df['total_score'] = (
-            final_df['value_score'] * self.weights['value'] +
-            final_df['growth_score'] * self.weights['growth'] +
-            final_df['quality_score'] * self.weights['quality'] +
-            final_df['momentum_score'] * self.weights['momentum'] +
-            final_df['sentiment_score'] * self.weights['sentiment']
-        )
-        
+
+        if top_n is not None and top_n < len(final_df):
+            # 只需前 top_n 名: 先 argpartition 选出候选, 再对小集合排序
+            keyed = np.where(np.isnan(total), -np.inf, total)
+            final_df = final_df.iloc[np.argpartition(-keyed, top_n - 1)[:top_n]]
+
         return final_df.sort_values(by='total_score', ascending=False)
 
 # 示例用法
@@ -10,14 +10,23 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
 
 import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; moving averages fall back to pandas rolling
+    njit = None
+
+from ..sql_io import cached_engine, read_sql
 
 logger = logging.getLogger(__name__)
 
+# signal 列的类别, 下标即 int8 编码
+SIGNAL_CATEGORIES = ["hold", "exit", "reduce", "buy_pullback", "buy_golden"]
+
 
 @dataclass
 class SignalConfig:
@@ -29,22 +38,103 @@ class SignalConfig:
 
 
 def get_engine(host="localhost", port=3306, user="root", password="", database="tushare_stock"):
-    """创建数据库连接"""
+    """创建数据库连接 (同一连接参数复用同一连接池)"""
     connection_string = (
         f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}?charset=utf8mb4"
     )
-    return create_engine(connection_string, echo=False)
-
-
-def _cross_up(series_a: pd.Series, series_b: pd.Series) -> pd.Series:
-    return (series_a > series_b) & (series_a.shift(1) <= series_b.shift(1))
+    return cached_engine(connection_string)
 
 
-def _cross_down(series_a: pd.Series, series_b: pd.Series) -> pd.Series:
-    return (series_a < series_b) & (series_a.shift(1) >= series_b.shift(1))
+def _rolling_mean_kernel(values: np.ndarray, window: int, out: np.ndarray) -> None:
+    """单次遍历的滚动均值, 与 pandas rolling(window, min_periods=window).mean() 逐位一致
 
-
-def compute_520_signals(df: pd.DataFrame, config: Optional[SignalConfig] = None) -> pd.DataFrame:
+    沿用 pandas 的算法: Kahan 补偿的增量求和, 窗口内数值全相同时直接取该值,
+    窗口内含 NaN 时输出 NaN。
+    """
+    nobs = 0
+    sum_x = 0.0
+    neg_ct = 0
+    comp_add = 0.0
+    comp_remove = 0.0
+    same_ct = 0
+    prev_value = values[0] if values.shape[0] > 0 else np.nan
+    for i in range(values.shape[0]):
+        if i >= window:
+            old = values[i - window]
+            if not np.isnan(old):
+                nobs -= 1
+                y = -old - comp_remove
+                t = sum_x + y
+                comp_remove = t - sum_x - y
+                sum_x = t
+                if old < 0:
+                    neg_ct -= 1
+
+        val = values[i]
+        if not np.isnan(val):
+            nobs += 1
+            y = val - comp_add
+            t = sum_x + y
+            comp_add = t - sum_x - y
+            sum_x = t
+            if val < 0:
+                neg_ct += 1
+            if val == prev_value:
+                same_ct += 1
+            else:
+                same_ct = 1
+            prev_value = val
+
+        if nobs >= window:
+            result = sum_x / nobs
+            if same_ct >= nobs:
+                result = prev_value
+            elif neg_ct == 0 and result < 0:
+                result = 0.0
+            elif neg_ct == nobs and result > 0:
+                result = 0.0
+            out[i] = result
+        else:
+            out[i] = np.nan
+
+
+_rolling_mean_fused = njit(cache=True)(_rolling_mean_kernel) if njit is not None else None
+
+
+def rolling_mean(values, window: int) -> np.ndarray:
+    """滚动均值 (满窗口才出值), 有 numba 时走编译内核, 否则用 pandas rolling"""
+    arr = np.ascontiguousarray(values, dtype=np.float64)
+    if _rolling_mean_fused is not None:
+        out = np.empty(arr.shape[0])
+        _rolling_mean_fused(arr, window, out)
+        return out
+    return pd.Series(arr).rolling(window=window, min_periods=window).mean().to_numpy()
+
+
+def _rises(values: np.ndarray) -> np.ndarray:
+    """values[i] > values[i-1], 首行为 False (同 series > series.shift(1))"""
+    out = np.zeros(values.shape[0], dtype=bool)
+    np.greater(values[1:], values[:-1], out=out[1:])
+    return out
+
+
+def _cross_up(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """a 上穿 b: 今日 a > b 且昨日 a <= b, 首行为 False"""
+    out = np.zeros(a.shape[0], dtype=bool)
+    out[1:] = (a[1:] > b[1:]) & (a[:-1] <= b[:-1])
+    return out
+
+
+def _cross_down(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """a 下穿 b: 今日 a < b 且昨日 a >= b, 首行为 False"""
+    out = np.zeros(a.shape[0], dtype=bool)
+    out[1:] = (a[1:] < b[1:]) & (a[:-1] >= b[:-1])
+    return out
+
+
+def compute_520_signals(
+    df: pd.DataFrame, config: Optional[SignalConfig] = None, *, copy: bool = True
+) -> pd.DataFrame:
     """
     计算 520 战法信号。
 
@@ -53,57 +143,64 @@ def compute_520_signals(df: pd.DataFrame, config: Optional[SignalConfig] = None)
     - trade_date (用于排序)
     可选列：
     - vol (用于量能确认)
+
+    copy=False 时信号列直接写入传入的 df (若需按 trade_date 排序, 则写入排序后的新表)。
     """
     if config is None:
         config = SignalConfig()
 
-    df = df.copy()
     if "trade_date" in df.columns:
         df = df.sort_values("trade_date")
 
-    close = df[config.close_col]
-    df["ma5"] = close.rolling(window=5, min_periods=5).mean()
-    df["ma20"] = close.rolling(window=20, min_periods=20).mean()
-
-    df["ma20_up"] = df["ma20"] > df["ma20"].shift(1)
+    # 全部在 ndarray 上计算, 最后一次性生成结果
+    close = df[config.close_col].to_numpy(dtype=np.float64)
+    ma5 = rolling_mean(close, 5)
+    ma20 = rolling_mean(close, 20)
+    ma20_up = _rises(ma20)
 
+    columns = {"ma5": ma5, "ma20": ma20, "ma20_up": ma20_up}
     if config.volume_col and config.volume_col in df.columns:
-        df["vol_ma"] = df[config.volume_col].rolling(
-            window=config.volume_window, min_periods=config.volume_window
-        ).mean()
-        df["volume_confirm"] = df[config.volume_col] > df["vol_ma"]
+        vol = df[config.volume_col].to_numpy(dtype=np.float64)
+        vol_ma = rolling_mean(vol, config.volume_window)
+        volume_confirm = vol > vol_ma
+        columns["vol_ma"] = vol_ma
     else:
-        df["volume_confirm"] = True
-
-    golden_cross = _cross_up(df["ma5"], df["ma20"])
-    dead_cross = _cross_down(df["ma5"], df["ma20"])
+        volume_confirm = np.ones(close.shape[0], dtype=bool)
+    columns["volume_confirm"] = volume_confirm
 
-    ma5_turn_up = df["ma5"] > df["ma5"].shift(1)
-    pullback_range = close >= df["ma20"]
-    pullback_near = close <= df["ma20"] * (1 + config.pullback_tolerance)
-    pullback_buy = pullback_range & pullback_near & ma5_turn_up
+    golden_cross = _cross_up(ma5, ma20)
+    dead_cross = _cross_down(ma5, ma20)
 
-    reduce_position = close < df["ma5"]
-
-    df["signal_buy_golden"] = golden_cross & df["ma20_up"]
-    if config.require_volume_confirm:
-        df["signal_buy_golden"] &= df["volume_confirm"]
-
-    df["signal_buy_pullback"] = pullback_buy & df["ma20_up"]
-    df["signal_reduce"] = reduce_position
-    df["signal_exit"] = dead_cross
-
-    df["signal"] = np.select(
-        [
-            df["signal_exit"],
-            df["signal_reduce"],
-            df["signal_buy_pullback"],
-            df["signal_buy_golden"],
-        ],
-        ["exit", "reduce", "buy_pullback", "buy_golden"],
-        default="hold",
+    pullback_buy = (
+        (close >= ma20)
+        & (close <= ma20 * (1 + config.pullback_tolerance))
+        & _rises(ma5)
     )
 
+    buy_golden = golden_cross & ma20_up
+    if config.require_volume_confirm:
+        buy_golden &= volume_confirm
+    buy_pullback = pullback_buy & ma20_up
+    reduce_position = close < ma5
+
+    columns["signal_buy_golden"] = buy_golden
+    columns["signal_buy_pullback"] = buy_pullback
+    columns["signal_reduce"] = reduce_position
+    columns["signal_exit"] = dead_cross
+    # 按优先级从低到高覆盖写入 int8 编码: exit > reduce > buy_pullback > buy_golden > hold
+    codes = np.zeros(close.shape[0], dtype=np.int8)
+    codes[buy_golden] = 4
+    codes[buy_pullback] = 3
+    codes[reduce_position] = 2
+    codes[dead_cross] = 1
+    columns["signal"] = pd.Categorical.from_codes(codes, categories=SIGNAL_CATEGORIES)
+
+    if copy:
+        # 新列一次性构造成一个 DataFrame 再横向拼接, 避免逐列插入反复整理 block
+        signals = pd.DataFrame(columns, index=df.index)
+        return pd.concat([df.drop(columns=df.columns.intersection(signals.columns)), signals], axis=1)
+    for name, values in columns.items():
+        df[name] = values
     return df
 
 
@@ -137,11 +234,54 @@ class Mistery520Strategy:
           AND trade_date BETWEEN :start_date AND :end_date
         ORDER BY trade_date
         """
-        return pd.read_sql(
-            text(sql),
+        return read_sql(
             self.engine,
-            params={"ts_code": ts_code, "start_date": start_date, "end_date": end_date},
+            sql,
+            {"ts_code": ts_code, "start_date": start_date, "end_date": end_date},
+        )
+
+    def load_daily_data_batch(
+        self,
+        ts_codes: Sequence[str],
+        start_date: int,
+        end_date: int,
+        table: str = "ods_daily",
+        close_col: str = "close",
+        volume_col: Optional[str] = "vol",
+    ) -> pd.DataFrame:
+        """一次 IN 查询加载多只股票的日线, 按 ts_code, trade_date 排序"""
+        if self.engine is None:
+            raise ValueError("请先传入数据库引擎")
+        if not ts_codes:
+            return pd.DataFrame()
+
+        columns = ["trade_date", "ts_code", close_col]
+        if volume_col:
+            columns.append(volume_col)
+        column_sql = ", ".join(columns)
+        sql = f"""
+        SELECT {column_sql}
+        FROM {table}
+        WHERE ts_code IN :ts_codes
+          AND trade_date BETWEEN :start_date AND :end_date
+        ORDER BY ts_code, trade_date
+        """
+        return read_sql(
+            self.engine,
+            sql,
+            {"ts_codes": tuple(ts_codes), "start_date": start_date, "end_date": end_date},
         )
 
     def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         return compute_520_signals(df, config=self.config)
+
+    def generate_signals_batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        """对 load_daily_data_batch 的结果逐股票计算信号, 最后一次性 concat"""
+        if df.empty:
+            return df
+        return pd.concat(
+            [
+                compute_520_signals(group, config=self.config, copy=False)
+                for _, group in df.groupby("ts_code", sort=False)
+            ],
+        )
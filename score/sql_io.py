@@ -0,0 +1,81 @@
+"""Shared SQL -> DataFrame reader for the score query modules."""
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Optional, Union
+
+import pandas as pd
+from sqlalchemy import bindparam, create_engine, text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.elements import TextClause
+
+try:
+    import connectorx as cx
+except ImportError:  # connectorx is optional; fall back to pandas + SQLAlchemy
+    cx = None
+
+logger = logging.getLogger(__name__)
+
+# Named paramstyle so literal rendering does not double '%' signs
+_MYSQL_DIALECT = mysql.dialect(paramstyle="named")
+
+# A query given as SQL text, or a text() clause built once and reused
+SQL = Union[str, TextClause]
+
+
+@lru_cache(maxsize=8)
+def cached_engine(url: str) -> Engine:
+    """Return one pooled engine per URL, shared by every get_engine() caller.
+
+    pool_pre_ping drops connections the server closed while idle;
+    pool_recycle keeps them below MySQL's wait_timeout.
+    """
+    return create_engine(
+        url,
+        echo=False,
+        pool_size=8,
+        max_overflow=4,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+    )
+
+
+def bind_sql(sql: SQL, params: Optional[Dict[str, Any]] = None) -> TextClause:
+    """Build a text() query with params bound; list/tuple values expand for IN :name."""
+    stmt = sql if isinstance(sql, TextClause) else text(sql)
+    if params:
+        stmt = stmt.bindparams(*(
+            bindparam(name, value=value, expanding=isinstance(value, (list, tuple)))
+            for name, value in params.items()
+        ))
+    return stmt
+
+
+def render_sql(sql: SQL, params: Optional[Dict[str, Any]] = None) -> str:
+    """Render a text() query with its parameters inlined as MySQL literals."""
+    stmt = bind_sql(sql, params)
+    return str(stmt.compile(dialect=_MYSQL_DIALECT, compile_kwargs={"literal_binds": True}))
+
+
+def read_sql(engine: Engine, sql: SQL, params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """Run a query and return a DataFrame.
+
+    When connectorx is installed and the engine is MySQL, the result is
+    transferred as Arrow batches and converted to pandas column-wise, instead
+    of building Python objects row by row through the DB-API cursor.
+    Otherwise (or if connectorx fails) this is pd.read_sql on the bound text().
+
+    Args:
+        engine: SQLAlchemy engine
+        sql: query with :name placeholders, as a string or a prebuilt text()
+        params: bind parameters; a list/tuple value expands for ``IN :name``
+    """
+    if cx is not None and engine.dialect.name == "mysql":
+        uri = engine.url.set(drivername="mysql", query={}).render_as_string(hide_password=False)
+        try:
+            return cx.read_sql(uri, render_sql(sql, params), return_type="pandas")
+        except Exception as exc:  # e.g. unsupported auth plugin; keep the query working
+            logger.warning(f"connectorx read failed, falling back to pandas: {exc}")
+    return pd.read_sql(bind_sql(sql, params), engine)
@@ -4,13 +4,30 @@
 基于趋势突破因子权重在SQL侧计算单日评分。
 """
 
-from typing import Dict, List
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
 
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
+from ..sql_io import cached_engine, read_sql
 
-SCORE_SQL = """
+
+# price_window 只回看这么多自然日: 20 日窗口 + LAG(ma20, 5) 共需 25 个交易日,
+# 60 个自然日在春节等长假期间也留有余量
+PRICE_LOOKBACK_DAYS = 60
+
+
+def _pct_rank(order_by: str) -> str:
+    """PERCENT_RANK() 的等价写法: (RANK() - 1) / (截面行数 - 1), 单行截面为 0.
+
+    RANK() 只需对本列排序一次, 截面行数由 factors 中的 n_peers 统一计算,
+    不必像 PERCENT_RANK 那样为每列单独缓存整个分区。1E0 保证按 DOUBLE 计算。
+    """
+    return f"COALESCE((RANK() OVER (ORDER BY {order_by}) - 1) * 1E0 / NULLIF(n_peers, 0), 0)"
+
+
+SCORE_SQL = f"""
 WITH price_window AS (
     SELECT
         d.trade_date,
@@ -64,7 +81,7 @@ WITH price_window AS (
     FROM dwd_daily d
     LEFT JOIN dws_price_adj_daily p
         ON p.trade_date = d.trade_date AND p.ts_code = d.ts_code
-    WHERE d.trade_date <= :trade_date
+    WHERE d.trade_date BETWEEN :start_date AND :trade_date
 ),
 price_enriched AS (
     SELECT
@@ -127,7 +144,8 @@ factors AS (
              ELSE (close / ma20) - 1 END AS bias,
         turnover_rate,
         chip_concentration,
-        cost_deviation
+        cost_deviation,
+        COUNT(*) OVER () - 1 AS n_peers
     FROM factor_base
 ),
 scored AS (
@@ -145,17 +163,17 @@ scored AS (
         ma20,
         chip_concentration,
         cost_deviation,
-        (PERCENT_RANK() OVER (ORDER BY breakout_ratio)) * 100 AS s_breakout,
+        ({_pct_rank("breakout_ratio")}) * 100 AS s_breakout,
         (CASE
             WHEN close > ma20 AND ma10 > ma20 AND ma20_slope > 0 THEN 100
             WHEN close > ma20 AND ma10 > ma20 THEN 70
             WHEN close > ma20 THEN 40
             ELSE 0
         END) AS s_trend,
-        (PERCENT_RANK() OVER (ORDER BY vol_ratio)) * 100 AS s_volume,
-        (PERCENT_RANK() OVER (ORDER BY ret_20)) * 100 AS s_rs,
-        (PERCENT_RANK() OVER (ORDER BY amt_ma20)) * 100 AS s_liquidity,
-        (PERCENT_RANK() OVER (ORDER BY contraction_ratio DESC)) * 100 AS s_contraction,
+        ({_pct_rank("vol_ratio")}) * 100 AS s_volume,
+        ({_pct_rank("ret_20")}) * 100 AS s_rs,
+        ({_pct_rank("amt_ma20")}) * 100 AS s_liquidity,
+        ({_pct_rank("contraction_ratio DESC")}) * 100 AS s_contraction,
         (CASE WHEN ma5 > ma10 AND ma10 > ma20 THEN 100 ELSE 0 END) AS s_bull_align,
         (CASE
             WHEN bias IS NULL THEN 50
@@ -169,8 +187,8 @@ scored AS (
             ELSE GREATEST(0, 100 - LEAST(ABS(vol_ratio - 1.5) / 1.5 * 100, 100))
         END) AS s_vol_mild,
         (
-            COALESCE(PERCENT_RANK() OVER (ORDER BY chip_concentration), 0.5) * 60 +
-            (1 - COALESCE(PERCENT_RANK() OVER (ORDER BY cost_deviation), 0.5)) * 40
+            COALESCE({_pct_rank("chip_concentration")}, 0.5) * 60 +
+            (1 - COALESCE({_pct_rank("cost_deviation")}, 0.5)) * 40
         ) AS s_chip
     FROM factors
 )
@@ -202,6 +220,36 @@ FROM scored
 """
 
 
+# 完整查询在导入时构造一次, 各方法直接复用, 不再每次拼接并重新解析 SQL
+_SCORES_TEXT = text(f"""
+SELECT *
+FROM ({SCORE_SQL}) t
+ORDER BY total_score DESC
+""")
+
+# 百分位排名需要全市场窗口, 因此在外层排序截断; MySQL 对 ORDER BY ... LIMIT
+# 使用堆排序只保留前 top_n 行, 网络上也只传输这些行
+_TOP_TEXT = text(f"""
+SELECT *
+FROM ({SCORE_SQL}) t
+ORDER BY total_score DESC
+LIMIT :top_n
+""")
+
+# 代码过滤只能放在外层, 内层百分位排名需要全市场截面
+_BY_CODES_TEXT = text(f"""
+SELECT *
+FROM ({SCORE_SQL}) t
+WHERE t.ts_code IN :ts_codes
+""")
+
+
+def _score_params(trade_date: int, **extra: Any) -> Dict[str, Any]:
+    """SCORE_SQL 的绑定参数, start_date 为 trade_date 前推 PRICE_LOOKBACK_DAYS 天."""
+    start = datetime.strptime(str(trade_date), "%Y%m%d") - timedelta(days=PRICE_LOOKBACK_DAYS)
+    return {"trade_date": trade_date, "start_date": int(start.strftime("%Y%m%d")), **extra}
+
+
 class TrendBreakoutScoreQuery:
     """趋势突破评分查询器."""
 
@@ -210,42 +258,23 @@ class TrendBreakoutScoreQuery:
 
     def get_scores(self, trade_date: int) -> pd.DataFrame:
         """计算指定日期趋势突破评分."""
-        sql = f"""
-        SELECT *
-        FROM ({SCORE_SQL}) t
-        ORDER BY total_score DESC
-        """
-        return pd.read_sql(text(sql), self.engine, params={"trade_date": trade_date})
+        return read_sql(self.engine, _SCORES_TEXT, _score_params(trade_date))
 
     def get_top_stocks(self, trade_date: int, top_n: int = 50) -> pd.DataFrame:
         """获取评分最高的股票."""
-        df = self.get_scores(trade_date)
-        if df.empty:
-            return df
-        return df.head(top_n)
+        return read_sql(self.engine, _TOP_TEXT, _score_params(trade_date, top_n=int(top_n)))
 
     def get_stocks_by_codes(self, trade_date: int, ts_codes: List[str]) -> pd.DataFrame:
         """查询指定股票代码的评分."""
         if not ts_codes:
             return pd.DataFrame()
-
-        placeholders = ", ".join([f":code_{i}" for i in range(len(ts_codes))])
-        params: Dict[str, str] = {"trade_date": trade_date}
-        for i, code in enumerate(ts_codes):
-            params[f"code_{i}"] = code
-
-        sql = f"""
-        SELECT *
-        FROM ({SCORE_SQL}) t
-        WHERE t.ts_code IN ({placeholders})
-        """
-        return pd.read_sql(text(sql), self.engine, params=params)
+        return read_sql(self.engine, _BY_CODES_TEXT, _score_params(trade_date, ts_codes=tuple(ts_codes)))
 
 
 def get_engine(host="localhost", port=3306, user="root", password="", database="tushare_stock"):
-    """创建数据库连接."""
+    """创建数据库连接 (同一连接参数复用同一连接池)."""
     connection_string = (
         f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}"
         f"?charset=utf8mb4"
     )
-    return create_engine(connection_string, echo=False)
+    return cached_engine(connection_string)
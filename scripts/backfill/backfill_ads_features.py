@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import argparse
 import logging
-import os
 import sys
 from pathlib import Path
 
@@ -10,6 +9,8 @@ project_root = Path(__file__).resolve().parents[2]
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from scripts.sync.run_ads import main as run_ads_main
+
 def main():
     parser = argparse.ArgumentParser(description="Backfill ADS Features data.")
     parser.add_argument("--start-date", type=int, default=20251001, help="Start date (YYYYMMDD)")
@@ -17,22 +18,18 @@ def main():
     parser.add_argument("--config", default="config/etl.ini", help="Path to etl.ini")
     args = parser.parse_args()
 
-    # Construct the command to call run_ads.py
+    # Run run_ads.py in this interpreter instead of exec'ing a second one
     # ADS run is usually fast enough to just rerun for the range
     
-    script_path = project_root / "scripts" / "sync" / "run_ads.py"
-    
-    cmd = [
-        sys.executable,
-        str(script_path),
+    argv = [
         "--mode", "incremental", # incremental mode respects start/end dates
         "--start-date", str(args.start_date),
         "--end-date", str(args.end_date),
         "--config", args.config,
     ]
     
-    print(f"Executing: {' '.join(cmd)}")
-    os.execv(sys.executable, cmd)
+    print(f"Running run_ads.py {' '.join(argv)}")
+    run_ads_main(argv)
 
 if __name__ == "__main__":
     main()
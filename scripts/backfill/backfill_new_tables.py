@@ -3,19 +3,24 @@
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
 from pathlib import Path
+from typing import List, Sequence
 
 # Add project scripts directory to sys.path to allow importing 'etl' package
 scripts_dir = Path(__file__).resolve().parents[1]
 if str(scripts_dir) not in sys.path:
     sys.path.insert(0, str(scripts_dir))
 
-from etl.base.runtime import get_env_config, get_mysql_connection
+from etl.base.pool import get_pool
+from etl.base.runtime import get_env_config
 from etl.dwd.runner import (
-    load_dwd_stock_daily_standard,
-    load_dwd_fina_snapshot,
-    load_dwd_margin_sentiment,
-    load_dwd_chip_stability,
+    _create_tmp_base_adj,
+    load_dwd_stock_daily_standard_range,
+    load_dwd_fina_snapshot_range,
+    load_dwd_margin_sentiment_range,
+    load_dwd_chip_stability_range,
 )
 from etl.dws.runner import (
     _run_tech_pattern,
@@ -40,49 +45,90 @@ def parse_args():
     return parser.parse_args()
 
 
+def _month_chunks(trade_dates: Sequence[int]) -> List[List[int]]:
+    """Split sorted YYYYMMDD trade dates into calendar-month groups."""
+    return [list(dates) for _, dates in groupby(trade_dates, key=lambda d: d // 100)]
+
+
 def backfill_dwd(conn, start_date: int, end_date: int):
-    """Backfill new DWD tables by iterating through trade dates."""
+    """Backfill new DWD tables one month of trade dates per statement."""
+    # One cursor for the calendar lookup and the whole backfill; each month (~20 trade
+    # dates) is one transaction, so the redo log is flushed once per month and a
+    # failure rolls back only that month
     with conn.cursor() as cursor:
         cursor.execute(
             "SELECT DISTINCT cal_date FROM dim_trade_cal WHERE exchange='SSE' AND is_open=1 "
             "AND cal_date BETWEEN %s AND %s ORDER BY cal_date",
             (start_date, end_date),
         )
-        trade_dates = [row[0] for row in cursor.fetchall()]
-    
-    total = len(trade_dates)
-    logging.info(f"Backfilling DWD: {total} trade dates from {start_date} to {end_date}")
-    
-    for i, trade_date in enumerate(trade_dates):
-        if i % 50 == 0:
-            logging.info(f"DWD progress: {i}/{total} ({trade_date})")
-        with conn.cursor() as cursor:
+        trade_dates = tuple(row[0] for row in cursor.fetchall())
+
+        chunks = _month_chunks(trade_dates)
+        logging.info(
+            f"Backfilling DWD: {len(trade_dates)} trade dates in {len(chunks)} months "
+            f"from {start_date} to {end_date}"
+        )
+
+        # dwd_stock_daily_standard reads base adjustment factors from this temp table
+        _create_tmp_base_adj(cursor)
+        conn.commit()
+
+        for i, chunk in enumerate(chunks):
+            chunk_start, chunk_end = chunk[0], chunk[-1]
+            logging.info(f"DWD progress: {i}/{len(chunks)} ({chunk_start}-{chunk_end})")
             try:
-                load_dwd_stock_daily_standard(cursor, trade_date)
-                load_dwd_fina_snapshot(cursor, trade_date)
-                load_dwd_margin_sentiment(cursor, trade_date)
-                load_dwd_chip_stability(cursor, trade_date)
+                load_dwd_stock_daily_standard_range(cursor, chunk_start, chunk_end)
+                load_dwd_fina_snapshot_range(cursor, chunk_start, chunk_end)
+                load_dwd_margin_sentiment_range(cursor, chunk_start, chunk_end)
+                load_dwd_chip_stability_range(cursor, chunk_start, chunk_end)
                 conn.commit()
             except Exception as e:
-                logging.warning(f"DWD error at {trade_date}: {e}")
+                logging.warning(f"DWD error at {chunk_start}-{chunk_end}: {e}")
                 conn.rollback()
-    
+
     logging.info("DWD backfill completed")
 
 
-def backfill_dws(conn):
-    """Backfill new DWS tables (bulk insert)."""
-    logging.info("Backfilling DWS tables (bulk)...")
+# Each loader writes its own table from DWD sources, so they can run side by side
+DWS_LOADERS = (
+    ("dws_tech_pattern", _run_tech_pattern),
+    ("dws_capital_flow", _run_capital_flow),
+    ("dws_leverage_sentiment", _run_leverage_sentiment),
+    ("dws_chip_dynamics", _run_chip_dynamics),
+)
+
+
+def _run_dws_loader(conn, table: str, loader) -> None:
     with conn.cursor() as cursor:
-        _run_tech_pattern(cursor)
-        logging.info("  - dws_tech_pattern done")
-        _run_capital_flow(cursor)
-        logging.info("  - dws_capital_flow done")
-        _run_leverage_sentiment(cursor)
-        logging.info("  - dws_leverage_sentiment done")
-        _run_chip_dynamics(cursor)
-        logging.info("  - dws_chip_dynamics done")
-        conn.commit()
+        loader(cursor)
+    logging.info(f"  - {table} done")
+
+
+def backfill_dws(pool):
+    """Backfill new DWS tables (bulk insert), one pooled connection per table.
+
+    The loaders run concurrently; their transactions are committed only if
+    all of them succeed, otherwise all are rolled back.
+    """
+    logging.info("Backfilling DWS tables (bulk)...")
+    conns = [pool.connection() for _ in DWS_LOADERS]
+    try:
+        with ThreadPoolExecutor(max_workers=len(DWS_LOADERS)) as executor:
+            futures = [
+                executor.submit(_run_dws_loader, conn, table, loader)
+                for conn, (table, loader) in zip(conns, DWS_LOADERS)
+            ]
+            errors = [future.exception() for future in futures]
+        error = next((e for e in errors if e is not None), None)
+        if error is not None:
+            for conn in conns:
+                conn.rollback()
+            raise error
+        for conn in conns:
+            conn.commit()
+    finally:
+        for conn in conns:
+            conn.close()
     logging.info("DWS backfill completed")
 
 
@@ -117,12 +163,12 @@ def main():
         os.environ["ETL_CONFIG_PATH"] = str(config_path)
     print(f"Using config: {os.environ.get('ETL_CONFIG_PATH')}")
     
-    cfg = get_env_config()
-    with get_mysql_connection(cfg) as conn:
+    pool = get_pool(get_env_config())
+    with pool.connection() as conn:
         if args.layer in ("dwd", "all"):
             backfill_dwd(conn, args.start_date, args.end_date)
         if args.layer in ("dws", "all"):
-            backfill_dws(conn)
+            backfill_dws(pool)
         if args.layer in ("ads", "all"):
             backfill_ads(conn)
     
@@ -4,6 +4,7 @@ from __future__ import annotations
 import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project scripts directory to sys.path to allow importing 'etl' package
@@ -11,7 +12,8 @@ scripts_dir = Path(__file__).resolve().parents[1]
 if str(scripts_dir) not in sys.path:
     sys.path.insert(0, str(scripts_dir))
 
-from etl.base.runtime import get_env_config, get_mysql_connection, get_tushare_token
+from etl.base.pool import get_pool
+from etl.base.runtime import get_env_config, get_tushare_token
 from etl.ods import run_full
 
 
@@ -30,9 +32,24 @@ def parse_args() -> argparse.Namespace:
 
 
 def _needs_backfill(cursor, table: str) -> bool:
-    cursor.execute(f"SELECT MAX(trade_date), COUNT(*) FROM {table}")
-    max_date, total_rows = cursor.fetchone()
-    return not max_date or total_rows == 0
+    """True when table has no rows (MAX(trade_date) is NULL).
+
+    trade_date leads the primary key of every ODS table checked here, so
+    MAX() is a single index lookup; a COUNT(*) would scan the whole table.
+    """
+    cursor.execute(f"SELECT MAX(trade_date) FROM {table}")
+    max_date = cursor.fetchone()[0]
+    return not max_date
+
+
+def _table_needs_backfill(pool, table: str) -> bool:
+    """Run _needs_backfill on a connection of its own, so tables can be checked concurrently."""
+    conn = pool.connection()
+    try:
+        with conn.cursor() as cursor:
+            return _needs_backfill(cursor, table)
+    finally:
+        conn.close()
 
 
 def main() -> None:
@@ -69,16 +86,17 @@ def main() -> None:
     if not token:
         raise RuntimeError("missing TuShare token: use --token or TUSHARE_TOKEN")
 
-    cfg = get_env_config()
-    with get_mysql_connection(cfg) as conn:
+    pool = get_pool(get_env_config())
+    with pool.connection() as conn:
         with conn.cursor() as cursor:
-            cursor.execute("SELECT COUNT(*) FROM dim_trade_cal")
-            cal_count = cursor.fetchone()[0]
-            if cal_count == 0:
+            cursor.execute("SELECT 1 FROM dim_trade_cal LIMIT 1")
+            if cursor.fetchone() is None:
                 raise RuntimeError("dim_trade_cal is empty; load trade calendar before backfill.")
 
-            tables = ["ods_daily", "ods_daily_basic", "ods_adj_factor"]
-            empty_tables = [table for table in tables if _needs_backfill(cursor, table)]
+    tables = ["ods_daily", "ods_daily_basic", "ods_adj_factor"]
+    with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+        needs = dict(zip(tables, executor.map(lambda table: _table_needs_backfill(pool, table), tables)))
+    empty_tables = [table for table in tables if needs[table]]
 
     if not empty_tables:
         print("ODS tables already populated; no backfill needed.")
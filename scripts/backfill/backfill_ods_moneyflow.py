@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import argparse
 import logging
-import os
 import sys
 from pathlib import Path
 
@@ -11,6 +10,7 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from scripts.etl.base.runtime import get_env_config
+from scripts.sync.run_ods_features import main as run_ods_features_main
 
 def main():
     parser = argparse.ArgumentParser(description="Backfill ODS Moneyflow data.")
@@ -19,23 +19,19 @@ def main():
     parser.add_argument("--config", default="config/etl.ini", help="Path to etl.ini")
     args = parser.parse_args()
 
-    # Construct the command to call run_ods_features.py
+    # Run run_ods_features.py in this interpreter instead of exec'ing a second one
     # We use --apis moneyflow to target only moneyflow
     # We use --skip-existing (which is default true in run_ods_features.py, but we'll be explicit)
     
-    script_path = project_root / "scripts" / "sync" / "run_ods_features.py"
-    
-    cmd = [
-        sys.executable,
-        str(script_path),
+    argv = [
         "--apis", "moneyflow",
         "--start-date", str(args.start_date),
         "--end-date", str(args.end_date),
         "--config", args.config,
     ]
     
-    print(f"Executing: {' '.join(cmd)}")
-    os.execv(sys.executable, cmd)
+    print(f"Running run_ods_features.py {' '.join(argv)}")
+    run_ods_features_main(argv)
 
 if __name__ == "__main__":
     main()
@@ -1,84 +1,229 @@
 import argparse
+import importlib
+import os
 import subprocess
 import sys
-import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, NamedTuple
 
 # Calculate project root relative to this script's location (scripts/backfill/batch_runner.py)
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS_DIR = PROJECT_ROOT / "scripts"
+
+# Sync scripts whose main(argv) runs in the shared worker instead of a new interpreter
+IN_PROCESS_SCRIPTS = {
+    "run_ods.py": "sync.run_ods",
+    "run_ods_features.py": "sync.run_ods_features",
+    "run_dwd.py": "sync.run_dwd",
+    "run_dws.py": "sync.run_dws",
+    "run_ads.py": "sync.run_ads",
+}
+
+LAYERS = ("ods", "dwd", "dws", "ads")
+
+# run_ods_features.py's --stk-factor-rate-limit default; stk_factor has its own limiter
+STK_FACTOR_RATE_LIMIT = 200
+
+
+class Job(NamedTuple):
+    layer: str
+    year: int
+    description: str
+    cmd: List[str]
+
+
+def _preimport() -> None:
+    """Worker initializer: import the sync entry points (pandas, tushare, etl) once."""
+    os.chdir(PROJECT_ROOT)
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    for module_name in IN_PROCESS_SCRIPTS.values():
+        importlib.import_module(module_name)
+
+
+def _run_script(module_name: str, argv: List[str]) -> None:
+    """Run a sync script's main(argv) in the worker, like `python script.py argv...`."""
+    # Scripts export their --config/--host flags to os.environ; don't leak them into the next job
+    saved_env = dict(os.environ)
+    try:
+        importlib.import_module(module_name).main(argv)
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise RuntimeError(f"{module_name} exited with status {e.code}") from None
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
 
-def run_command(cmd: List[str], description: str) -> None:
+
+def _submit(cmd: List[str], executor: Executor) -> Future:
+    """Queue one job on the worker pool; scripts outside IN_PROCESS_SCRIPTS run via subprocess."""
+    module_name = IN_PROCESS_SCRIPTS.get(Path(cmd[1]).name) if len(cmd) > 1 else None
+    if module_name is not None:
+        return executor.submit(_run_script, module_name, cmd[2:])
+    # Resolve script path if it's the second element in the list
+    if len(cmd) > 1 and cmd[1].startswith("scripts/"):
+        cmd[1] = str(PROJECT_ROOT / cmd[1])
+    return executor.submit(subprocess.check_call, cmd, cwd=str(PROJECT_ROOT))
+
+
+def run_command(cmd: List[str], description: str, executor: Executor) -> None:
     print(f"Starting: {description}")
     print(f"Command: {' '.join(cmd)}")
     start_time = datetime.now()
     try:
-        # Resolve script path if it's the second element in the list
-        if len(cmd) > 1 and cmd[1].startswith("scripts/"):
-            cmd[1] = str(PROJECT_ROOT / cmd[1])
-        
-        subprocess.check_call(cmd, cwd=str(PROJECT_ROOT))
+        _submit(cmd, executor).result()
         duration = datetime.now() - start_time
         print(f"Completed: {description} in {duration}")
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print(f"Failed: {description} with error {e}")
         sys.exit(1)
 
-def main():
-    parser = argparse.ArgumentParser(description="Batch Backfill Runner")
-    parser.add_argument("--start-year", type=int, required=True, help="Start year (e.g., 2010)")
-    parser.add_argument("--end-year", type=int, required=True, help="End year (e.g., 2019)")
-    parser.add_argument("--layer", choices=["ods", "dwd", "dws", "ads", "all"], required=True)
-    parser.add_argument("--config", default="config/etl.ini")
-    parser.add_argument("--rate-limit", type=int, default=None, help="TuShare rate limit (requests per minute)")
-    args = parser.parse_args()
 
+def run_concurrently(jobs: List[Job], executor: Executor) -> None:
+    """Run independent jobs on the pool; on the first failure cancel the rest and exit 1."""
+    start_time = datetime.now()
+    futures = {}
+    for job in jobs:
+        print(f"Starting: {job.description}")
+        print(f"Command: {' '.join(job.cmd)}")
+        futures[_submit(job.cmd, executor)] = job
+    for future in as_completed(futures):
+        job = futures[future]
+        try:
+            future.result()
+        except Exception as e:
+            print(f"Failed: {job.description} with error {e}")
+            for pending in futures:
+                pending.cancel()
+            sys.exit(1)
+        print(f"Completed: {job.description} in {datetime.now() - start_time}")
+
+
+def _tushare_limit(config: str) -> int:
+    """rate_limit from the etl.ini the jobs load (--config, relative to the project root)."""
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    from etl.base.runtime import get_tushare_limit
+
+    config_path = Path(config).expanduser()
+    if not config_path.is_absolute():
+        config_path = PROJECT_ROOT / config_path
+    os.environ["ETL_CONFIG_PATH"] = str(config_path)
+    return get_tushare_limit()
+
+
+def build_jobs(args: argparse.Namespace) -> List[Job]:
+    """All (layer, year) jobs in the original year-major order.
+
+    With --parallel N each worker has its own TuShare limiters, so the general
+    budget (--rate-limit, else etl.ini) and the stk_factor one are split N ways
+    to keep the combined rpm.
+    """
+    rate_limit = args.rate_limit
+    stk_factor_args: List[str] = []
+    if args.parallel > 1:
+        rate_limit = max(1, (rate_limit or _tushare_limit(args.config)) // args.parallel)
+        stk_factor_args = ["--stk-factor-rate-limit", str(max(1, STK_FACTOR_RATE_LIMIT // args.parallel))]
+    rate_limit_args = ["--rate-limit", str(rate_limit)] if rate_limit else []
+    jobs: List[Job] = []
     for year in range(args.start_year, args.end_year + 1):
         start_date = f"{year}0101"
         end_date = f"{year}1231"
-        print(f"\n=== Processing Year {year} ({start_date}-{end_date}) ===")
-
-        rate_limit_args = ["--rate-limit", str(args.rate_limit)] if args.rate_limit else []
 
         # ODS Layer
         if args.layer in ["ods", "all"]:
             # Financial Indicators
-            run_command(
+            jobs.append(Job(
+                "ods", year, f"ODS Fina Indicator {year}",
                 [sys.executable, "scripts/sync/run_ods.py", "--fina-start", start_date, "--fina-end", end_date, "--config", args.config] + rate_limit_args,
-                f"ODS Fina Indicator {year}"
-            )
+            ))
             # Moneyflow & Margin (excluding margin_target due to low rate limit)
-            run_command(
+            jobs.append(Job(
+                "ods", year, f"ODS Moneyflow/Margin {year}",
                 [sys.executable, "scripts/sync/run_ods_features.py", "--apis", "moneyflow,margin_detail,margin", "--start-date", start_date, "--end-date", end_date, "--config", args.config, "--skip-existing"] + rate_limit_args,
-                f"ODS Moneyflow/Margin {year}"
-            )
+            ))
             # Stock Factor
-            run_command(
-                [sys.executable, "scripts/sync/run_ods_features.py", "--apis", "stk_factor", "--start-date", start_date, "--end-date", end_date, "--config", args.config, "--skip-existing"] + rate_limit_args,
-                f"ODS Stock Factor {year}"
-            )
+            jobs.append(Job(
+                "ods", year, f"ODS Stock Factor {year}",
+                [sys.executable, "scripts/sync/run_ods_features.py", "--apis", "stk_factor", "--start-date", start_date, "--end-date", end_date, "--config", args.config, "--skip-existing"] + rate_limit_args + stk_factor_args,
+            ))
 
         # DWD Layer
         if args.layer in ["dwd", "all"]:
-             run_command(
+            jobs.append(Job(
+                "dwd", year, f"DWD Sync {year}",
                 [sys.executable, "scripts/sync/run_dwd.py", "--mode", "incremental", "--start-date", start_date, "--end-date", end_date, "--config", args.config],
-                f"DWD Sync {year}"
-            )
+            ))
 
         # DWS Layer
         if args.layer in ["dws", "all"]:
-             run_command(
+            jobs.append(Job(
+                "dws", year, f"DWS Sync {year}",
                 [sys.executable, "scripts/sync/run_dws.py", "--mode", "incremental", "--start-date", start_date, "--end-date", end_date, "--config", args.config],
-                f"DWS Sync {year}"
-            )
+            ))
 
         # ADS Layer
         if args.layer in ["ads", "all"]:
-             run_command(
+            jobs.append(Job(
+                "ads", year, f"ADS Sync {year}",
                 [sys.executable, "scripts/sync/run_ads.py", "--mode", "incremental", "--start-date", start_date, "--end-date", end_date, "--config", args.config],
-                f"ADS Sync {year}"
-            )
+            ))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch Backfill Runner")
+    parser.add_argument("--start-year", type=int, required=True, help="Start year (e.g., 2010)")
+    parser.add_argument("--end-year", type=int, required=True, help="End year (e.g., 2019)")
+    parser.add_argument("--layer", choices=["ods", "dwd", "dws", "ads", "all"], required=True)
+    parser.add_argument("--config", default="config/etl.ini")
+    parser.add_argument("--rate-limit", type=int, default=None, help="TuShare rate limit (requests per minute)")
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="Years processed concurrently within each layer (default: 1, strictly sequential)",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=0,
+        help="Keep up to N MySQL connections open per worker and reuse them across jobs (default: 0, connect per job)",
+    )
+    args = parser.parse_args()
+    if args.parallel < 1:
+        parser.error("--parallel must be >= 1")
+    if args.pool_size < 0:
+        parser.error("--pool-size must be >= 0")
+    if args.pool_size:
+        # Inherited by the workers: get_mysql_connection() then checks out from
+        # a per-worker pool that outlives each job instead of reconnecting
+        os.environ["ETL_POOL_SIZE"] = str(args.pool_size)
+
+    jobs = build_jobs(args)
+
+    # Long-lived workers run every job: modules and their imports load once per worker,
+    # and a crash in a job cannot take the runner down with it
+    with ProcessPoolExecutor(max_workers=args.parallel, initializer=_preimport) as executor:
+        if args.parallel == 1:
+            current_year = None
+            for job in jobs:
+                if job.year != current_year:
+                    current_year = job.year
+                    print(f"\n=== Processing Year {job.year} ({job.year}0101-{job.year}1231) ===")
+                run_command(job.cmd, job.description, executor)
+            return
+
+        # Years touch disjoint date ranges, but each layer reads the one below it:
+        # run all years of a layer concurrently, then move to the next layer
+        for layer in LAYERS:
+            layer_jobs = [job for job in jobs if job.layer == layer]
+            if layer_jobs:
+                print(f"\n=== Processing {layer.upper()} for {args.start_year}-{args.end_year} ({args.parallel} workers) ===")
+                run_concurrently(layer_jobs, executor)
+
 
 if __name__ == "__main__":
     main()
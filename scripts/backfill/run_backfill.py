@@ -15,26 +15,33 @@
     python run_backfill.py --start-year 2021 --end-year 2021 --step ods_features
     ...
 
+    # ODS特征按年份并发回补 (最多3个年份同时跑, 限流按并发数均分)
+    python run_backfill.py --start-year 2020 --end-year 2024 --parallel 3
+
 步骤说明:
     1. ods_features: 回补 stk_factor, cyq_perf, moneyflow, margin 等
     2. dwd: 重建 DWD 层 (含 dwd_fina_snapshot)
     3. dws: 重建 DWS 评分表
+    三个步骤依次依赖 (ods_features -> dwd -> dws), 只有 ods_features 内部的年份可以并发。
 """
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
 import os
-import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 # 设置项目根目录
 PROJECT_ROOT = Path(__file__).parent.parent.parent  # 从 backfill/ 向上两级
 SCRIPTS_DIR = PROJECT_ROOT / "scripts"
 SYNC_DIR = SCRIPTS_DIR / "sync"
 PYTHON = PROJECT_ROOT / ".venv" / "bin" / "python"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
 
 logging.basicConfig(
     level=logging.INFO, 
@@ -63,49 +70,122 @@ def parse_args() -> argparse.Namespace:
         help="ODS特征API列表 (默认: margin,margin_detail,margin_target,moneyflow,cyq_perf,stk_factor)"
     )
     parser.add_argument("--cyq-rate-limit", type=int, default=150, help="筹码接口限流 (默认: 150/分钟)")
+    parser.add_argument("--stk-factor-rate-limit", type=int, default=200, help="stk_factor 接口限流 (默认: 200/分钟)")
+    parser.add_argument("--rate-limit", type=int, default=None, help="TuShare接口限流 (默认: etl.ini 中的 rate_limit)")
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="ODS特征按年份并发的进程数, 限流按并发数均分 (默认: 1, 整个区间一次跑完)",
+    )
     parser.add_argument("--dry-run", action="store_true", help="仅显示命令，不执行")
     return parser.parse_args()
 
 
-def run_command(cmd: list, dry_run: bool = False) -> bool:
-    """执行命令"""
+async def run_command(cmd: list, dry_run: bool = False, label: str = "") -> bool:
+    """执行命令, 子进程输出逐行转发到日志 (并发时以 label 区分)"""
+    prefix = f"[{label}] " if label else ""
     cmd_str = " ".join(str(c) for c in cmd)
-    logger.info(f"执行命令: {cmd_str}")
+    logger.info(f"{prefix}执行命令: {cmd_str}")
     
     if dry_run:
-        logger.info("[DRY RUN] 跳过执行")
+        logger.info(f"{prefix}[DRY RUN] 跳过执行")
         return True
     
     # 设置PYTHONPATH确保子模块可以正确导入
     env = os.environ.copy()
     env["PYTHONPATH"] = str(SCRIPTS_DIR)
+    # 输出接到管道后子进程默认块缓冲, 关掉以便实时看到进度
+    env["PYTHONUNBUFFERED"] = "1"
     
+    # 子进程输出逐行转发到日志 (带时间戳), 内存占用与输出量无关
+    proc = await asyncio.create_subprocess_exec(
+        *(str(c) for c in cmd),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        cwd=PROJECT_ROOT,
+        env=env,
+        limit=1 << 20,
+    )
     try:
-        result = subprocess.run(cmd, check=True, cwd=PROJECT_ROOT, env=env)
-        return result.returncode == 0
-    except subprocess.CalledProcessError as e:
-        logger.error(f"命令执行失败: {e}")
+        async for line in proc.stdout:
+            logger.info(f"{prefix}{line.decode(errors='replace').rstrip()}")
+        await proc.wait()
+    except BaseException:
+        # Ctrl-C 等中断时不留下孤儿进程
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+
+    if proc.returncode != 0:
+        logger.error(f"{prefix}命令执行失败: 退出码 {proc.returncode}")
         return False
+    return True
 
 
-def step_ods_features(start_date: int, end_date: int, apis: str, cyq_rate_limit: int, dry_run: bool) -> bool:
-    """步骤1: 回补ODS特征数据"""
+async def step_ods_features(
+    start_year: int,
+    end_year: int,
+    apis: str,
+    cyq_rate_limit: int,
+    stk_factor_rate_limit: int,
+    rate_limit: Optional[int],
+    parallel: int,
+    dry_run: bool,
+) -> bool:
+    """步骤1: 回补ODS特征数据
+
+    parallel > 1 时按年份拆成多个进程, 由 Semaphore 限制同时运行的数量;
+    TuShare 限流按 parallel 均分, 总请求速率不变。
+    """
     logger.info(f"\n{'='*60}")
-    logger.info(f"步骤1: 回补ODS特征数据 ({start_date} ~ {end_date})")
+    logger.info(f"步骤1: 回补ODS特征数据 ({start_year}0101 ~ {end_year}1231)")
     logger.info(f"APIs: {apis}")
     logger.info(f"{'='*60}")
     
-    cmd = [
-        PYTHON, SYNC_DIR / "run_ods_features.py",
-        "--start-date", str(start_date),
-        "--end-date", str(end_date),
-        "--apis", apis,
-        "--cyq-rate-limit", str(cyq_rate_limit),
-    ]
-    return run_command(cmd, dry_run)
+    def build_cmd(start_date: int, end_date: int, rate: Optional[int], cyq_rate: int, stk_factor_rate: int) -> list:
+        cmd = [
+            PYTHON, SYNC_DIR / "run_ods_features.py",
+            "--start-date", str(start_date),
+            "--end-date", str(end_date),
+            "--apis", apis,
+            "--cyq-rate-limit", str(cyq_rate),
+            "--stk-factor-rate-limit", str(stk_factor_rate),
+        ]
+        if rate:
+            cmd += ["--rate-limit", str(rate)]
+        return cmd
 
+    years = range(start_year, end_year + 1)
+    if parallel <= 1 or len(years) == 1:
+        cmd = build_cmd(int(f"{start_year}0101"), int(f"{end_year}1231"), rate_limit, cyq_rate_limit, stk_factor_rate_limit)
+        return await run_command(cmd, dry_run)
 
-def step_dwd(start_date: int, dry_run: bool) -> bool:
+    if rate_limit is None:
+        from etl.base.runtime import get_tushare_limit
+
+        rate_limit = get_tushare_limit()
+    worker_rate = max(1, rate_limit // parallel)
+    worker_cyq_rate = max(1, cyq_rate_limit // parallel)
+    worker_stk_factor_rate = max(1, stk_factor_rate_limit // parallel)
+    logger.info(
+        f"并发 {parallel} 个年份, 每个进程限流 {worker_rate}/分钟 "
+        f"(筹码 {worker_cyq_rate}/分钟, stk_factor {worker_stk_factor_rate}/分钟)"
+    )
+
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def run_year(year: int) -> bool:
+        async with semaphore:
+            cmd = build_cmd(int(f"{year}0101"), int(f"{year}1231"), worker_rate, worker_cyq_rate, worker_stk_factor_rate)
+            return await run_command(cmd, dry_run, label=str(year))
+
+    results = await asyncio.gather(*(run_year(year) for year in years))
+    return all(results)
+
+
+async def step_dwd(start_date: int, dry_run: bool) -> bool:
     """步骤2: 重建DWD层"""
     logger.info(f"\n{'='*60}")
     logger.info(f"步骤2: 重建DWD层 (从 {start_date} 开始)")
@@ -116,10 +196,10 @@ def step_dwd(start_date: int, dry_run: bool) -> bool:
         "--mode", "full",
         "--start-date", str(start_date),
     ]
-    return run_command(cmd, dry_run)
+    return await run_command(cmd, dry_run)
 
 
-def step_dws(start_date: int, dry_run: bool) -> bool:
+async def step_dws(start_date: int, dry_run: bool) -> bool:
     """步骤3: 重建DWS评分表"""
     logger.info(f"\n{'='*60}")
     logger.info(f"步骤3: 重建DWS评分表 (从 {start_date} 开始)")
@@ -131,7 +211,7 @@ def step_dws(start_date: int, dry_run: bool) -> bool:
         "--start-date", str(start_date),
         "--init-watermark",
     ]
-    return run_command(cmd, dry_run)
+    return await run_command(cmd, dry_run)
 
 
 def main() -> None:
@@ -140,8 +220,10 @@ def main() -> None:
     if args.end_year < args.start_year:
         raise SystemExit("错误: end-year 必须 >= start-year")
     
+    if args.parallel < 1:
+        raise SystemExit("错误: parallel 必须 >= 1")
+    
     start_date = int(f"{args.start_year}0101")
-    end_date = int(f"{args.end_year}1231")
     
     logger.info(f"\n{'#'*60}")
     logger.info(f"# 历史数据回补")
@@ -155,7 +237,8 @@ def main() -> None:
     steps_to_run = []
     if args.step in ("all", "ods_features"):
         steps_to_run.append(("ods_features", lambda: step_ods_features(
-            start_date, end_date, args.apis, args.cyq_rate_limit, args.dry_run
+            args.start_year, args.end_year, args.apis, args.cyq_rate_limit,
+            args.stk_factor_rate_limit, args.rate_limit, args.parallel, args.dry_run,
         )))
     if args.step in ("all", "dwd"):
         steps_to_run.append(("dwd", lambda: step_dwd(start_date, args.dry_run)))
@@ -167,7 +250,7 @@ def main() -> None:
     
     for step_name, step_func in steps_to_run:
         logger.info(f"\n开始执行: {step_name}")
-        results[step_name] = step_func()
+        results[step_name] = asyncio.run(step_func())
         if not results[step_name] and not args.dry_run:
             logger.error(f"步骤 {step_name} 失败，停止执行")
             break
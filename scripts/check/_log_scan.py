@@ -0,0 +1,237 @@
+"""Log and process scanning shared by the check_<HHMM>_task_status.py checkers.
+
+The cron log is memory-mapped and searched with find/rfind on bytes; only the
+handful of bytes around a hit are inspected, never the whole file as lines.
+scan_run() also keeps a small JSON state file per (log, date, schedule) in a
+private per-user directory, so repeated polls only scan what was appended
+since the last one.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import subprocess
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+SUCCESS_MARKER = b"SUCCESS: Completed in "
+FAILED_MARKER = b"Max retries reached. Task failed."
+
+# "ss,fff " following the "<date> HH:MM:" prefix of a run's first log line
+_START_TAIL_RE = re.compile(rb"\d{2},\d{1,9} ")
+_START_TAIL_LEN = 13  # 2 second digits + "," + up to 9 fraction digits + " "
+_TS_RE = re.compile(rb"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?:,\d{1,9})?\b")
+
+# Scan state lives under the user's home, not the shared temp dir: a state file there
+# could be pre-created by another user (fake markers) or symlinked to one of ours
+STATE_DIR = Path.home() / ".cache" / "ashare_datacenter" / "check_state"
+
+
+@contextmanager
+def map_log(path: Path) -> Iterator[bytes | mmap.mmap]:
+    """Map the log read-only for the duration of the with-block."""
+    with open(path, "rb") as f, (
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if os.fstat(f.fileno()).st_size
+        else nullcontext(b"")  # an empty file cannot be mapped
+    ) as log:
+        yield log
+
+
+def _count_newlines(log: bytes | mmap.mmap, begin: int, end: int) -> int:
+    """Newlines in log[begin:end], counted in 1 MiB slices."""
+    newlines = 0
+    for pos in range(begin, end, 1 << 20):
+        newlines += log[pos : min(pos + (1 << 20), end)].count(b"\n")
+    return newlines
+
+
+def find_run_start(log: bytes | mmap.mmap, target_date: str, hour: str, begin: int = 0) -> int | None:
+    """Byte offset of the first log line of the `hour` (e.g. "08:30") run on target_date.
+
+    Only lines starting at or after byte `begin` are considered.
+    """
+    # Literal prefix search first; the regex only confirms the seconds/millis tail
+    # on a fixed-size slice, so a runaway line costs O(1)
+    prefix = f"{target_date} {hour}:".encode()
+    pos = log.find(prefix, begin)
+    while pos != -1:
+        if pos == 0 or log[pos - 1 : pos] == b"\n":
+            tail_start = pos + len(prefix)
+            if _START_TAIL_RE.match(log[tail_start : tail_start + _START_TAIL_LEN]):
+                return pos
+        pos = log.find(prefix, pos + 1)
+    return None
+
+
+def _state_file(log_path: Path, target_date: str, hour: str) -> Path:
+    digest = hashlib.md5(str(log_path).encode()).hexdigest()[:12]
+    return STATE_DIR / f"check_{hour.replace(':', '')}_{target_date}_{digest}.cache.json"
+
+
+def _write_state(state_file: Path, state: dict) -> None:
+    """Write the state file with mode 0600, refusing to follow a symlink at its path."""
+    state_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_NOFOLLOW", 0)
+    fd = os.open(state_file, flags, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(json.dumps(state))
+
+
+def _load_state(state_file: Path, log: bytes | mmap.mmap, inode: int) -> dict | None:
+    """Previous scan of this log, or None if there is none or the log was rotated/truncated."""
+    try:
+        state = json.loads(state_file.read_text())
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(state, dict)
+        or state.get("inode") != inode
+        or state.get("size", 0) > len(log)
+        # copytruncate keeps the inode; a different first line means a new file
+        or state.get("head") != log[:64].hex()
+    ):
+        return None
+    return state
+
+
+def scan_run(
+    log: bytes | mmap.mmap, log_path: Path, target_date: str, hour: str
+) -> tuple[int | None, int | None, int | None, int | None]:
+    """Find the run start and the last success/failure marker after it.
+
+    Returns (start_offset, start_line, success_line, failed_line). Only the
+    bytes appended since the previous call for the same log/date/hour are
+    scanned; a rotated or truncated log starts over from byte 0.
+    """
+    state_file = _state_file(log_path, target_date, hour)
+    try:
+        inode = os.stat(log_path).st_ino
+    except OSError:
+        inode = None
+    state = _load_state(state_file, log, inode) or {}
+
+    scanned = state.get("size", 0)
+    newlines = state.get("newlines", 0)
+    start = state.get("start")
+    # [offset, line] of the last marker of each kind, or None
+    markers = {"success": state.get("success"), "failed": state.get("failed")}
+
+    if start is None:
+        # A start line may have been cut off at the previous end of file: re-check that tail
+        overlap = len(f"{target_date} {hour}:") + _START_TAIL_LEN
+        start_offset = find_run_start(log, target_date, hour, max(0, scanned - overlap))
+        if start_offset is not None:
+            start = [start_offset, None]
+            markers = {"success": None, "failed": None}
+
+    if start is not None:
+        for kind, marker in (("success", SUCCESS_MARKER), ("failed", FAILED_MARKER)):
+            # Markers found last time still stand unless a later one was appended
+            begin = start[0] if markers[kind] is None else max(start[0], scanned - len(marker) + 1)
+            offset = log.rfind(marker, begin)
+            if offset != -1:
+                markers[kind] = [offset, None]
+
+    # Line numbers for the new hits: one forward pass over the bytes not counted yet
+    pos, count = scanned, newlines
+    new_hits = [hit for hit in (start, *markers.values()) if hit is not None and hit[1] is None]
+    for hit in sorted(new_hits, key=lambda hit: hit[0]):
+        if hit[0] < scanned:  # in the overlap re-checked above: count back from the previous end
+            hit[1] = newlines - _count_newlines(log, hit[0], scanned) + 1
+            continue
+        count += _count_newlines(log, pos, hit[0])
+        pos = hit[0]
+        hit[1] = count + 1
+
+    size = len(log)
+    state = {
+        "inode": inode,
+        "size": size,
+        "head": log[:64].hex(),
+        "newlines": count + _count_newlines(log, pos, size),
+        "start": start,
+        **markers,
+    }
+    try:
+        _write_state(state_file, state)
+    except OSError:
+        pass  # caching is best-effort; the next call just rescans
+
+    if start is None:
+        return None, None, None, None
+    return (
+        start[0],
+        start[1],
+        markers["success"][1] if markers["success"] else None,
+        markers["failed"][1] if markers["failed"] else None,
+    )
+
+
+def log_completed(start_line: int | None, success_line: int | None, failed_line: int | None) -> bool:
+    """Whether the log alone shows the run completed (success marker after any failure marker)."""
+    return bool(start_line is not None and success_line and (not failed_line or success_line > failed_line))
+
+
+def extract_latest_timestamp(log: bytes | mmap.mmap, start_offset: int | None) -> datetime | None:
+    """Timestamp of the last timestamped line after start_offset."""
+    if start_offset is None:
+        return None
+
+    # Walk lines back from the end of the file; the first parseable timestamp is the latest
+    end = len(log)
+    while end > start_offset:
+        newline = log.rfind(b"\n", start_offset, end)
+        line = log[newline + 1 if newline != -1 else start_offset : end]
+        end = newline if newline != -1 else start_offset
+        # Cheap shape check ("YYYY-MM-DD hh...") so untimestamped lines skip the regex
+        if len(line) < 19 or line[4:5] != b"-" or line[10:11] != b" ":
+            continue
+        matched = _TS_RE.match(line[:64])
+        if not matched:
+            continue
+        # Fields sit at fixed offsets; building the datetime directly skips strptime's format parsing
+        ts = matched.group(1)
+        try:
+            return datetime(
+                int(ts[0:4]), int(ts[5:7]), int(ts[8:10]), int(ts[11:13]), int(ts[14:16]), int(ts[17:19])
+            )
+        except ValueError:
+            continue
+    return None
+
+
+def list_processes() -> list[str]:
+    """Return one "PID command line" string per running process.
+
+    On Linux this reads /proc/<pid>/cmdline directly instead of forking `ps -ef`;
+    elsewhere (e.g. macOS) it falls back to the `ps -ef` lines.
+    """
+    if os.path.isdir("/proc"):
+        processes: list[str] = []
+        with os.scandir("/proc") as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                        cmdline = f.read()
+                except OSError:  # exited meanwhile, or not ours to read
+                    continue
+                if cmdline:  # empty for kernel threads
+                    args = cmdline.rstrip(b"\0").replace(b"\0", b" ")
+                    processes.append(f"{entry.name} {args.decode('utf-8', errors='replace')}")
+        return processes
+
+    try:
+        proc = subprocess.run(["ps", "-ef"], capture_output=True, text=True, check=False)
+    except Exception:
+        return []
+    if proc.returncode != 0:
+        return []
+    return proc.stdout.splitlines()
@@ -7,9 +7,13 @@ import argparse
 import sys
 from pathlib import Path
 import re
-from collections import Counter, defaultdict
+import heapq
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from pymysql.cursors import SSCursor
 
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
@@ -29,68 +33,82 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def extract_error_code(err_msg: Optional[str]) -> str:
-    if not err_msg:
-        return "UNKNOWN"
-    m = ERROR_CODE_RE.search(err_msg)
-    return m.group(1) if m else "UNKNOWN"
-
-
-def extract_task_id(err_msg: Optional[str], fallback: str) -> str:
-    if err_msg:
-        m = TASK_ID_RE.search(err_msg)
-        if m:
-            return m.group(1)
-    return fallback
+@lru_cache(maxsize=4096)
+def _scan_err_msg(err_msg: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """一条错误信息只扫描一次：返回 (错误码, 任务ID, 模块)，未匹配为 None。
 
-
-def extract_module(api_name: str, err_msg: Optional[str]) -> str:
-    if err_msg:
-        m = MODULE_RE.search(err_msg)
-        if m:
-            return m.group(2)
-    return api_name.split("_")[0] if "_" in api_name else api_name
+    失败记录的 err_msg 大量重复（同一错误反复出现），按内容缓存可省去重复的正则扫描。
+    """
+    code = ERROR_CODE_RE.search(err_msg)
+    task = TASK_ID_RE.search(err_msg)
+    module = MODULE_RE.search(err_msg)
+    return (
+        code.group(1) if code else None,
+        task.group(1) if task else None,
+        module.group(2) if module else None,
+    )
 
 
 def main() -> int:
     args = parse_args()
     since = datetime.now() - timedelta(hours=args.hours)
 
+    by_task = Counter()
+    # (模块, 错误码) 联合计数；按错误码/按模块的统计在循环结束后由它边际求和得到
+    joint = Counter()
+    total = 0
+
     cfg = get_env_config()
     with get_mysql_session(cfg) as conn:
-        with conn.cursor() as cursor:
+        # SSCursor 边读边聚合，不先把整个结果集缓冲成元组列表
+        with conn.cursor(SSCursor) as cursor:
+            # 最近 limit 条失败记录按 (接口, 错误信息) 先在库内聚合，相同 err_msg 只回传一次；
+            # 按 MD5 分组避免 TEXT 比较受 max_sort_length 截断。run_ids 供无任务ID时回退使用
+            cursor.execute("SET SESSION group_concat_max_len = %s", (max(1024, args.limit * 21),))
             cursor.execute(
                 """
-                SELECT id, api_name, err_msg
-                FROM meta_etl_run_log
-                WHERE status='FAILED' AND start_at >= %s
-                ORDER BY id DESC
-                LIMIT %s
+                SELECT api_name, ANY_VALUE(err_msg) AS err_msg, COUNT(*) AS failures,
+                       GROUP_CONCAT(CAST(id AS CHAR) ORDER BY id DESC) AS run_ids
+                FROM (
+                    SELECT id, api_name, err_msg
+                    FROM meta_etl_run_log
+                    WHERE status='FAILED' AND start_at >= %s
+                    ORDER BY id DESC
+                    LIMIT %s
+                ) AS recent
+                GROUP BY api_name, MD5(err_msg)
+                ORDER BY MAX(id) DESC
                 """,
                 (since, args.limit),
             )
-            rows = cursor.fetchall()
-
-    if not rows:
+            for api_name, err_msg, failures, run_ids in cursor:
+                # 空 err_msg（如静默超时）直接走默认值，只判断一次
+                if err_msg:
+                    error_code, task_id, module = _scan_err_msg(err_msg)
+                    error_code = error_code or "UNKNOWN"
+                    module = module or api_name.split("_", 1)[0]
+                else:
+                    error_code, task_id, module = "UNKNOWN", None, api_name.split("_", 1)[0]
+                if task_id:
+                    by_task[task_id] += failures
+                else:
+                    for run_id in run_ids.split(","):
+                        by_task[run_id] += 1
+
+                total += failures
+                joint[module, error_code] += failures
+
+    if not total:
         print(f"[OK] 最近 {args.hours} 小时没有失败任务。")
         return 0
 
-    by_task = Counter()
     by_code = Counter()
     by_module = Counter()
-    matrix = defaultdict(Counter)
-
-    for run_id, api_name, err_msg in rows:
-        task_id = extract_task_id(err_msg, str(run_id))
-        error_code = extract_error_code(err_msg)
-        module = extract_module(api_name, err_msg)
-
-        by_task[task_id] += 1
-        by_code[error_code] += 1
-        by_module[module] += 1
-        matrix[module][error_code] += 1
+    for (module, code), count in joint.items():
+        by_module[module] += count
+        by_code[code] += count
 
-    print(f"\n=== 失败统计（最近 {args.hours}h，共 {len(rows)} 条）===")
+    print(f"\n=== 失败统计（最近 {args.hours}h，共 {total} 条）===")
 
     print("\n[按任务ID Top10]")
     for task_id, count in by_task.most_common(10):
@@ -105,11 +123,8 @@ def main() -> int:
         print(f"- module={module:>12}  failures={count}")
 
     print("\n[模块 x 错误码 Top20]")
-    pairs = []
-    for module, code_counter in matrix.items():
-        for code, count in code_counter.items():
-            pairs.append((count, module, code))
-    for count, module, code in sorted(pairs, reverse=True)[:20]:
+    top_pairs = heapq.nlargest(20, ((count, module, code) for (module, code), count in joint.items()))
+    for count, module, code in top_pairs:
         print(f"- module={module:>12} | error_code={code:>10} | failures={count}")
 
     return 0
@@ -7,7 +7,7 @@ import argparse
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-from statistics import quantiles
+from typing import Optional
 
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
@@ -25,12 +25,38 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def p95(values: list[float]) -> float:
-    if not values:
+# 一次聚合：计数用条件求和，P95 只取排序后相邻两位的耗时（线性插值所需），不把逐条运行记录拉到客户端
+SLO_SQL = """
+WITH runs AS (
+    SELECT status,
+           CASE WHEN status IN ('SUCCESS', 'FAILED')
+                THEN TIMESTAMPDIFF(SECOND, start_at, COALESCE(end_at, NOW())) END AS duration_sec
+    FROM meta_etl_run_log
+    WHERE start_at >= %s
+), ranked AS (
+    SELECT status, duration_sec,
+           ROW_NUMBER() OVER (PARTITION BY duration_sec IS NULL ORDER BY duration_sec) - 1 AS pos,
+           COUNT(duration_sec) OVER () AS n
+    FROM runs
+)
+SELECT COUNT(*) AS total,
+       COALESCE(SUM(status = 'SUCCESS'), 0) AS success,
+       COALESCE(SUM(status = 'RUNNING'), 0) AS running,
+       COALESCE(MAX(n), 0) AS n,
+       MIN(CASE WHEN duration_sec IS NOT NULL AND pos = 19 * (n - 1) DIV 20 THEN duration_sec END) AS p95_lo,
+       MIN(CASE WHEN duration_sec IS NOT NULL AND pos = 19 * (n - 1) DIV 20 + 1 THEN duration_sec END) AS p95_hi
+FROM ranked
+"""
+
+
+def p95(n: int, lo: Optional[float], hi: Optional[float]) -> float:
+    """由排序后第 19(n-1)//20 与其后一位的耗时线性插值出 P95（同 statistics.quantiles(n=20, method="inclusive")[-1]）。"""
+    if not n:
         return 0.0
-    if len(values) == 1:
-        return values[0]
-    return quantiles(values, n=20, method="inclusive")[-1]
+    if hi is None:
+        return float(lo)
+    delta = 19 * (n - 1) % 20
+    return (float(lo) * (20 - delta) + float(hi) * delta) / 20
 
 
 def main() -> int:
@@ -40,24 +66,12 @@ def main() -> int:
     cfg = get_env_config()
     with get_mysql_session(cfg) as conn:
         with conn.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT api_name, status,
-                       TIMESTAMPDIFF(SECOND, start_at, COALESCE(end_at, NOW())) AS duration_sec
-                FROM meta_etl_run_log
-                WHERE start_at >= %s
-                """,
-                (since,),
-            )
-            rows = cursor.fetchall()
-
-    total = len(rows)
-    success = sum(1 for _, status, _ in rows if status == "SUCCESS")
-    running = sum(1 for _, status, _ in rows if status == "RUNNING")
-    durations = [float(duration) for _, status, duration in rows if status in {"SUCCESS", "FAILED"} and duration is not None]
+            cursor.execute(SLO_SQL, (since,))
+            total, success, running, n, p95_lo, p95_hi = cursor.fetchone()
 
+    total, success, running = int(total), int(success), int(running)
     success_rate = (success / total * 100.0) if total else 100.0
-    p95_duration = p95(durations)
+    p95_duration = p95(int(n), p95_lo, p95_hi)
 
     print(f"\n=== ETL SLO Dashboard ({args.hours}h) ===")
     print(f"- total_runs: {total}")
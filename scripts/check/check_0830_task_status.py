@@ -2,21 +2,26 @@
 from __future__ import annotations
 
 import argparse
-import configparser
 import json
-import re
-import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
-import pymysql
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-
-SUCCESS_MARKER = "SUCCESS: Completed in "
-FAILED_MARKER = "Max retries reached. Task failed."
+from scripts.check._log_scan import (
+    extract_latest_timestamp,
+    list_processes,
+    log_completed,
+    map_log,
+    scan_run,
+)
+from scripts.check.status_daemon import fetch_run_rows
 
 
 @dataclass
@@ -78,58 +83,9 @@ def _resolve_path(path_text: str) -> Path:
     return (Path.cwd() / path).resolve()
 
 
-def _find_log_segment(lines: list[str], target_date: str) -> tuple[int | None, int | None, int | None]:
-    start_line_no: int | None = None
-    success_line_no: int | None = None
-    failed_line_no: int | None = None
-
-    start_re = re.compile(rf"^{re.escape(target_date)} 08:30:\d{{2}},\d+ ")
-    for idx, line in enumerate(lines, start=1):
-        if start_re.match(line):
-            start_line_no = idx
-            break
-
-    if start_line_no is None:
-        return None, None, None
-
-    for idx in range(start_line_no - 1, len(lines)):
-        line = lines[idx]
-        line_no = idx + 1
-        if SUCCESS_MARKER in line:
-            success_line_no = line_no
-        if FAILED_MARKER in line:
-            failed_line_no = line_no
-
-    return start_line_no, success_line_no, failed_line_no
-
-
-def _extract_latest_timestamp(lines: list[str], start_line_no: int | None) -> datetime | None:
-    if start_line_no is None:
-        return None
-
-    ts_re = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?:,\d+)?\b")
-    latest: datetime | None = None
-    for line in lines[start_line_no - 1 :]:
-        matched = ts_re.match(line)
-        if not matched:
-            continue
-        try:
-            latest = datetime.strptime(matched.group(1), "%Y-%m-%d %H:%M:%S")
-        except ValueError:
-            continue
-    return latest
-
-
 def _detect_active_processes() -> list[str]:
-    try:
-        proc = subprocess.run(["ps", "-ef"], capture_output=True, text=True, check=False)
-    except Exception:
-        return []
-    if proc.returncode != 0:
-        return []
-
     matches: list[str] = []
-    for line in proc.stdout.splitlines():
+    for line in list_processes():
         if "check_0830_task_status.py" in line:
             continue
         if "cron_0830.log" in line and "run_with_retry.py" in line:
@@ -144,58 +100,15 @@ def _detect_active_processes() -> list[str]:
     return matches
 
 
-def _load_mysql_config(config_path: Path) -> dict[str, Any]:
-    parser = configparser.ConfigParser()
-    parser.read(config_path)
-    return {
-        "host": parser.get("mysql", "host", fallback="127.0.0.1"),
-        "port": parser.getint("mysql", "port", fallback=3306),
-        "user": parser.get("mysql", "user", fallback="root"),
-        "password": parser.get("mysql", "password", fallback=""),
-        "database": parser.get("mysql", "database", fallback="tushare_stock"),
-    }
-
-
 def _fetch_db_rows(config_path: Path, target_date: str) -> tuple[int | None, list[dict[str, Any]] | None]:
-    try:
-        cfg = _load_mysql_config(config_path)
-        conn = pymysql.connect(
-            host=cfg["host"],
-            port=int(cfg["port"]),
-            user=cfg["user"],
-            password=cfg["password"],
-            database=cfg["database"],
-            charset="utf8mb4",
-            cursorclass=pymysql.cursors.DictCursor,
-        )
-    except Exception:
+    date_obj = datetime.strptime(target_date, "%Y-%m-%d")
+    start_ts = f"{target_date} 08:30:00"
+    end_ts = (date_obj + timedelta(days=1)).strftime("%Y-%m-%d 17:00:00")
+    rows = fetch_run_rows(config_path, start_ts, end_ts)
+    if rows is None:
         return None, None
 
-    try:
-        date_obj = datetime.strptime(target_date, "%Y-%m-%d")
-        start_ts = f"{target_date} 08:30:00"
-        end_ts = (date_obj + timedelta(days=1)).strftime("%Y-%m-%d 17:00:00")
-        with conn.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT id, api_name, run_type, status, start_at, end_at
-                FROM meta_etl_run_log
-                WHERE start_at >= %s AND start_at < %s
-                ORDER BY id DESC
-                LIMIT 20
-                """,
-                (start_ts, end_ts),
-            )
-            rows = cursor.fetchall()
-    finally:
-        conn.close()
-
     running_count = sum(1 for row in rows if str(row.get("status")) == "RUNNING")
-    for row in rows:
-        for key in ("start_at", "end_at"):
-            value = row.get(key)
-            if isinstance(value, datetime):
-                row[key] = value.strftime("%Y-%m-%d %H:%M:%S")
     return running_count, rows
 
 
@@ -211,7 +124,7 @@ def _decide_state(
     if start_line is None:
         return "NOT_TRIGGERED", "No 08:30 log entry found for target date."
 
-    if success_line and (not failed_line or success_line > failed_line):
+    if log_completed(start_line, success_line, failed_line):
         return "COMPLETED", "Found success marker after the 08:30 run started."
 
     if failed_line and (not success_line or failed_line > success_line):
@@ -285,10 +198,18 @@ def main() -> int:
             _print_text(result)
         return 1
 
-    lines = log_file.read_text(encoding="utf-8", errors="replace").splitlines()
-    start_line, success_line, failed_line = _find_log_segment(lines, args.date)
-    latest_ts = _extract_latest_timestamp(lines, start_line)
-    active_processes = _detect_active_processes()
+    # The process scan and the DB query are independent I/O: run them alongside the log scan
+    db_future = None
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        processes_future = executor.submit(_detect_active_processes)
+        with map_log(log_file) as log:
+            start_offset, start_line, success_line, failed_line = scan_run(log, log_file, args.date, "08:30")
+            latest_ts = extract_latest_timestamp(log, start_offset)
+        # The log alone settles a COMPLETED run; skip the DB round-trip for it
+        if not args.skip_db and not log_completed(start_line, success_line, failed_line):
+            db_cfg = _resolve_path(args.config)
+            db_future = executor.submit(_fetch_db_rows, db_cfg, args.date)
+        active_processes = processes_future.result()
     state, reason = _decide_state(
         start_line=start_line,
         success_line=success_line,
@@ -300,9 +221,8 @@ def main() -> int:
 
     db_running_count: int | None = None
     db_rows: list[dict[str, Any]] | None = None
-    if not args.skip_db:
-        db_cfg = _resolve_path(args.config)
-        db_running_count, db_rows = _fetch_db_rows(db_cfg, args.date)
+    if db_future is not None:
+        db_running_count, db_rows = db_future.result()
 
     result = RunStatus(
         target_date=args.date,
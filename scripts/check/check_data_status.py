@@ -6,13 +6,14 @@ import os
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 # Add project scripts directory to sys.path to allow importing 'etl' package
 scripts_dir = Path(__file__).resolve().parents[1]
 if str(scripts_dir) not in sys.path:
     sys.path.insert(0, str(scripts_dir))
 
+from etl.base import meta_cache
 from etl.base.runtime import get_env_config, get_mysql_connection
 
 
@@ -83,6 +84,17 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Do not fail if today's data is missing (handles TuShare data lag).",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query the trade calendar and watermarks instead of using the local cache.",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=meta_cache.DEFAULT_TTL,
+        help="Seconds a cached trade date / watermark result stays valid (default: 300).",
+    )
     return parser.parse_args()
 
 
@@ -117,12 +129,31 @@ def _apply_config_args(args: argparse.Namespace) -> None:
         os.environ["MYSQL_DB"] = args.database
 
 
-def _latest_trade_date(cursor) -> Optional[int]:
+def _latest_trade_date(
+    cursor,
+    cache_scope: Optional[str] = None,
+    ttl: float = meta_cache.DEFAULT_TTL,
+) -> Optional[int]:
+    """Latest trade date the data should have reached; cached per day when cache_scope is set."""
     from datetime import datetime, time as dtime
 
     now = datetime.now()
     today_int = int(now.strftime("%Y%m%d"))
     include_today = now.time() >= dtime(16, 0)
+    if cache_scope is None:
+        return _query_latest_trade_date(cursor, today_int, include_today)
+
+    key = ("latest_trade_date", cache_scope, today_int, include_today)
+    cached = meta_cache.get(key, ttl=ttl)
+    if cached is not meta_cache.MISS:
+        return cached
+    value = _query_latest_trade_date(cursor, today_int, include_today)
+    if value is not None:
+        meta_cache.put(key, value)
+    return value
+
+
+def _query_latest_trade_date(cursor, today_int: int, include_today: bool) -> Optional[int]:
     op = "<=" if include_today else "<"
 
     cursor.execute(
@@ -141,16 +172,35 @@ def _latest_trade_date(cursor) -> Optional[int]:
     return None
 
 
-def _fetch_table_stats(cursor, table: TableCheck) -> tuple[Optional[int], int, Optional[str]]:
-    sql = (
-        f"SELECT MAX({table.date_column}), COUNT(*), MAX(updated_at) "
-        f"FROM {table.name}"
-    )
-    cursor.execute(sql)
-    max_date, total_rows, updated_at = cursor.fetchone()
-    max_date_value = int(max_date) if max_date is not None else None
-    updated_at_value = updated_at.isoformat(sep=" ") if updated_at else None
-    return max_date_value, int(total_rows), updated_at_value
+# Tables per UNION ALL statement, keeping a long table list well under max_allowed_packet
+STATS_BATCH_SIZE = 50
+
+
+def _fetch_all_table_stats(
+    cursor, tables: Iterable[TableCheck]
+) -> Dict[str, tuple[Optional[int], int, Optional[str]]]:
+    """Fetch (max_date, rows, updated_at) for every table in one UNION ALL round-trip.
+
+    Table and column names come from the hard-coded TableCheck lists in main(),
+    never from user input. Returns a dict keyed by table name.
+    """
+    unique = list({table.name: table for table in tables}.values())
+    stats: Dict[str, tuple[Optional[int], int, Optional[str]]] = {}
+    for begin in range(0, len(unique), STATS_BATCH_SIZE):
+        batch = unique[begin : begin + STATS_BATCH_SIZE]
+        parts = [
+            f"SELECT {i} AS idx, MAX({table.date_column}), COUNT(*), MAX(updated_at) "
+            f"FROM {table.name}"
+            for i, table in enumerate(batch)
+        ]
+        cursor.execute(" UNION ALL ".join(parts))
+        for idx, max_date, total_rows, updated_at in cursor.fetchall():
+            stats[batch[int(idx)].name] = (
+                int(max_date) if max_date is not None else None,
+                int(total_rows),
+                updated_at.isoformat(sep=" ") if updated_at else None,
+            )
+    return stats
 
 
 def _status_for_date(max_date: Optional[int], threshold: Optional[int]) -> str:
@@ -161,12 +211,38 @@ def _status_for_date(max_date: Optional[int], threshold: Optional[int]) -> str:
     return "OK" if max_date >= threshold else "STALE"
 
 
+def _previous_trade_date(
+    cursor,
+    cache_scope: Optional[str] = None,
+    ttl: float = meta_cache.DEFAULT_TTL,
+) -> Optional[int]:
+    """Latest SSE trading day before today."""
+    from datetime import datetime
+
+    today_int = int(datetime.now().strftime("%Y%m%d"))
+    key = ("previous_trade_date", cache_scope, today_int)
+    if cache_scope is not None:
+        cached = meta_cache.get(key, ttl=ttl)
+        if cached is not meta_cache.MISS:
+            return cached
+    cursor.execute(
+        "SELECT MAX(cal_date) FROM dim_trade_cal "
+        "WHERE exchange='SSE' AND is_open=1 AND cal_date < %s",
+        (today_int,),
+    )
+    row = cursor.fetchone()
+    value = int(row[0]) if row and row[0] else None
+    if cache_scope is not None and value is not None:
+        meta_cache.put(key, value)
+    return value
+
+
 def _resolve_threshold(
     *,
-    cursor,
     table: TableCheck,
     expected_trade_date: Optional[int],
     args: argparse.Namespace,
+    previous_trade_date: Optional[int] = None,
 ) -> Optional[int]:
     threshold = args.min_date or expected_trade_date
 
@@ -189,42 +265,48 @@ def _resolve_threshold(
         today_int = int(datetime.now().strftime("%Y%m%d"))
         if threshold == today_int:
             # In lenient mode, allow T-1 only instead of disabling stale checks entirely.
-            cursor.execute(
-                "SELECT MAX(cal_date) FROM dim_trade_cal "
-                "WHERE exchange='SSE' AND is_open=1 AND cal_date < %s",
-                (today_int,),
-            )
-            row = cursor.fetchone()
-            return int(row[0]) if row and row[0] else None
+            return previous_trade_date
             
     return threshold
 
 
+GROUP_TITLES = {
+    "ods": "ODS Daily Tables",
+    "financial": "Financial Tables",
+    "features": "Feature Tables",
+    "dwd": "DWD Tables",
+    "dws": "DWS Tables",
+    "ads": "ADS Tables",
+}
+
+
 def _print_group_header(title: str) -> None:
     print(f"\n{title}")
     print("-" * len(title))
 
 
-def _print_table_rows(
-    *,
-    cursor,
+def _print_group(
+    category: str,
     tables: Iterable[TableCheck],
+    stats: Dict[str, tuple[Optional[int], int, Optional[str]]],
     expected_trade_date: Optional[int],
     args: argparse.Namespace,
+    previous_trade_date: Optional[int] = None,
 ) -> List[tuple[str, str, bool]]:
-    """Returns a list of (table_name, status, is_failure)."""
+    """Print one category from prefetched stats; returns a list of (table_name, status, is_failure)."""
+    _print_group_header(GROUP_TITLES[category])
     header = f"{'table':<28} {'max_date':<10} {'rows':<10} {'updated_at':<20} {'status':<8} {'threshold':<10}"
     print(header)
     print("-" * len(header))
     results: List[tuple[str, str, bool]] = []
-    
+
     for table in tables:
-        max_date, total_rows, updated_at = _fetch_table_stats(cursor, table)
+        max_date, total_rows, updated_at = stats[table.name]
         threshold = _resolve_threshold(
-            cursor=cursor,
             table=table,
             expected_trade_date=expected_trade_date,
             args=args,
+            previous_trade_date=previous_trade_date,
         )
         status = _status_for_date(max_date, threshold)
         
@@ -244,21 +326,34 @@ def _print_table_rows(
     return results
 
 
-def _print_watermarks(cursor, api_names: List[str]) -> None:
+def _print_watermarks(
+    cursor,
+    api_names: List[str],
+    cache_scope: Optional[str] = None,
+    ttl: float = meta_cache.DEFAULT_TTL,
+) -> None:
     if not api_names:
         return
-    placeholders = ",".join(["%s"] * len(api_names))
-    sql = (
-        "SELECT api_name, water_mark, status, last_run_at, last_err "
-        f"FROM meta_etl_watermark WHERE api_name IN ({placeholders}) "
-        "ORDER BY api_name"
-    )
-    cursor.execute(sql, tuple(api_names))
-    rows = cursor.fetchall()
+    from datetime import datetime
+
+    # The printed lines are cached rather than the rows, so datetimes need no JSON encoding
+    key = ("watermarks", cache_scope, api_names, int(datetime.now().strftime("%Y%m%d")))
+    lines = meta_cache.get(key, ttl=ttl) if cache_scope is not None else meta_cache.MISS
+    if lines is meta_cache.MISS:
+        placeholders = ",".join(["%s"] * len(api_names))
+        sql = (
+            "SELECT api_name, water_mark, status, last_run_at, last_err "
+            f"FROM meta_etl_watermark WHERE api_name IN ({placeholders}) "
+            "ORDER BY api_name"
+        )
+        cursor.execute(sql, tuple(api_names))
+        lines = [str(row) for row in cursor.fetchall()]
+        if cache_scope is not None:
+            meta_cache.put(key, lines)
     print("\nWatermarks")
     print("----------")
-    for row in rows:
-        print(row)
+    for line in lines:
+        print(line)
 
 
 def main() -> None:
@@ -316,10 +411,23 @@ def main() -> None:
         # New ADS table
         TableCheck("ads_stock_score_daily", "trade_date", "ads"),
     ]
+    groups = [
+        ("ods", ods_tables),
+        ("financial", financial_tables),
+        ("features", feature_tables),
+        ("dwd", dwd_tables),
+        ("dws", dws_tables),
+        ("ads", ads_tables),
+    ]
+
+    # Cache entries are per database, so another etl.ini never sees these results
+    cache_scope = None if args.no_cache else f"{cfg.host}:{cfg.port}/{cfg.database}"
 
     with get_mysql_connection(cfg) as conn:
         with conn.cursor() as cursor:
-            expected_trade_date = args.expected_trade_date or _latest_trade_date(cursor)
+            expected_trade_date = args.expected_trade_date or _latest_trade_date(
+                cursor, cache_scope, args.cache_ttl
+            )
             print(f"Expected latest trade_date: {expected_trade_date}")
             _print_watermarks(
                 cursor,
@@ -334,73 +442,33 @@ def main() -> None:
                     "dws",
                     "ads",
                 ],
+                cache_scope,
+                args.cache_ttl,
             )
 
             selected = None
             if args.categories:
                 selected = {c.strip() for c in args.categories.split(",") if c.strip()}
 
-            failures: List[str] = []
-
-            if selected is None or "ods" in selected:
-                _print_group_header("ODS Daily Tables")
-                statuses = _print_table_rows(
-                    cursor=cursor,
-                    tables=ods_tables,
-                    expected_trade_date=expected_trade_date,
-                    args=args,
-                )
-                failures.extend([name for name, _, is_fail in statuses if is_fail])
-
-            if selected is None or "financial" in selected:
-                _print_group_header("Financial Tables")
-                statuses = _print_table_rows(
-                    cursor=cursor,
-                    tables=financial_tables,
-                    expected_trade_date=expected_trade_date,
-                    args=args,
-                )
-                failures.extend([name for name, _, is_fail in statuses if is_fail])
-
-            if selected is None or "features" in selected:
-                _print_group_header("Feature Tables")
-                statuses = _print_table_rows(
-                    cursor=cursor,
-                    tables=feature_tables,
-                    expected_trade_date=expected_trade_date,
-                    args=args,
-                )
-                failures.extend([name for name, _, is_fail in statuses if is_fail])
-
-            if selected is None or "dwd" in selected:
-                _print_group_header("DWD Tables")
-                statuses = _print_table_rows(
-                    cursor=cursor,
-                    tables=dwd_tables,
-                    expected_trade_date=expected_trade_date,
-                    args=args,
-                )
-                failures.extend([name for name, _, is_fail in statuses if is_fail])
-
-            if selected is None or "dws" in selected:
-                _print_group_header("DWS Tables")
-                statuses = _print_table_rows(
-                    cursor=cursor,
-                    tables=dws_tables,
-                    expected_trade_date=expected_trade_date,
-                    args=args,
-                )
-                failures.extend([name for name, _, is_fail in statuses if is_fail])
-
-            if selected is None or "ads" in selected:
-                _print_group_header("ADS Tables")
-                statuses = _print_table_rows(
-                    cursor=cursor,
-                    tables=ads_tables,
-                    expected_trade_date=expected_trade_date,
-                    args=args,
-                )
-                failures.extend([name for name, _, is_fail in statuses if is_fail])
+            selected_tables = [
+                table
+                for category, tables in groups
+                if selected is None or category in selected
+                for table in tables
+            ]
+            # One round-trip for every selected table; the groups below only format
+            stats = _fetch_all_table_stats(cursor, selected_tables)
+            previous_trade_date = (
+                _previous_trade_date(cursor, cache_scope, args.cache_ttl) if args.ignore_today else None
+            )
+
+    failures: List[str] = []
+    for category, tables in groups:
+        if selected is None or category in selected:
+            statuses = _print_group(
+                category, tables, stats, expected_trade_date, args, previous_trade_date
+            )
+            failures.extend([name for name, _, is_fail in statuses if is_fail])
 
     if failures and args.fail_on_stale:
         raise SystemExit(f"Stale/empty tables detected: {', '.join(sorted(set(failures)))}")
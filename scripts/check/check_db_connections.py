@@ -6,8 +6,35 @@ scripts_dir = Path(__file__).resolve().parents[1]
 if str(scripts_dir) not in sys.path:
     sys.path.insert(0, str(scripts_dir))
 
+import pymysql
+
 from etl.base.runtime import get_env_config, get_mysql_session
 
+def fetch_connection_counts(cursor):
+    """Return (max_connections, threads_connected, process_count).
+
+    Reads everything in one round-trip; if performance_schema is not readable
+    by this user, falls back to SHOW GLOBAL STATUS for Threads_connected.
+    """
+    try:
+        cursor.execute(
+            "SELECT @@max_connections, "
+            "(SELECT VARIABLE_VALUE FROM performance_schema.global_status "
+            "WHERE VARIABLE_NAME = 'Threads_connected'), "
+            "(SELECT COUNT(*) FROM information_schema.PROCESSLIST)"
+        )
+        max_connections, threads_connected, process_count = cursor.fetchone()
+    except (pymysql.err.ProgrammingError, pymysql.err.OperationalError):
+        # e.g. 1142 (SELECT denied on performance_schema) is an OperationalError
+        cursor.execute("SELECT @@max_connections, (SELECT COUNT(*) FROM information_schema.PROCESSLIST)")
+        max_connections, process_count = cursor.fetchone()
+        cursor.execute("SHOW GLOBAL STATUS LIKE 'Threads_connected'")
+        row = cursor.fetchone()
+        threads_connected = row[1] if row else None
+    if threads_connected is None:  # performance_schema disabled
+        threads_connected = process_count
+    return max_connections, threads_connected, process_count
+
 def check_connections():
     cfg = get_env_config()
     print(f"Connecting to MySQL at {cfg.host}:{cfg.port} as {cfg.user}...")
@@ -15,16 +42,13 @@ def check_connections():
     try:
         with get_mysql_session(cfg) as conn:
             with conn.cursor() as cursor:
-                # Get current threads connected
-                cursor.execute("SHOW STATUS LIKE 'Threads_connected';")
-                threads_connected = cursor.fetchone()[1]
-                
-                # Get max connections
-                cursor.execute("SHOW VARIABLES LIKE 'max_connections';")
-                max_connections = cursor.fetchone()[1]
-                
-                # Get process list count
-                cursor.execute("SHOW PROCESSLIST;")
+                max_connections, threads_connected, process_count = fetch_connection_counts(cursor)
+
+                # Only the longest-running processes are listed, so let the server pick them
+                cursor.execute(
+                    "SELECT ID, USER, HOST, DB, COMMAND, TIME "
+                    "FROM information_schema.PROCESSLIST ORDER BY TIME DESC LIMIT 10"
+                )
                 processes = cursor.fetchall()
                 
                 print("\n" + "="*40)
@@ -34,17 +58,17 @@ def check_connections():
                 print(f"Max Connections:   {max_connections}")
                 print(f"Usage Percentage:  {(int(threads_connected)/int(max_connections))*100:.2f}%")
                 print("-" * 40)
-                print(f"Active Processes:  {len(processes)}")
+                print(f"Active Processes:  {process_count}")
                 
                 # Show top consumers or details if needed
                 print("\nTop Processes:")
                 print(f"{'Id':<10} | {'User':<15} | {'Host':<20} | {'db':<15} | {'Command':<10} | {'Time':<5}")
                 print("-" * 85)
-                for p in processes[:10]: # Show first 10
+                for p in processes:
                     print(f"{p[0]:<10} | {p[1]:<15} | {p[2]:<20} | {str(p[3]):<15} | {p[4]:<10} | {p[5]:<5}")
                 
-                if len(processes) > 10:
-                    print(f"... and {len(processes) - 10} more")
+                if process_count > len(processes):
+                    print(f"... and {process_count - len(processes)} more")
                 
     except Exception as e:
         print(f"Error checking database: {e}")
@@ -1,41 +1,41 @@
 
-import configparser
-import pymysql
+import sys
 from pathlib import Path
 
+import pymysql
+
+# Add project scripts directory to sys.path to allow importing 'etl' package
+scripts_dir = Path(__file__).resolve().parents[1]
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+from etl.base.pool import get_pool
+from etl.base.runtime import get_env_config
+
 def check_db():
-    config = configparser.ConfigParser()
-    config.read('/Users/chenyiyun/PycharmProjects/AShareDataCenter/config/etl.ini')
-    
     try:
-        conn = pymysql.connect(
-            host=config['mysql']['host'],
-            port=int(config['mysql']['port']),
-            user=config['mysql']['user'],
-            password=config['mysql']['password'],
-            database=config['mysql']['database'],
-            charset='utf8mb4',
-            cursorclass=pymysql.cursors.DictCursor
-        )
-        with conn.cursor() as cursor:
-            # Check latest run logs
-            cursor.execute("SELECT * FROM meta_etl_run_log ORDER BY id DESC LIMIT 10")
-            logs = cursor.fetchall()
-            print("\nLatest Task Logs:")
-            for log in logs:
-                print(f"ID: {log['id']}, API: {log['api_name']}, Type: {log['run_type']}, Status: {log['status']}, Start: {log['start_at']}, End: {log['end_at']}")
-            
-            # Check watermarks
-            cursor.execute("SELECT * FROM meta_etl_watermark")
-            watermarks = cursor.fetchall()
-            print("\nWatermarks:")
-            for wm in watermarks:
-                print(f"API: {wm['api_name']}, Watermark: {wm['water_mark']}, Status: {wm['status']}, Last Run: {wm['last_run_at']}")
+        with get_pool(get_env_config()).connection() as conn:
+            # Server-side cursor: rows are streamed and printed as they arrive
+            with conn.cursor(pymysql.cursors.SSDictCursor) as cursor:
+                # Check latest run logs
+                cursor.execute(
+                    "SELECT id, api_name, run_type, status, start_at, end_at "
+                    "FROM meta_etl_run_log ORDER BY id DESC LIMIT 10"
+                )
+                print("\nLatest Task Logs:")
+                for log in cursor:
+                    print(f"ID: {log['id']}, API: {log['api_name']}, Type: {log['run_type']}, Status: {log['status']}, Start: {log['start_at']}, End: {log['end_at']}")
+                
+                # Check watermarks
+                cursor.execute(
+                    "SELECT api_name, water_mark, status, last_run_at "
+                    "FROM meta_etl_watermark ORDER BY api_name LIMIT 500"
+                )
+                print("\nWatermarks:")
+                for wm in cursor:
+                    print(f"API: {wm['api_name']}, Watermark: {wm['water_mark']}, Status: {wm['status']}, Last Run: {wm['last_run_at']}")
     except Exception as e:
         print(f"Error: {e}")
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 if __name__ == "__main__":
     check_db()
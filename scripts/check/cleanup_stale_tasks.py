@@ -1,58 +1,59 @@
 
-import configparser
-import pymysql
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
+
+import pymysql
+
+# Add project scripts directory to sys.path to allow importing 'etl' package
+scripts_dir = Path(__file__).resolve().parents[1]
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+from etl.base.pool import get_pool
+from etl.base.runtime import get_env_config
+
+CLEANUP_MSG = 'Auto-cleaned: Process likely died or timed out.'
 
 def cleanup():
-    config = configparser.ConfigParser()
-    config.read('/Users/chenyiyun/PycharmProjects/AShareDataCenter/config/etl.ini')
-    
     try:
-        conn = pymysql.connect(
-            host=config['mysql']['host'],
-            port=int(config['mysql']['port']),
-            user=config['mysql']['user'],
-            password=config['mysql']['password'],
-            database=config['mysql']['database'],
-            charset='utf8mb4',
-            cursorclass=pymysql.cursors.DictCursor,
-            autocommit=True
-        )
-        with conn.cursor() as cursor:
-            # Mark tasks older than 4 hours as FAILED
-            four_hours_ago = (datetime.now() - timedelta(hours=4)).strftime('%Y-%m-%d %H:%M:%S')
-            
-            # First, see what we're about to change
-            cursor.execute("""
-                SELECT id, api_name, start_at FROM meta_etl_run_log 
-                WHERE status = 'RUNNING' AND start_at < %s
-            """, (four_hours_ago,))
-            stale_tasks = cursor.fetchall()
-            
-            if not stale_tasks:
-                print("No stale tasks found.")
-                return
-
-            print(f"Found {len(stale_tasks)} stale tasks. Cleaning up...")
-            for task in stale_tasks:
-                print(f"Cleaning task: ID={task['id']}, API={task['api_name']}, Start={task['start_at']}")
-
-            # Perform update
-            affected = cursor.execute("""
-                UPDATE meta_etl_run_log 
-                SET status = 'FAILED', 
-                    end_at = NOW(), 
-                    err_msg = 'Auto-cleaned: Process likely died or timed out.'
-                WHERE status = 'RUNNING' AND start_at < %s
-            """, (four_hours_ago,))
-            
-            print(f"Update complete. Affected rows: {affected}")
-            
+        with get_pool(get_env_config()).connection() as conn:
+            with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                # Mark tasks older than 4 hours as FAILED
+                now = datetime.now().replace(microsecond=0)
+                four_hours_ago = (now - timedelta(hours=4)).strftime('%Y-%m-%d %H:%M:%S')
+                cleaned_at = now.strftime('%Y-%m-%d %H:%M:%S')
+
+                # Update first: the UPDATE alone decides which tasks are stale, so a task
+                # changing state in between cannot be reported but not cleaned (or vice versa)
+                affected = cursor.execute("""
+                    UPDATE meta_etl_run_log 
+                    SET status = 'FAILED', 
+                        end_at = %s, 
+                        err_msg = %s
+                    WHERE status = 'RUNNING' AND start_at < %s
+                """, (cleaned_at, CLEANUP_MSG, four_hours_ago))
+
+                if not affected:
+                    print("No stale tasks found.")
+                    return
+
+                # The rows just updated are the ones carrying this run's end_at and message
+                cursor.execute("""
+                    SELECT id, api_name, start_at FROM meta_etl_run_log 
+                    WHERE start_at < %s AND status = 'FAILED' AND end_at = %s AND err_msg = %s
+                """, (four_hours_ago, cleaned_at, CLEANUP_MSG))
+                cleaned_tasks = cursor.fetchall()
+                # Pooled connections do not autocommit
+                conn.commit()
+
+                print(f"Found {affected} stale tasks. Cleaned up:")
+                for task in cleaned_tasks:
+                    print(f"Cleaning task: ID={task['id']}, API={task['api_name']}, Start={task['start_at']}")
+                print(f"Update complete. Affected rows: {affected}")
+
     except Exception as e:
         print(f"Error during cleanup: {e}")
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 if __name__ == "__main__":
     cleanup()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Local status daemon for the check_<HHMM>_task_status.py checkers.
+
+The checkers are polled every few minutes and each poll used to open a fresh
+MySQL connection (TCP + auth handshake) for a single 20-row query. This daemon
+keeps one connection open and answers those queries over a Unix socket:
+
+    python scripts/check/status_daemon.py --config config/etl.ini
+
+fetch_run_rows() tries the daemon first (50 ms connect timeout) and falls back
+to a direct pymysql connection when it is not running.
+"""
+from __future__ import annotations
+
+import argparse
+import configparser
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+from pathlib import Path
+from typing import Any
+
+import pymysql
+
+SOCKET_ENV = "ETL_STATUS_SOCK"
+CONNECT_TIMEOUT = 0.05
+REPLY_TIMEOUT = 10.0
+
+# Timestamps are formatted server-side ('%' doubled for pymysql's paramstyle)
+RUN_ROWS_SQL = """
+SELECT id, api_name, run_type, status,
+       DATE_FORMAT(start_at, '%%Y-%%m-%%d %%H:%%i:%%s') AS start_at,
+       DATE_FORMAT(end_at, '%%Y-%%m-%%d %%H:%%i:%%s') AS end_at
+FROM meta_etl_run_log
+WHERE start_at >= %s AND start_at < %s
+ORDER BY id DESC
+LIMIT 20
+"""
+
+
+def socket_path() -> str:
+    """$ETL_STATUS_SOCK, else a per-user location: $XDG_RUNTIME_DIR or ~/.cache/ashare_datacenter."""
+    if os.environ.get(SOCKET_ENV):
+        return os.environ[SOCKET_ENV]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    base = Path(runtime_dir) if runtime_dir else Path.home() / ".cache" / "ashare_datacenter"
+    return str(base / "etl_status.sock")
+
+
+def _is_own_socket(path: str) -> bool:
+    """True if path is a socket (not a symlink to one) owned by the current user."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def load_mysql_config(config_path: Path) -> dict[str, Any]:
+    parser = configparser.ConfigParser()
+    parser.read(config_path)
+    return {
+        "host": parser.get("mysql", "host", fallback="127.0.0.1"),
+        "port": parser.getint("mysql", "port", fallback=3306),
+        "user": parser.get("mysql", "user", fallback="root"),
+        "password": parser.get("mysql", "password", fallback=""),
+        "database": parser.get("mysql", "database", fallback="tushare_stock"),
+    }
+
+
+def _connect(config_path: Path, **kwargs: Any) -> pymysql.connections.Connection:
+    cfg = load_mysql_config(config_path)
+    return pymysql.connect(
+        host=cfg["host"],
+        port=int(cfg["port"]),
+        user=cfg["user"],
+        password=cfg["password"],
+        database=cfg["database"],
+        charset="utf8mb4",
+        cursorclass=pymysql.cursors.DictCursor,
+        **kwargs,
+    )
+
+
+def _query_run_rows(conn: pymysql.connections.Connection, start_ts: str, end_ts: str) -> list[dict[str, Any]]:
+    with conn.cursor() as cursor:
+        cursor.execute(RUN_ROWS_SQL, (start_ts, end_ts))
+        return list(cursor.fetchall())
+
+
+def _ask_daemon(request: dict[str, Any]) -> dict[str, Any] | None:
+    path = socket_path()
+    # Rows from a socket another user bound could be made up: only trust our own
+    if not hasattr(socket, "AF_UNIX") or not _is_own_socket(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(path)
+            sock.settimeout(REPLY_TIMEOUT)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                reply = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    return reply if isinstance(reply, dict) else None
+
+
+def fetch_run_rows(config_path: Path, start_ts: str, end_ts: str) -> list[dict[str, Any]] | None:
+    """Latest 20 meta_etl_run_log rows started in [start_ts, end_ts); None if the DB is unreachable."""
+    reply = _ask_daemon(
+        {"op": "fetch_rows", "config": str(config_path.resolve()), "start": start_ts, "end": end_ts}
+    )
+    if reply is not None and "rows" in reply:
+        return reply["rows"]
+
+    try:
+        conn = _connect(config_path)
+    except Exception:
+        return None
+    try:
+        return _query_run_rows(conn, start_ts, end_ts)
+    finally:
+        conn.close()
+
+
+class _StatusHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server: StatusServer = self.server  # type: ignore[assignment]
+        try:
+            request = json.loads(self.rfile.readline())
+            if request.get("op") != "fetch_rows":
+                raise ValueError(f"unknown op: {request.get('op')!r}")
+            if request.get("config") != str(server.config_path):
+                # Another etl.ini means another database: let the client connect itself
+                raise ValueError("config mismatch")
+            reply: dict[str, Any] = {"rows": server.fetch_rows(request["start"], request["end"])}
+        except Exception as exc:
+            reply = {"error": str(exc)}
+        self.wfile.write(json.dumps(reply, ensure_ascii=False).encode() + b"\n")
+
+
+class StatusServer(socketserver.UnixStreamServer):
+    """Serves requests one at a time over a single persistent connection."""
+
+    def __init__(self, path: str, config_path: Path) -> None:
+        self.config_path = config_path
+        self.conn: pymysql.connections.Connection | None = None
+        super().__init__(path, _StatusHandler)
+
+    def fetch_rows(self, start_ts: str, end_ts: str) -> list[dict[str, Any]]:
+        if self.conn is None:
+            self.conn = _connect(self.config_path, autocommit=True)
+        else:
+            self.conn.ping(reconnect=True)  # the server may have dropped an idle connection
+        return _query_run_rows(self.conn, start_ts, end_ts)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve check-script DB status queries over a Unix socket.")
+    parser.add_argument("--config", default="config/etl.ini", help="Path to etl.ini.")
+    parser.add_argument(
+        "--socket",
+        default=socket_path(),
+        help=f"Unix socket path. Default: ${SOCKET_ENV}, else etl_status.sock in $XDG_RUNTIME_DIR "
+        "or ~/.cache/ashare_datacenter.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    config_path = Path(args.config).expanduser().resolve()
+    if not config_path.exists():
+        print(f"Config not found: {config_path}", file=sys.stderr)
+        return 2
+
+    Path(args.socket).parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if os.path.lexists(args.socket):
+        os.unlink(args.socket)  # left over from a previous run
+    with StatusServer(args.socket, config_path) as server:
+        os.chmod(args.socket, 0o600)
+        print(f"Serving {config_path} on {args.socket}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if server.conn is not None:
+                server.conn.close()
+            os.unlink(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
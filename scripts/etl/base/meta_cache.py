@@ -0,0 +1,76 @@
+"""Small on-disk cache for read-mostly metadata queries (trade calendar, watermarks).
+
+Values are stored as JSON in a SQLite file keyed by the JSON of the key, e.g.
+("latest_trade_date", "127.0.0.1:3306/tushare_stock", 20240105). Entries
+expire by TTL only; any SQLite error is treated as a miss, so callers always
+fall back to querying MySQL.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+# Override the cache file location (e.g. for tests or read-only home directories)
+META_CACHE_ENV = "ETL_META_CACHE"
+DEFAULT_TTL = 300.0
+
+# Returned by get() on a miss, so a cached None/null stays distinguishable
+MISS = object()
+
+
+def cache_path() -> Path:
+    env_path = os.environ.get(META_CACHE_ENV)
+    if env_path:
+        return Path(env_path).expanduser()
+    return Path.home() / ".cache" / "ashare_datacenter" / "meta.sqlite"
+
+
+def _connect() -> sqlite3.Connection:
+    path = cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=1.0)
+    # WAL lets concurrent check scripts read while one of them writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS meta_cache ("
+        "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+    )
+    return conn
+
+
+def get(key: Any, ttl: float = DEFAULT_TTL) -> Any:
+    """Cached value for key if stored less than ttl seconds ago, else MISS."""
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute(
+                "SELECT value, stored_at FROM meta_cache WHERE key = ?",
+                (json.dumps(key),),
+            ).fetchone()
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error):
+        return MISS
+    if row is None or time.time() - row[1] > ttl:
+        return MISS
+    return json.loads(row[0])
+
+
+def put(key: Any, value: Any) -> None:
+    """Store a JSON-serializable value under key; failures are ignored."""
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta_cache (key, value, stored_at) VALUES (?, ?, ?)",
+                    (json.dumps(key), json.dumps(value), time.time()),
+                )
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error):
+        pass
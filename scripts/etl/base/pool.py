@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+import pymysql
+
+try:
+    from dbutils.pooled_db import PooledDB
+except ImportError:  # DBUtils is optional; fall back to one connection per checkout
+    PooledDB = None
+
+from .runtime import MysqlConfig, get_env_config
+
+# Set (e.g. by batch_runner --pool-size) to make get_mysql_connection() check out
+# from this pool, so jobs sharing a long-lived worker process reuse connections
+POOL_SIZE_ENV = "ETL_POOL_SIZE"
+
+_POOL = None
+
+
+def pool_size() -> int:
+    """Connections kept open by the pool; 0 when ETL_POOL_SIZE is not set."""
+    return int(os.environ.get(POOL_SIZE_ENV) or 0)
+
+
+class _UnpooledDB:
+    """Stand-in for PooledDB when DBUtils is not installed.
+
+    connection() opens a fresh pymysql connection; close() really closes it.
+    """
+
+    def __init__(self, **connect_kwargs) -> None:
+        self.connect_kwargs = connect_kwargs
+
+    def connection(self) -> pymysql.connections.Connection:
+        return pymysql.connect(**self.connect_kwargs)
+
+
+def get_pool(cfg: Optional[MysqlConfig] = None):
+    """Return the process-wide MySQL connection pool, creating it on first call.
+
+    The pool is built from cfg (default: get_env_config(), i.e. etl.ini plus
+    MYSQL_* overrides); later calls return the same pool whatever cfg is.
+    Check out with ``get_pool().connection()``; closing the connection
+    returns it to the pool. ping=1 revalidates an idle socket on checkout.
+    Up to ETL_POOL_SIZE (default 5) idle connections are kept.
+
+    Connections are opened on first checkout. Only long-lived processes that
+    set ETL_POOL_SIZE (batch_runner --pool-size) pre-open two up front; a
+    one-shot CLI would otherwise pay for a handshake it never uses.
+    """
+    global _POOL
+    if _POOL is None:
+        cfg = cfg or get_env_config()
+        connect_kwargs = dict(
+            host=cfg.host,
+            port=cfg.port,
+            user=cfg.user,
+            password=cfg.password,
+            database=cfg.database,
+            charset="utf8mb4",
+            autocommit=False,
+        )
+        size = pool_size() or 5
+        if PooledDB is not None:
+            _POOL = PooledDB(
+                creator=pymysql,
+                mincached=min(2, size) if pool_size() else 0,
+                maxcached=size,
+                maxconnections=max(10, 2 * size),
+                blocking=True,
+                ping=1,
+                **connect_kwargs,
+            )
+        else:
+            _POOL = _UnpooledDB(**connect_kwargs)
+    return _POOL
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+import threading
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from configparser import ConfigParser
 from typing import Iterable, List, Optional, Tuple
 
@@ -46,18 +48,33 @@ class RateLimiter:
     def __init__(self, max_per_minute: int) -> None:
         self.interval = 60.0 / max_per_minute
         self.last = 0.0
+        self._lock = threading.Lock()
 
     def wait(self) -> None:
-        now = time.time()
-        sleep_for = self.interval - (now - self.last)
+        # Reserve the next slot under the lock and sleep outside it, so threads
+        # sharing one limiter are still spaced `interval` apart
+        with self._lock:
+            now = time.time()
+            slot = max(now, self.last + self.interval)
+            self.last = slot
+        sleep_for = slot - now
         if sleep_for > 0:
             time.sleep(sleep_for)
-        self.last = time.time()
 
 
 def _load_config() -> ConfigParser:
-    parser = ConfigParser()
     config_path = _resolve_default_config_path()
+    try:
+        mtime: Optional[float] = os.path.getmtime(config_path)
+    except OSError:
+        mtime = None
+    return _read_config(config_path, mtime)
+
+
+@lru_cache(maxsize=4)
+def _read_config(config_path: str, mtime: Optional[float]) -> ConfigParser:
+    # Parsed once per (path, mtime): switching ETL_CONFIG_PATH or editing the file re-reads it
+    parser = ConfigParser()
     print(f"Using ETL config: {config_path}")
     parser.read(config_path)
     return parser
@@ -93,7 +110,12 @@ def get_tushare_limit() -> int:
 
 
 def get_mysql_connection(cfg: MysqlConfig) -> pymysql.connections.Connection:
+    """Open a connection, or check one out of the shared pool when ETL_POOL_SIZE is set."""
+    from .pool import get_pool, pool_size
+
     try:
+        if pool_size():
+            return get_pool(cfg).connection()
         return pymysql.connect(
             host=cfg.host,
             port=cfg.port,
@@ -125,7 +147,8 @@ def get_mysql_session(cfg: MysqlConfig):
 def to_records(df: pd.DataFrame, columns: List[str]) -> List[Tuple]:
     if df.empty:
         return []
-    return [tuple(df[col].iloc[i] for col in columns) for i in range(len(df))]
+    # Column-wise conversion; numeric values come out as Python int/float
+    return list(df[columns].itertuples(index=False, name=None))
 
 
 def chunked(items: List[Tuple], size: int) -> Iterable[List[Tuple]]:
@@ -108,6 +108,11 @@ def load_dwd_fina_indicator(cursor, start_date: int, end_date: int) -> None:
 
 def load_dwd_stock_daily_standard(cursor, trade_date: int) -> None:
     """Load standardized price data with front-adjusted prices."""
+    load_dwd_stock_daily_standard_range(cursor, trade_date, trade_date)
+
+
+def load_dwd_stock_daily_standard_range(cursor, start_date: int, end_date: int) -> None:
+    """Load standardized prices for every trade date in [start_date, end_date] in one statement."""
     # Optimization: Use tmp_base_adj created in _create_tmp_base_adj
     sql = """
     INSERT INTO dwd_stock_daily_standard (
@@ -128,7 +133,7 @@ def load_dwd_stock_daily_standard(cursor, trade_date: int) -> None:
     JOIN dwd_adj_factor a ON a.trade_date = d.trade_date AND a.ts_code = d.ts_code
     JOIN tmp_base_adj b ON b.ts_code = d.ts_code
     LEFT JOIN dwd_daily_basic db ON db.trade_date = d.trade_date AND db.ts_code = d.ts_code
-    WHERE d.trade_date = %s
+    WHERE d.trade_date BETWEEN %s AND %s
     ON DUPLICATE KEY UPDATE
         adj_open = VALUES(adj_open),
         adj_high = VALUES(adj_high),
@@ -138,31 +143,36 @@ def load_dwd_stock_daily_standard(cursor, trade_date: int) -> None:
         vol = VALUES(vol),
         amount = VALUES(amount)
     """
-    cursor.execute(sql, (trade_date,))
+    cursor.execute(sql, (start_date, end_date))
 
 
 def load_dwd_fina_snapshot(cursor, trade_date: int) -> None:
     """Load daily financial snapshot from PIT data."""
+    load_dwd_fina_snapshot_range(cursor, trade_date, trade_date)
+
+
+def load_dwd_fina_snapshot_range(cursor, start_date: int, end_date: int) -> None:
+    """Load financial snapshots for every trade date in [start_date, end_date] in one statement."""
     sql = """
     INSERT INTO dwd_fina_snapshot (
         trade_date, ts_code, roe_ttm, netprofit_margin, grossprofit_margin, debt_to_assets
     )
     SELECT
-        %s AS trade_date,
+        f.trade_date,
         f.ts_code,
         f.roe AS roe_ttm,
         f.netprofit_margin,
         f.grossprofit_margin,
         f.debt_to_assets
     FROM dws_fina_pit_daily f
-    WHERE f.trade_date = %s
+    WHERE f.trade_date BETWEEN %s AND %s
     ON DUPLICATE KEY UPDATE
         roe_ttm = VALUES(roe_ttm),
         netprofit_margin = VALUES(netprofit_margin),
         grossprofit_margin = VALUES(grossprofit_margin),
         debt_to_assets = VALUES(debt_to_assets)
     """
-    cursor.execute(sql, (trade_date, trade_date))
+    cursor.execute(sql, (start_date, end_date))
 
 
 def load_dwd_margin_sentiment(cursor, trade_date: int, prev_trade_date: Optional[int]) -> None:
@@ -194,8 +204,43 @@ def load_dwd_margin_sentiment(cursor, trade_date: int, prev_trade_date: Optional
     cursor.execute(sql, (prev_trade_date, trade_date))
 
 
+def load_dwd_margin_sentiment_range(cursor, start_date: int, end_date: int) -> None:
+    """Load margin sentiment for every trade date in [start_date, end_date] in one statement.
+
+    The previous trade date of each row comes from dim_trade_cal.pretrade_date.
+    """
+    sql = """
+    INSERT INTO dwd_margin_sentiment (
+        trade_date, ts_code, rz_net_buy, rz_net_buy_ratio, rz_change_rate, rq_pressure
+    )
+    SELECT
+        m.trade_date,
+        m.ts_code,
+        (m.rzmre - m.rzche) AS rz_net_buy,
+        CASE WHEN d.amount > 0 THEN (m.rzmre - m.rzche) / (d.amount * 1000) ELSE NULL END AS rz_net_buy_ratio,
+        CASE WHEN lag_m.rzye > 0 THEN (m.rzye - lag_m.rzye) / lag_m.rzye ELSE NULL END AS rz_change_rate,
+        CASE WHEN d.vol > 0 THEN m.rqyl / (d.vol * 100) ELSE NULL END AS rq_pressure
+    FROM ods_margin_detail m
+    JOIN dwd_daily d ON d.trade_date = m.trade_date AND d.ts_code = m.ts_code
+    JOIN dim_trade_cal cal ON cal.exchange = 'SSE' AND cal.cal_date = m.trade_date
+    LEFT JOIN ods_margin_detail lag_m ON lag_m.trade_date = cal.pretrade_date AND lag_m.ts_code = m.ts_code
+    WHERE m.trade_date BETWEEN %s AND %s
+    ON DUPLICATE KEY UPDATE
+        rz_net_buy = VALUES(rz_net_buy),
+        rz_net_buy_ratio = VALUES(rz_net_buy_ratio),
+        rz_change_rate = VALUES(rz_change_rate),
+        rq_pressure = VALUES(rq_pressure)
+    """
+    cursor.execute(sql, (start_date, end_date))
+
+
 def load_dwd_chip_stability(cursor, trade_date: int) -> None:
     """Load chip stability indicators from CYQ data."""
+    load_dwd_chip_stability_range(cursor, trade_date, trade_date)
+
+
+def load_dwd_chip_stability_range(cursor, start_date: int, end_date: int) -> None:
+    """Load chip stability for every trade date in [start_date, end_date] in one statement."""
     sql = """
     INSERT INTO dwd_chip_stability (
         trade_date, ts_code, avg_cost, winner_rate, chip_concentration, cost_deviation
@@ -209,14 +254,14 @@ def load_dwd_chip_stability(cursor, trade_date: int) -> None:
         CASE WHEN c.weight_avg > 0 THEN (d.close - c.weight_avg) / c.weight_avg ELSE NULL END AS cost_deviation
     FROM ods_cyq_perf c
     JOIN dwd_daily d ON d.trade_date = c.trade_date AND d.ts_code = c.ts_code
-    WHERE c.trade_date = %s
+    WHERE c.trade_date BETWEEN %s AND %s
     ON DUPLICATE KEY UPDATE
         avg_cost = VALUES(avg_cost),
         winner_rate = VALUES(winner_rate),
         chip_concentration = VALUES(chip_concentration),
         cost_deviation = VALUES(cost_deviation)
     """
-    cursor.execute(sql, (trade_date,))
+    cursor.execute(sql, (start_date, end_date))
 
 
 def load_dwd_stock_label_daily(cursor, trade_date: int) -> None:
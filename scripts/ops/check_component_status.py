@@ -24,6 +24,14 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Apply expected date check on ann_date-based financial tables.",
     )
+    parser.add_argument(
+        "--exact-counts",
+        action="store_true",
+        help=(
+            "Scan each table for COUNT(*) and MAX(updated_at). Default: row counts and update "
+            "times are estimates from information_schema.TABLES."
+        ),
+    )
     parser.add_argument("--json", action="store_true", help="Print JSON output.")
     parser.add_argument("--fail-on-issues", action="store_true", help="Exit non-zero on stale/empty status.")
     return parser.parse_args()
@@ -61,13 +69,51 @@ def resolve_expected_trade_date(cursor, expected_trade_date: int | None) -> int:
     return int(row["d"])
 
 
-def table_status(cursor, table: str, date_col: str, threshold: int | None) -> dict:
-    cursor.execute(f"SELECT MAX({date_col}) AS max_date, COUNT(*) AS rows_cnt, MAX(updated_at) AS updated_at FROM {table}")
-    row = cursor.fetchone()
+def fetch_table_stats(cursor, tables: list[tuple[str, str]], exact_counts: bool = False) -> dict[str, dict]:
+    """Fetch max date, row count and last update for every table in one UNION ALL round-trip.
+
+    MAX(date_col) is always exact, and an index seek as long as every table has a key
+    leading with its date column (ods_fina_indicator needs idx_ann_date, see
+    scripts/tools/migrate_fina_indicator_indexes.py).
+    Without exact_counts, rows_cnt/updated_at come from information_schema.TABLES
+    instead of full table scans; InnoDB reports them as estimates.
+    """
+    if exact_counts:
+        sql = "\nUNION ALL\n".join(
+            f"SELECT '{table}' AS tbl, MAX({date_col}) AS max_date, COUNT(*) AS rows_cnt, "
+            f"MAX(updated_at) AS updated_at FROM {table}"
+            for table, date_col in tables
+        )
+        cursor.execute(sql)
+        return {row["tbl"]: row for row in cursor.fetchall()}
+
+    sql = "\nUNION ALL\n".join(
+        f"SELECT '{table}' AS tbl, MAX({date_col}) AS max_date FROM {table}"
+        for table, date_col in tables
+    )
+    cursor.execute(sql)
+    stats = {row["tbl"]: {**row, "rows_cnt": None, "updated_at": None} for row in cursor.fetchall()}
+
+    cursor.execute(
+        """
+        SELECT TABLE_NAME AS tbl, TABLE_ROWS AS rows_cnt, UPDATE_TIME AS updated_at
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN %s
+        """,
+        (tuple(table for table, _ in tables),),
+    )
+    for row in cursor.fetchall():
+        if row["tbl"] in stats:
+            stats[row["tbl"]].update(rows_cnt=row["rows_cnt"], updated_at=row["updated_at"])
+    return stats
+
+
+def table_status(row: dict, table: str, date_col: str, threshold: int | None) -> dict:
     max_date = int(row["max_date"]) if row["max_date"] is not None else None
     rows_cnt = int(row["rows_cnt"] or 0)
     updated_at = row["updated_at"].isoformat(sep=" ") if row["updated_at"] else None
-    if rows_cnt == 0 or max_date is None:
+    # MAX() is NULL only for an empty table; estimated row counts may read 0 on non-empty ones
+    if max_date is None:
         status = "EMPTY"
     elif threshold is None:
         status = "INFO"
@@ -135,17 +181,22 @@ def main() -> int:
             result: dict = {
                 "checked_at": datetime.now().isoformat(sep=" ", timespec="seconds"),
                 "expected_trade_date": expected_trade_date,
+                "exact_counts": args.exact_counts,
                 "layers": {},
                 "issues": [],
             }
 
+            stats = fetch_table_stats(
+                cursor, [t for tables in layers.values() for t in tables], exact_counts=args.exact_counts
+            )
+
             for layer_name, tables in layers.items():
                 layer_items = []
                 for table, date_col in tables:
                     threshold = expected_trade_date
                     if date_col == "ann_date" and not args.strict_financial_ann_date:
                         threshold = None
-                    item = table_status(cursor, table, date_col, threshold)
+                    item = table_status(stats[table], table, date_col, threshold)
                     layer_items.append(item)
                     if item["status"] in {"EMPTY", "STALE"}:
                         result["issues"].append(item)
@@ -163,8 +214,9 @@ def main() -> int:
             for layer_name, items in result["layers"].items():
                 print(f"\n[{layer_name}]")
                 for item in items:
+                    rows = item["rows_cnt"] if args.exact_counts else f"~{item['rows_cnt']}"
                     print(
-                        f"- {item['table']}: max={item['max_date']} rows={item['rows_cnt']} "
+                        f"- {item['table']}: max={item['max_date']} rows={rows} "
                         f"status={item['status']} threshold={item['threshold']}"
                     )
             if result["issues"]:
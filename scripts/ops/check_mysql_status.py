@@ -2,12 +2,39 @@
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
+import sys
 from configparser import ConfigParser
+from functools import lru_cache
 from pathlib import Path
 
 import pymysql
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.etl.base.pool import get_pool
+from scripts.etl.base.runtime import MysqlConfig
+
+STATUS_NAMES = (
+    "Threads_connected",
+    "Threads_running",
+    "Threads_created",
+    "Connections",
+    "Aborted_clients",
+    "Aborted_connects",
+    "Max_used_connections",
+    "Uptime",
+)
+VARIABLE_NAMES = (
+    "max_connections",
+    "wait_timeout",
+    "interactive_timeout",
+    "thread_cache_size",
+)
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Check MySQL health and potential connection leaks.")
@@ -36,10 +63,17 @@ def parse_args() -> argparse.Namespace:
 
 
 def load_db_config(config_path: str) -> dict:
-    cfg = ConfigParser()
     path = Path(config_path).expanduser()
     if not path.exists():
         raise FileNotFoundError(f"config not found: {path}")
+    # Copy so callers cannot mutate the cached dict
+    return dict(_load_db_config_cached(str(path), path.stat().st_mtime))
+
+
+@lru_cache(maxsize=8)
+def _load_db_config_cached(path: str, mtime: float) -> dict:
+    """Parse etl.ini once per (path, mtime); an edited file is re-read."""
+    cfg = ConfigParser()
     cfg.read(path)
     return {
         "host": cfg.get("mysql", "host", fallback="127.0.0.1"),
@@ -50,80 +84,75 @@ def load_db_config(config_path: str) -> dict:
     }
 
 
+def fetch_settings(cursor) -> list:
+    """Return STATUS_NAMES/VARIABLE_NAMES as (kind, name, value) tuples.
+
+    Reads performance_schema in one round-trip; if performance_schema is not
+    available (missing, not readable by this user, or disabled and returning
+    no rows), falls back to SHOW GLOBAL STATUS/VARIABLES.
+    """
+    try:
+        cursor.execute(
+            """
+            SELECT 'status' AS kind, VARIABLE_NAME AS name, VARIABLE_VALUE AS value
+            FROM performance_schema.global_status
+            WHERE VARIABLE_NAME IN %s
+            UNION ALL
+            SELECT 'variable' AS kind, VARIABLE_NAME AS name, VARIABLE_VALUE AS value
+            FROM performance_schema.global_variables
+            WHERE VARIABLE_NAME IN %s
+            """,
+            (STATUS_NAMES, VARIABLE_NAMES),
+        )
+        rows = list(cursor.fetchall())
+        if rows:
+            return rows
+    except (pymysql.err.ProgrammingError, pymysql.err.OperationalError):
+        # e.g. 1142 (SELECT denied on performance_schema) is an OperationalError
+        pass
+
+    rows = []
+    for kind, statement, names in (
+        ("status", "SHOW GLOBAL STATUS", STATUS_NAMES),
+        ("variable", "SHOW GLOBAL VARIABLES", VARIABLE_NAMES),
+    ):
+        cursor.execute(f"{statement} WHERE Variable_name IN %s", (names,))
+        rows.extend((kind, name, value) for name, value in cursor.fetchall())
+    return rows
+
+
 def main() -> int:
     args = parse_args()
     db = load_db_config(args.config)
 
-    conn = pymysql.connect(
-        host=db["host"],
-        port=db["port"],
-        user=db["user"],
-        password=db["password"],
-        database=db["database"],
-        charset="utf8mb4",
-        autocommit=True,
-        cursorclass=pymysql.cursors.DictCursor,
-    )
+    conn = get_pool(MysqlConfig(**db)).connection()
     try:
+        # Plain tuple cursor: rows are unpacked positionally, no dict per row
         with conn.cursor() as cursor:
-            cursor.execute(
-                """
-                SHOW GLOBAL STATUS
-                WHERE Variable_name IN (
-                    'Threads_connected',
-                    'Threads_running',
-                    'Threads_created',
-                    'Connections',
-                    'Aborted_clients',
-                    'Aborted_connects',
-                    'Max_used_connections',
-                    'Uptime'
-                )
-                """
-            )
-            status_rows = cursor.fetchall()
-
-            cursor.execute(
-                """
-                SHOW GLOBAL VARIABLES
-                WHERE Variable_name IN (
-                    'max_connections',
-                    'wait_timeout',
-                    'interactive_timeout',
-                    'thread_cache_size'
-                )
-                """
-            )
-            var_rows = cursor.fetchall()
+            setting_rows = fetch_settings(cursor)
 
+            # One PROCESSLIST snapshot; counters and the top-30 are derived in Python
             cursor.execute(
                 """
                 SELECT ID, USER, HOST, DB, COMMAND, TIME, STATE, LEFT(INFO, 120) AS INFO
                 FROM INFORMATION_SCHEMA.PROCESSLIST
-                ORDER BY TIME DESC
-                LIMIT 30
                 """
             )
-            process_rows = cursor.fetchall()
-
-            cursor.execute(
-                "SELECT COUNT(*) AS c FROM INFORMATION_SCHEMA.PROCESSLIST WHERE COMMAND='Sleep' AND TIME > %s",
-                (args.sleep_threshold_sec,),
-            )
-            sleep_over_threshold = int(cursor.fetchone()["c"])
-
-            cursor.execute(
-                "SELECT COUNT(*) AS c FROM INFORMATION_SCHEMA.PROCESSLIST WHERE COMMAND='Sleep' AND TIME > 1800"
-            )
-            sleep_over_30m = int(cursor.fetchone()["c"])
-
-            cursor.execute(
-                "SELECT COUNT(*) AS c FROM INFORMATION_SCHEMA.PROCESSLIST WHERE COMMAND != 'Sleep'"
-            )
-            non_sleep_processes = int(cursor.fetchone()["c"])
-
-        status = {row["Variable_name"]: int(row["Value"]) for row in status_rows}
-        variables = {row["Variable_name"]: int(row["Value"]) for row in var_rows}
+            process_fields = [col[0] for col in cursor.description]
+            processes = cursor.fetchall()
+
+        # Positions in the PROCESSLIST select list above
+        command_idx, time_idx = 4, 5
+        sleep_times = [row[time_idx] or 0 for row in processes if row[command_idx] == "Sleep"]
+        sleep_over_threshold = sum(1 for t in sleep_times if t > args.sleep_threshold_sec)
+        sleep_over_30m = sum(1 for t in sleep_times if t > 1800)
+        non_sleep_processes = len(processes) - len(sleep_times)
+        top_processes = heapq.nlargest(30, processes, key=lambda row: row[time_idx] or 0)
+        # Only the reported rows need column names, for the JSON payload
+        process_rows = [dict(zip(process_fields, row)) for row in top_processes]
+
+        status = {name: int(value) for kind, name, value in setting_rows if kind == "status"}
+        variables = {name: int(value) for kind, name, value in setting_rows if kind == "variable"}
 
         max_connections = max(1, variables.get("max_connections", 1))
         threads_connected = status.get("Threads_connected", 0)
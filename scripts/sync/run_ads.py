@@ -4,6 +4,7 @@ import logging
 import os
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 # Add project scripts directory to sys.path to allow importing 'etl' package
 scripts_dir = Path(__file__).resolve().parents[1]
@@ -14,7 +15,7 @@ from etl.ads import run_full, run_incremental
 from etl.base.runtime import ensure_watermark, get_env_config, get_mysql_session, get_watermark
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="ADS layer ETL")
     parser.add_argument("--mode", choices=["full", "incremental"], default="incremental")
     parser.add_argument("--start-date", type=int, default=20100101)
@@ -31,12 +32,12 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Initialize ads watermark if missing (uses start-date - 1).",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-    args = parse_args()
+    args = parse_args(argv)
     logging.info(f"Starting ADS ETL with args: {args}")
     if args.config:
         config_path = Path(args.config).expanduser()
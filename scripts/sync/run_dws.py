@@ -6,6 +6,7 @@ import subprocess
 import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import List, Optional
 
 # Add project scripts directory to sys.path to allow importing 'etl' package
 scripts_dir = Path(__file__).resolve().parents[1]
@@ -23,7 +24,7 @@ from etl.base.runtime import (
 )
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="DWS layer ETL")
     parser.add_argument("--mode", choices=["full", "incremental"], default="incremental")
     parser.add_argument("--start-date", type=int, default=20100101)
@@ -64,7 +65,7 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Only refresh dws_leverage_sentiment for the specified date range.",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def _apply_env_overrides(args: argparse.Namespace) -> None:
@@ -205,9 +206,9 @@ def _run_chunked_backfill(args: argparse.Namespace) -> None:
                 conn.commit()
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-    args = parse_args()
+    args = parse_args(argv)
     logging.info(f"Starting DWS ETL with args: {args}")
     _apply_env_overrides(args)
 
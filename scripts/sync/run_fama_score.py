@@ -16,6 +16,7 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
 import sys
 from pathlib import Path
 
@@ -24,6 +25,7 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
 
+from etl.base.pool import get_pool
 from etl.base.runtime import get_env_config, get_mysql_connection
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -36,6 +38,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--start-date", type=int, help="Start date for full mode")
     parser.add_argument("--trade-date", type=int, help="Single trade date")
     parser.add_argument("--config", help="Path to etl.ini")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Concurrent scorer connections. 1 (default) runs the seven scorers "
+                             "serially in one transaction per date; >1 commits each scorer "
+                             "separately, so a failure can leave a date partly scored")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="Compute size/momentum scores in NumPy and bulk-insert them")
     return parser.parse_args()
 
 
@@ -73,12 +81,16 @@ def main() -> None:
     from score.fama_score.fama_scoring import run_fama_scoring
     
     cfg = get_env_config(args.config)
+    workers = args.workers
+    # --workers > 1: 各评分在独立连接上并发执行. 连接取自共享连接池, 关闭即归还,
+    # 全量模式逐日执行时复用, 不再每个交易日新建 7 个连接 (未安装 DBUtils 时仍为新建连接)
+    connect = get_pool(cfg).connection if workers > 1 else None
     
     with get_mysql_connection(cfg) as conn:
         with conn.cursor() as cursor:
             if args.trade_date:
                 # 单日模式
-                run_fama_scoring(cursor, args.trade_date)
+                run_fama_scoring(cursor, args.trade_date, connect=connect, max_workers=workers, vectorized=args.vectorized)
                 conn.commit()
             elif args.mode == "incremental":
                 # 增量模式: 获取最新交易日
@@ -87,7 +99,7 @@ def main() -> None:
                 if row and row[0]:
                     trade_date = row[0]
                     logger.info(f"增量模式: 计算 {trade_date}")
-                    run_fama_scoring(cursor, trade_date)
+                    run_fama_scoring(cursor, trade_date, connect=connect, max_workers=workers, vectorized=args.vectorized)
                     conn.commit()
                 else:
                     logger.warning("无可用交易日")
@@ -103,7 +115,7 @@ def main() -> None:
                 total = len(dates)
                 for i, trade_date in enumerate(dates, 1):
                     logger.info(f"进度: {i}/{total} - {trade_date}")
-                    run_fama_scoring(cursor, trade_date)
+                    run_fama_scoring(cursor, trade_date, connect=connect, max_workers=workers, vectorized=args.vectorized)
                     conn.commit()
     
     logger.info("Fama-French 评分完成")
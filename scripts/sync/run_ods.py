@@ -4,6 +4,7 @@ import logging
 import os
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 # Add project scripts directory to sys.path to allow importing 'etl' package
 scripts_dir = Path(__file__).resolve().parents[1]
@@ -14,7 +15,7 @@ from etl.ods import run_fina_incremental, run_full, run_incremental, run_dividen
 from etl.base.runtime import get_tushare_token, get_tushare_limit
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="ODS layer ETL")
     parser.add_argument("--token", default=None)
     parser.add_argument("--mode", choices=["full", "incremental"], default="incremental")
@@ -41,12 +42,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--user", default=None)
     parser.add_argument("--password", default=None)
     parser.add_argument("--database", default=None)
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-    args = parse_args()
+    args = parse_args(argv)
     logging.info(f"Starting ODS ETL with args: {args}")
     if args.config:
         config_path = Path(args.config).expanduser()
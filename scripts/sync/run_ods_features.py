@@ -5,8 +5,11 @@ import argparse
 import logging
 import os
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 # Add project scripts directory to sys.path to allow importing 'etl' package
 scripts_dir = Path(__file__).resolve().parents[1]
@@ -28,7 +31,7 @@ from etl.base.runtime import (
 )
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Fetch TuShare feature datasets into ODS raw tables.")
     parser.add_argument("--start-date", type=int, required=True)
     parser.add_argument("--end-date", type=int, required=True)
@@ -52,6 +55,12 @@ def parse_args() -> argparse.Namespace:
         default=200,
         help="Requests per minute for stk_factor (default: 200).",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="TuShare requests in flight at once; rate limits still apply (default: 4).",
+    )
     parser.add_argument("--config", default=None, help="Path to etl.ini")
     parser.add_argument(
         "--apis",
@@ -71,7 +80,7 @@ def parse_args() -> argparse.Namespace:
         help="Disable skipping existing data.",
     )
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 API_COLUMNS: Dict[str, List[str]] = {
@@ -399,9 +408,40 @@ def _chunk_dates(dates: List[int], chunk_size: int) -> List[List[int]]:
     return [dates[i : i + chunk_size] for i in range(0, len(dates), chunk_size)]
 
 
-def main() -> None:
+T = TypeVar("T")
+
+
+def _fetch_in_order(
+    items: Iterable[T], fetch: Callable[[T], Any], concurrency: int
+) -> Iterator[Tuple[T, Any, Optional[Exception]]]:
+    """Run fetch(item) on up to `concurrency` threads; yield (item, result, error) in input order.
+
+    TuShare calls are blocking HTTP requests, so overlapping them hides their
+    latency; the shared RateLimiter still caps requests per minute. Items are
+    pulled lazily (at most 2 * concurrency ahead of the consumer), so `items`
+    may be a generator that queries the database, and inserts stay on the
+    calling thread.
+    """
+    concurrency = max(1, concurrency)
+    item_iter = iter(items)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = deque(
+            (item, executor.submit(fetch, item)) for item in islice(item_iter, concurrency * 2)
+        )
+        while pending:
+            item, future = pending.popleft()
+            try:
+                result, error = future.result(), None
+            except Exception as exc:
+                result, error = None, exc
+            for next_item in islice(item_iter, 1):
+                pending.append((next_item, executor.submit(fetch, next_item)))
+            yield item, result, error
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-    args = parse_args()
+    args = parse_args(argv)
     logging.info(f"Starting ODS Features ETL with args: {args}")
     if args.config:
         config_path = Path(args.config).expanduser()
@@ -489,56 +529,63 @@ def main() -> None:
                         "Warning: table columns missing for "
                         f"{api_name} ({table}): {', '.join(missing_columns)}"
                     )
-                for ts_index, ts_code in enumerate(ts_codes, start=1):
-                    if total_ts_codes:
+                api_limiter = limiter_map.get(api_name, limiter)
+
+                def cyq_chunks_to_fetch():
+                    for ts_index, ts_code in enumerate(ts_codes, start=1):
+                        if total_ts_codes:
+                            print(
+                                "Progress: ts_code "
+                                f"{ts_index}/{total_ts_codes} ({ts_code}) for {api_name}"
+                            )
+                        for chunk_index, chunk in enumerate(cyq_chunks, start=1):
+                            start_date = min(chunk)
+                            end_date = max(chunk)
+                            if args.skip_existing:
+                                with conn.cursor() as cursor:
+                                    if _check_cyq_chips_exists(cursor, ts_code, start_date, end_date):
+                                        logging.info(f"Skipping cyq_chips for {ts_code} {start_date}-{end_date} (data already exists)")
+                                        continue
+                            yield ts_code, chunk_index, start_date, end_date
+
+                def fetch_cyq_chips(item):
+                    ts_code, _, start_date, end_date = item
+                    api_limiter.wait()
+                    return pro.cyq_chips(
+                        ts_code=ts_code,
+                        start_date=str(start_date),
+                        end_date=str(end_date),
+                    )
+
+                for (ts_code, chunk_index, start_date, end_date), df, exc in _fetch_in_order(
+                    cyq_chunks_to_fetch(), fetch_cyq_chips, args.concurrency
+                ):
+                    print(
+                        "Progress: cyq_chips chunk "
+                        f"{chunk_index}/{len(cyq_chunks)} {start_date}-{end_date}"
+                    )
+                    if exc is not None:
                         print(
-                            "Progress: ts_code "
-                            f"{ts_index}/{total_ts_codes} ({ts_code}) for {api_name}"
+                            "Fetch failed for cyq_chips "
+                            f"{ts_code} {start_date}-{end_date}: {exc}"
                         )
-                    for chunk_index, chunk in enumerate(cyq_chunks, start=1):
-                        start_date = min(chunk)
-                        end_date = max(chunk)
-                        if args.skip_existing:
-                            with conn.cursor() as cursor:
-                                if _check_cyq_chips_exists(cursor, ts_code, start_date, end_date):
-                                    logging.info(f"Skipping cyq_chips for {ts_code} {start_date}-{end_date} (data already exists)")
-                                    continue
-                        
+                        continue
+                    if df.empty:
+                        continue
+                    rows, columns = _prepare_rows(api_columns, df, end_date)
+                    if not rows:
+                        continue
+                    try:
+                        with conn.cursor() as cursor:
+                            upsert_rows(cursor, table, columns, rows)
+                            conn.commit()
+                    except Exception as exc:
+                        conn.rollback()
                         print(
-                            "Progress: cyq_chips chunk "
-                            f"{chunk_index}/{len(cyq_chunks)} {start_date}-{end_date}"
+                            "Insert failed for cyq_chips "
+                            f"{ts_code} {start_date}-{end_date}: {exc}"
                         )
-
-                        try:
-                            api_limiter = limiter_map.get(api_name, limiter)
-                            api_limiter.wait()
-                            df = pro.cyq_chips(
-                                ts_code=ts_code,
-                                start_date=str(start_date),
-                                end_date=str(end_date),
-                            )
-                        except Exception as exc:
-                            print(
-                                "Fetch failed for cyq_chips "
-                                f"{ts_code} {start_date}-{end_date}: {exc}"
-                            )
-                            continue
-                        if df.empty:
-                            continue
-                        rows, columns = _prepare_rows(api_columns, df, end_date)
-                        if not rows:
-                            continue
-                        try:
-                            with conn.cursor() as cursor:
-                                upsert_rows(cursor, table, columns, rows)
-                                conn.commit()
-                        except Exception as exc:
-                            conn.rollback()
-                            print(
-                                "Insert failed for cyq_chips "
-                                f"{ts_code} {start_date}-{end_date}: {exc}"
-                            )
-                            continue
+                        continue
                 print("Completed cyq_chips")
                 continue
             existing_dates = set()
@@ -547,16 +594,20 @@ def main() -> None:
                     table = _table_for_api(api_name)
                     existing_dates = _fetch_existing_dates(cursor, table, args.start_date, args.end_date)
             
-            for date_index, trade_date in enumerate(trade_dates, start=1):
-                if args.skip_existing and trade_date in existing_dates:
-                    logging.info(f"Skipping {api_name} for {trade_date} (data already exists)")
-                    continue
+            def dates_to_fetch():
+                for date_index, trade_date in enumerate(trade_dates, start=1):
+                    if args.skip_existing and trade_date in existing_dates:
+                        logging.info(f"Skipping {api_name} for {trade_date} (data already exists)")
+                        continue
+                    yield date_index, trade_date
+
+            for (date_index, trade_date), df, exc in _fetch_in_order(
+                dates_to_fetch(), lambda item: fetcher(pro, limiter, item[1]), args.concurrency
+            ):
                 print(f"Progress: trade_date {date_index}/{total_dates} ({trade_date})")
                 print(f"Progress: api {api_index}/{total_apis} ({api_name}) for {trade_date}")
 
-                try:
-                    df = fetcher(pro, limiter, trade_date)
-                except Exception as exc:
+                if exc is not None:
                     print(f"Fetch failed for {api_name} on {trade_date}: {exc}")
                     continue
                 table = _table_for_api(api_name)
@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+# Add project root to sys.path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.append(str(project_root))
+
+from scripts.etl.base.runtime import get_env_config, get_mysql_session
+
+# Covering keys the Fama scorers name in FORCE INDEX / USE INDEX. New databases get them
+# from the CREATE TABLE statements (sql/ddl.sql, score/fama_score/ddl.sql); existing ones here.
+INDEXES = {
+    "ods_stk_factor": {
+        "idx_stk_factor_size": "(trade_date, circ_mv)",
+        "idx_stk_factor_value": "(trade_date, pb, pe_ttm, ps_ttm)",
+        "idx_stk_factor_mom": "(trade_date, volume_ratio, turnover_rate, mtm_qfq, mtmma_qfq)",
+        "idx_stk_factor_tech": "(trade_date, macd_qfq, macd_dif_qfq, macd_dea_qfq, kdj_qfq, rsi_qfq_6)",
+    },
+    # FamaScoreQuery reads each score column per day from these (trade_date, <dim>_score) keys
+    **{
+        f"dws_fama_{dim}_score": {f"idx_{dim}_score": f"(trade_date, {dim}_score)"}
+        for dim in ("momentum", "value", "quality", "technical", "capital", "chip")
+    },
+}
+
+
+def migrate_fama_score_indexes():
+    cfg = get_env_config()
+    with get_mysql_session(cfg) as conn:
+        with conn.cursor() as cursor:
+            # MySQL has no CREATE INDEX IF NOT EXISTS: skip keys that are already there
+            cursor.execute(
+                "SELECT DISTINCT table_name, index_name FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name IN %s",
+                (tuple(INDEXES),),
+            )
+            existing = {(table, name) for table, name in cursor.fetchall()}
+            changed = False
+            for table, indexes in INDEXES.items():
+                missing = [
+                    f"ADD INDEX {name} {cols}" for name, cols in indexes.items() if (table, name) not in existing
+                ]
+                if not missing:
+                    print(f"{table} indexes already present.")
+                    continue
+                sql = f"ALTER TABLE {table} {', '.join(missing)}"
+                print(f"Executing: {sql}")
+                cursor.execute(sql)
+                changed = True
+    if changed:
+        print("Migration completed successfully.")
+
+
+if __name__ == "__main__":
+    migrate_fama_score_indexes()
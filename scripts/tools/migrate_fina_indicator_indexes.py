@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+# Add project root to sys.path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.append(str(project_root))
+
+from scripts.etl.base.runtime import get_env_config, get_mysql_session
+
+# Key added to ods_fina_indicator in sql/ddl.sql (dwd_fina_indicator already has it);
+# existing databases get it here. Its primary key leads with ts_code, so without
+# idx_ann_date the MAX(ann_date) in check_component_status scans the whole index.
+INDEXES = {
+    "idx_ann_date": "(ann_date)",
+}
+
+
+def migrate_fina_indicator_indexes():
+    cfg = get_env_config()
+    with get_mysql_session(cfg) as conn:
+        with conn.cursor() as cursor:
+            # MySQL has no CREATE INDEX IF NOT EXISTS: skip keys that are already there
+            cursor.execute(
+                "SELECT DISTINCT index_name FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = 'ods_fina_indicator'"
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            missing = [f"ADD INDEX {name} {cols}" for name, cols in INDEXES.items() if name not in existing]
+            if not missing:
+                print("ods_fina_indicator indexes already present.")
+                return
+            sql = f"ALTER TABLE ods_fina_indicator {', '.join(missing)}"
+            print(f"Executing: {sql}")
+            cursor.execute(sql)
+    print("Migration completed successfully.")
+
+
+if __name__ == "__main__":
+    migrate_fina_indicator_indexes()
@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+# Add project root to sys.path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.append(str(project_root))
+
+from scripts.etl.base.runtime import get_env_config, get_mysql_session
+
+# Keys added to meta_etl_run_log in sql/ddl.sql; existing databases get them here.
+# idx_status_start serves "status=... AND start_at >= ..." (failure stats, stale-task cleanup);
+# idx_start_status_end serves start_at windows and covers the SLO dashboard query.
+INDEXES = {
+    "idx_status_start": "(status, start_at)",
+    "idx_start_status_end": "(start_at, status, end_at)",
+}
+
+
+def migrate_run_log_indexes():
+    cfg = get_env_config()
+    with get_mysql_session(cfg) as conn:
+        with conn.cursor() as cursor:
+            # MySQL has no CREATE INDEX IF NOT EXISTS: skip keys that are already there
+            cursor.execute(
+                "SELECT DISTINCT index_name FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = 'meta_etl_run_log'"
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            missing = [f"ADD INDEX {name} {cols}" for name, cols in INDEXES.items() if name not in existing]
+            if not missing:
+                print("meta_etl_run_log indexes already present.")
+                return
+            sql = f"ALTER TABLE meta_etl_run_log {', '.join(missing)}"
+            print(f"Executing: {sql}")
+            cursor.execute(sql)
+    print("Migration completed successfully.")
+
+
+if __name__ == "__main__":
+    migrate_run_log_indexes()
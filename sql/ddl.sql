@@ -31,7 +31,9 @@ CREATE TABLE IF NOT EXISTS meta_etl_run_log (
   err_msg TEXT NULL COMMENT '错误信息',
   updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (id),
-  KEY idx_api_start (api_name, start_at)
+  KEY idx_api_start (api_name, start_at),
+  KEY idx_status_start (status, start_at),
+  KEY idx_start_status_end (start_at, status, end_at)
 ) ENGINE=InnoDB COMMENT='ETL运行日志表';
 
 -- ========== 维表 ==========
@@ -129,6 +131,7 @@ CREATE TABLE IF NOT EXISTS ods_fina_indicator (
   total_hldr_eqy DECIMAL(20,4) NULL COMMENT '股东权益',
   updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (ts_code, ann_date, end_date),
+  KEY idx_ann_date (ann_date),
   KEY idx_ts_ann (ts_code, ann_date)
 ) ENGINE=InnoDB COMMENT='财务指标原始表';
 
@@ -397,7 +400,12 @@ CREATE TABLE IF NOT EXISTS ods_stk_factor (
 
   updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (trade_date, ts_code),
-  KEY idx_stk_factor_date (trade_date)
+  KEY idx_stk_factor_date (trade_date),
+  -- Fama 评分覆盖索引: 按日范围扫描即可取齐评分列, 无需回表
+  KEY idx_stk_factor_size (trade_date, circ_mv),
+  KEY idx_stk_factor_value (trade_date, pb, pe_ttm, ps_ttm),
+  KEY idx_stk_factor_mom (trade_date, volume_ratio, turnover_rate, mtm_qfq, mtmma_qfq),
+  KEY idx_stk_factor_tech (trade_date, macd_qfq, macd_dif_qfq, macd_dea_qfq, kdj_qfq, rsi_qfq_6)
 ) ENGINE=InnoDB COMMENT='股票技术因子表(Pro版)';
 
 -- 融资融券原始表
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import argparse
+
+from scripts.backfill import batch_runner
+
+
+def _flag(cmd: list[str], name: str) -> str | None:
+    return cmd[cmd.index(name) + 1] if name in cmd else None
+
+
+def test_parallel_jobs_split_default_rate_limits(monkeypatch) -> None:
+    monkeypatch.setattr(batch_runner, "_tushare_limit", lambda config: 400)
+    args = argparse.Namespace(
+        start_year=2020, end_year=2021, layer="ods", config="config/etl.ini", rate_limit=None, parallel=4,
+    )
+
+    jobs = batch_runner.build_jobs(args)
+
+    assert len(jobs) == 6
+    for job in jobs:
+        assert _flag(job.cmd, "--rate-limit") == "100"
+        stk_factor = job.description.startswith("ODS Stock Factor")
+        assert _flag(job.cmd, "--stk-factor-rate-limit") == ("50" if stk_factor else None)
+
+
+def test_sequential_jobs_keep_script_defaults(monkeypatch) -> None:
+    monkeypatch.setattr(batch_runner, "_tushare_limit", lambda config: 400)
+    args = argparse.Namespace(
+        start_year=2020, end_year=2020, layer="ods", config="config/etl.ini", rate_limit=None, parallel=1,
+    )
+
+    for job in batch_runner.build_jobs(args):
+        assert "--rate-limit" not in job.cmd
+        assert "--stk-factor-rate-limit" not in job.cmd
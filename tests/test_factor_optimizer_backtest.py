@@ -3,7 +3,7 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
-from score.factor_optimizer.backtest import run_backtest
+from score.factor_optimizer.backtest import prepare_backtest_data, run_backtest, run_prepared_backtest
 from score.factor_optimizer.config import OptimizerConfig
 
 
@@ -64,3 +64,21 @@ def test_config_top_n_alias_maps_to_num_stocks() -> None:
     config = OptimizerConfig(top_n=7)
     assert config.num_stocks == 7
     assert config.top_n == 7
+
+
+def test_prepared_backtest_skips_ineligible_stocks() -> None:
+    returns = _mock_returns()
+    # Top-scored stock is limit-up on the rebalance day
+    returns.loc[(returns["trade_date"] == 20240102) & (returns["ts_code"] == "000001.SZ"), "is_limit_up"] = 1
+    config = OptimizerConfig(
+        backtest_start=20240101,
+        backtest_end=20240103,
+        num_stocks=1,
+        holding_days=5,
+    )
+    data = prepare_backtest_data(_mock_scores(), returns)
+
+    assert data.eligible.tolist() == [1, 1, 1, 0, 1, 1, 1, 1, 1]
+    nav, _ = run_prepared_backtest(data, np.ones(7) / 7, config)
+    # Day 3 return comes from 000002.SZ (+0.5%), not the limit-up 000001.SZ
+    assert nav.iloc[2]["daily_return"] == 0.005
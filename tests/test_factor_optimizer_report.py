@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from score.factor_optimizer import report
+from score.factor_optimizer.config import OptimizerConfig
+
+
+@pytest.mark.parametrize("use_xlsxwriter", [True, False])
+def test_report_writes_infinite_metrics(tmp_path, monkeypatch, use_xlsxwriter) -> None:
+    if not use_xlsxwriter:
+        monkeypatch.setattr(report, "xlsxwriter", None)
+    elif report.xlsxwriter is None:
+        pytest.skip("xlsxwriter not installed")
+
+    output = tmp_path / "report.xlsx"
+    report.generate_report(
+        wf_results={"fold_results": [], "all_weights": []},
+        oos_nav=pd.DataFrame(),
+        oos_metrics={"sortino": float("inf"), "calmar": float("-inf"), "sharpe": 1.23456},
+        benchmark_df=pd.DataFrame(),
+        config=OptimizerConfig(report_sheets={"oos"}),
+        output_file=str(output),
+    )
+
+    rows = list(openpyxl.load_workbook(output)["OOS Results"].values)
+    assert rows == [("metric", "value"), ("sortino", "inf"), ("calmar", "-inf"), ("sharpe", 1.2346)]
+
+
+def test_fold_details_keeps_integer_folds(tmp_path) -> None:
+    folds = [
+        {
+            "fold": i,
+            "train_period": "20200101-20201231",
+            "test_period": "20210101-20210630",
+            "train_sharpe": 1.5,
+            "test_sharpe": 0.8,
+            "train_return": 0.2,
+            "test_return": 0.05,
+            "train_max_dd": -0.1,
+            "test_max_dd": -0.08,
+        }
+        for i in (1, 2)
+    ]
+    output = tmp_path / "report.xlsx"
+    report.generate_report(
+        wf_results={"fold_results": folds, "all_weights": []},
+        oos_nav=pd.DataFrame(),
+        oos_metrics={},
+        benchmark_df=pd.DataFrame(),
+        config=OptimizerConfig(report_sheets={"fold"}),
+        output_file=str(output),
+    )
+
+    sheet = openpyxl.load_workbook(output)["Fold Details"]
+    fold_col = [row[0] for row in sheet.iter_rows(min_row=2, values_only=True)]
+    assert fold_col == [1, 2]
+    assert all(isinstance(v, int) for v in fold_col)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import numpy as np
+
+from score.fama_score import fama_scoring
+from score.fama_score.fama_scoring import percent_rank, score_momentum, score_size
+
+
+def test_score_size_matches_sql_buckets() -> None:
+    circ_mv = np.array([100000, 300000, 799999, 2000000, 9999999, 10000000, np.nan])
+    assert score_size(circ_mv).tolist() == [10.0, 8.0, 8.0, 4.0, 2.0, 1.0, 1.0]
+
+
+def test_percent_rank_ties_and_nulls_first() -> None:
+    ranks = percent_rank(np.array([3.0, 1.0, np.nan, 3.0, 2.0]))
+    assert ranks.tolist() == [0.75, 0.25, 0.0, 0.75, 0.5]
+    assert percent_rank(np.array([5.0])).tolist() == [0.0]
+
+
+def test_score_momentum_kernel_matches_select_fallback(monkeypatch) -> None:
+    rng = np.random.default_rng(0)
+    n = 500
+    volume_ratio = rng.uniform(0.5, 2.0, n)
+    turnover_rate = rng.uniform(0, 15, n)
+    mtm = rng.uniform(-1.5, 1.5, n)
+    mtmma = rng.uniform(-1.5, 1.5, n)
+    for arr in (volume_ratio, turnover_rate, mtm, mtmma):
+        arr[rng.integers(0, n, 20)] = np.nan
+
+    expected = score_momentum(volume_ratio, turnover_rate, mtm, mtmma)
+    monkeypatch.setattr(fama_scoring, "_momentum_score_fused", None)
+    fallback = score_momentum(volume_ratio, turnover_rate, mtm, mtmma)
+
+    np.testing.assert_array_equal(expected, fallback)
+
+
+def test_score_momentum_rules() -> None:
+    # vr 1.6 -> 4, tr 6 -> 3, mtm 0.6 -> 5, mtm > mtmma > 0 -> 4, reserved 2
+    assert score_momentum([1.6], [6.0], [0.6], [0.3]).tolist() == [18.0]
+    # all NULL: vr/tr fall to ELSE 1, mtm/cross fall to ELSE 0, reserved 2
+    assert score_momentum([np.nan], [np.nan], [np.nan], [np.nan]).tolist() == [4.0]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from score.mistery.strategy import SIGNAL_CATEGORIES, SignalConfig, compute_520_signals, rolling_mean
+
+
+def test_rolling_mean_matches_pandas() -> None:
+    rng = np.random.default_rng(0)
+    values = np.round(10 + np.cumsum(rng.normal(0, 0.2, 300)), 2)
+    values[[3, 50, 51, 200]] = np.nan
+    values[100:140] = 10.1  # constant window: pandas returns the value itself
+
+    for window in (1, 5, 20):
+        expected = pd.Series(values).rolling(window=window, min_periods=window).mean()
+        np.testing.assert_array_equal(rolling_mean(values, window), expected.to_numpy())
+
+
+def test_rolling_mean_short_series() -> None:
+    assert np.isnan(rolling_mean([1.0, 2.0], 5)).all()
+    assert rolling_mean([], 5).shape == (0,)
+
+
+def test_signal_priority_and_categories() -> None:
+    rng = np.random.default_rng(1)
+    n = 400
+    df = pd.DataFrame({
+        "trade_date": np.arange(20240101, 20240101 + n),
+        "close": np.round(10 + np.cumsum(rng.normal(0, 0.2, n)), 2),
+        "vol": rng.integers(100, 10000, n).astype(float),
+    })
+
+    out = compute_520_signals(df, SignalConfig())
+
+    expected = np.select(
+        [out["signal_exit"], out["signal_reduce"], out["signal_buy_pullback"], out["signal_buy_golden"]],
+        ["exit", "reduce", "buy_pullback", "buy_golden"],
+        default="hold",
+    )
+    assert list(out["signal"].cat.categories) == SIGNAL_CATEGORIES
+    assert out["signal"].astype(str).tolist() == expected.tolist()